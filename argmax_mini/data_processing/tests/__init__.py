@@ -4,3 +4,14 @@ from .test_csv import CsvViewTests
 from .test_flow import FlowsViewTests, FlowCsvAddViewTests
 from .test_project import ProjectViewTests
 from .test_optimize import OptimizationViewTests, OptimizationOrderViewTests
+from .test_catboost_numpy import CatBoostNumpyParityTests
+from .test_search_selection import LexicographicSelectionParityTests
+from .test_search_parallel import SearchParallelDeterminismTests
+from .test_search_fitness import LexicographicFitnessParityTests
+from .test_nsga2 import NSGA2SortTests
+from .test_prescreen import PreScreenerTests
+from .test_neighbor_index import TargetNeighborIndexTests
+from .test_search_benchmark import SearchBenchmarkRunnerTests
+from .test_prediction_cache import PredictionCacheKeyTests
+from .test_tabpfn_device import TabPFNDeviceLoadTests
+from .test_cmaes import CMAESRowStopTests
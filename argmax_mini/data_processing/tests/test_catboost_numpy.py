@@ -0,0 +1,75 @@
+import numpy as np
+from catboost import CatBoostClassifier, CatBoostRegressor
+from django.test import SimpleTestCase
+
+from hackathon.src.search.catboost_space import catboost_split_borders
+from hackathon.src.surrogate.catboost_model import catboost_predict
+from hackathon.src.surrogate.catboost_numpy_model import (
+    catboost_numpy_export,
+    catboost_numpy_predict,
+    catboost_numpy_multi_predict,
+    catboost_numpy_classification_predict,
+)
+from hackathon.src.surrogate.catboost_classification_model import catboost_classification_predict
+
+
+class CatBoostNumpyParityTests(SimpleTestCase):
+    """
+    NumPy oblivious tree 평가기가 CatBoost predict와 같은 값을 내는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X_train = rng.normal(size=(500, 6))
+        self.X_train[:, 5] = rng.integers(0, 4, size=500)
+        self.y_train = np.sin(self.X_train[:, 0]) + self.X_train[:, 1] * self.X_train[:, 2]
+        self.X_test = rng.normal(size=(300, 6))
+        self.X_test[:, 5] = rng.integers(0, 4, size=300)
+
+    def test_regression_parity(self):
+        model = CatBoostRegressor(iterations=100, depth=6, verbose=0, random_seed=0)
+        model.fit(self.X_train, self.y_train)
+        numpy_model = catboost_numpy_export(model)
+
+        np.testing.assert_allclose(catboost_numpy_predict(numpy_model, self.X_test),
+                                   catboost_predict(model, self.X_test), rtol=0, atol=1e-9)
+        # 기존 predict 함수에도 그대로 사용 가능
+        np.testing.assert_allclose(catboost_predict(numpy_model, self.X_test),
+                                   catboost_predict(model, self.X_test), rtol=0, atol=1e-9)
+
+    def test_multi_output_parity(self):
+        y_train = np.stack([self.y_train, self.X_train[:, 3] ** 2], axis=1)
+        model = CatBoostRegressor(iterations=100, depth=4, loss_function='MultiRMSE', verbose=0, random_seed=0)
+        model.fit(self.X_train, y_train)
+        numpy_model = catboost_numpy_export(model)
+
+        np.testing.assert_allclose(catboost_numpy_multi_predict(numpy_model, self.X_test),
+                                   model.predict(self.X_test), rtol=0, atol=1e-9)
+
+    def test_classification_parity(self):
+        for y_train in [(self.y_train > 0).astype(int), np.digitize(self.y_train, [-1, 0, 1])]:
+            model = CatBoostClassifier(iterations=50, depth=4, verbose=0, random_seed=0)
+            model.fit(self.X_train, y_train)
+            numpy_model = catboost_numpy_export(model)
+
+            np.testing.assert_allclose(numpy_model.predict(self.X_test, prediction_type='Probability'),
+                                       model.predict(self.X_test, prediction_type='Probability'), rtol=0, atol=1e-9)
+            np.testing.assert_array_equal(catboost_numpy_classification_predict(numpy_model, self.X_test),
+                                          catboost_classification_predict(model, self.X_test))
+
+    def test_border_values(self):
+        # border와 같은 값은 왼쪽, border 바로 위 값은 오른쪽 leaf로 가야 함
+        model = CatBoostRegressor(iterations=50, depth=4, verbose=0, random_seed=0)
+        model.fit(self.X_train, self.y_train)
+        numpy_model = catboost_numpy_export(model)
+        borders = catboost_split_borders(model)
+        self.assertEqual(borders.keys(), numpy_model.split_borders().keys())
+
+        X = np.repeat(self.X_test[:1], sum(2 * len(b) for b in borders.values()), axis=0).astype(np.float32)
+        row = 0
+        for col, values in borders.items():
+            values = values.astype(np.float32)
+            X[row:row + len(values), col] = values
+            X[row + len(values):row + 2 * len(values), col] = np.nextafter(values, np.float32(np.inf))
+            row += 2 * len(values)
+        np.testing.assert_allclose(numpy_model.predict(X), model.predict(X), rtol=0, atol=1e-9)
@@ -0,0 +1,37 @@
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from hackathon.src.search.cmaes_search import CMAESSearchEngine
+from .test_search_parallel import StubModel, stub_predict
+
+
+class CMAESRowStopTests(SimpleTestCase):
+    """
+    CMA-ES 행이 restart를 모두 쓰기 전에 행 최적 fitness 정체(patience, tol)로 끝나는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        X_train = rng.uniform(0, 3, size=(200, 4))
+        X_train[:, 2] = rng.integers(0, 4, size=200)
+        names = ['a', 'b', 'c', 'd']
+        scalers = {'a': StandardScaler(), 'b': StandardScaler(), 'c': LabelEncoder(), 'd': StandardScaler()}
+        self.engine = CMAESSearchEngine(StubModel(), stub_predict, X_train, stub_predict(StubModel(), X_train),
+                                        names, ['a', 'b', 'c'], {'a': 'maximize', 'b': 'minimize'}, {'a': 1, 'b': 2},
+                                        {'a': (0, 3), 'b': (0, 3), 'c': (0, 3)}, scalers)
+        self.rows = X_train[:3]
+        self.target = np.array([[1.5]])
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_rows_stop_on_row_stagnation(self):
+        res = self.engine.search(self.target, self.rows, max_gen=2000, seed=7)
+        self.assertTrue(res['converged'].all())
+        self.assertTrue((res['n_restart'] < CMAESSearchEngine.MAX_RESTARTS).all())
+        self.assertTrue((res['n_gen'] < 2000).all())
+
+    def test_patience_none_uses_all_restarts(self):
+        res = self.engine.search(self.target, self.rows, max_gen=20000, patience=None, seed=7)
+        self.assertTrue((res['n_restart'] == CMAESSearchEngine.MAX_RESTARTS).all())
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from hackathon.src.search.neighbor_index import TargetNeighborIndex
+
+
+class TargetNeighborIndexTests(SimpleTestCase):
+    """
+    저장된 target index가 데이터/타겟 조합이 바뀌면 다시 만들어지고, IVF 결과에 빈 id(-1)가 섞이지 않는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp.name, 'model')
+        self.y_train = np.random.default_rng(0).normal(size=(300, 2))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reuses_index_for_same_data(self):
+        first = TargetNeighborIndex.load_or_build(self.model_path, self.y_train, ['a', 'b'])
+        second = TargetNeighborIndex.load_or_build(self.model_path, self.y_train, ['a', 'b'])
+        self.assertEqual(first.fingerprint, second.fingerprint)
+        self.assertTrue(os.path.exists(TargetNeighborIndex.index_path(self.model_path, ['a', 'b'])))
+
+    def test_rebuilds_when_data_changes_with_same_row_count(self):
+        TargetNeighborIndex.load_or_build(self.model_path, self.y_train, ['a', 'b'])
+        retrained = self.y_train[::-1] * 2
+        index = TargetNeighborIndex.load_or_build(self.model_path, retrained, ['a', 'b'])
+        request = retrained[10]
+        self.assertEqual(index.query(request, k=1)[0], 10)
+
+    def test_target_sets_do_not_share_index(self):
+        TargetNeighborIndex.load_or_build(self.model_path, self.y_train, ['a', 'b'])
+        other = self.y_train[:, :1] + 5
+        index = TargetNeighborIndex.load_or_build(self.model_path, other, ['c'])
+        self.assertEqual(index.n_targets, 1)
+        self.assertNotEqual(TargetNeighborIndex.index_path(self.model_path, ['a', 'b']),
+                            TargetNeighborIndex.index_path(self.model_path, ['c']))
+
+    def test_ivf_query_drops_missing_ids(self):
+        index = TargetNeighborIndex(self.y_train, backend='ivf')
+        indices = index.query(self.y_train[0], k=len(self.y_train))
+        self.assertTrue((indices >= 0).all())
+        self.assertEqual(len(np.unique(indices)), len(indices))
@@ -0,0 +1,47 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from hackathon.src.search.nsga2_search import dominance_matrix, fast_non_dominated_sort, crowding_distance
+
+
+def dominates(a, b):
+    return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+
+def peel_fronts(F):
+    """지배되지 않는 개체를 차례로 떼어내는 brute-force front 순위 (비교 기준)"""
+    ranks = [-1] * len(F)
+    remaining = set(range(len(F)))
+    rank = 0
+    while remaining:
+        front = [i for i in remaining if not any(dominates(F[j], F[i]) for j in remaining if j != i)]
+        for i in front:
+            ranks[i] = rank
+        remaining -= set(front)
+        rank += 1
+    return ranks
+
+
+class NSGA2SortTests(SimpleTestCase):
+    """
+    행렬 기반 fast_non_dominated_sort / crowding_distance가 정의대로 계산되는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        # 정수 fitness로 동일 개체와 일부 목적만 같은 개체가 섞이도록 생성
+        self.F = np.random.default_rng(0).integers(0, 6, size=(150, 3)).astype(np.float64)
+
+    def test_non_dominated_sort_matches_brute_force(self):
+        np.testing.assert_array_equal(fast_non_dominated_sort(self.F), peel_fronts(self.F))
+
+    def test_dominance_matrix_block_size(self):
+        np.testing.assert_array_equal(dominance_matrix(self.F, block_size=7), dominance_matrix(self.F))
+
+    def test_crowding_distance_known_front(self):
+        F = np.array([[0.0, 3.0], [1.0, 2.0], [2.0, 1.0], [3.0, 0.0], [0.0, 0.0]])
+        ranks = fast_non_dominated_sort(F)
+        np.testing.assert_array_equal(ranks, [0, 0, 0, 0, 1])
+        distance = crowding_distance(F, ranks)
+        # 경계 개체와 2개 이하인 front는 inf, 내부 개체는 목적별 (이웃 간 거리 / 범위)의 합
+        np.testing.assert_array_equal(distance[[0, 3, 4]], [np.inf, np.inf, np.inf])
+        np.testing.assert_allclose(distance[[1, 2]], [4 / 3, 4 / 3])
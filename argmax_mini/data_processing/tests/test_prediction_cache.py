@@ -0,0 +1,31 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from hackathon.src.search.prediction_cache import PredictionCache
+
+
+class PredictionCacheKeyTests(SimpleTestCase):
+    """
+    PredictionCache key가 반올림 정밀도 안에서만 같아지고, 큰 값/큰 자리수에서도 서로 구분되는지 확인하는 테스트
+    """
+
+    def test_values_within_precision_share_key(self):
+        keys = PredictionCache([2, 0]).make_keys([[0.001, -0.4], [-0.001, 0.3], [0.011, 0.3]])
+        self.assertEqual(keys[0], keys[1])
+        self.assertNotEqual(keys[0], keys[2])
+
+    def test_large_values_with_many_digits_stay_distinct(self):
+        keys = PredictionCache([10]).make_keys([[1e9], [2e9], [3.5e9]])
+        self.assertEqual(len(set(keys)), 3)
+
+    def test_lookup_and_store(self):
+        cache = PredictionCache([3, 10], max_size=2)
+        controls = np.array([[1.0, 5e9], [1.0001, 5e9], [2.0, 6e9]])
+        keys, values, misses = cache.lookup(controls)
+        self.assertEqual(values, [None, None, None])
+        self.assertEqual(sorted(misses.values()), [[0, 1], [2]])
+        cache.store(list(misses), [np.array([0.5]), np.array([0.7])])
+        _, values, misses = cache.lookup(controls)
+        self.assertEqual(misses, {})
+        self.assertEqual([v[0] for v in values], [0.5, 0.5, 0.7])
+        self.assertEqual(cache.hit_rate, 0.5)
@@ -0,0 +1,72 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from hackathon.src.search.fitness_kernel import lexicographic_fitness
+from hackathon.src.search.prescreen import rank_correlation, RandomFeatureRidge, PreScreener
+
+
+def surrogate(X):
+    return (np.sin(3 * X[:, 0]) + X[:, 1] ** 2).reshape(-1, 1)
+
+
+def target_fitness(controls, y_pred, user_request_target):
+    return lexicographic_fitness(y_pred, controls, user_request_target, [], None)
+
+
+class PreScreenerTests(SimpleTestCase):
+    """
+    값싼 모델 pre-screening이 archive를 쌓은 뒤에만 자손을 거르고, 상위 순위를 남기는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.x_min, self.x_max = np.zeros(2), np.ones(2)
+
+    def _screener(self, **kwargs):
+        return PreScreener(target_fitness, (1.0,), np.array([[0.8]]), self.x_min, self.x_max, **kwargs)
+
+    def test_rank_correlation(self):
+        a = self.rng.random(50)
+        self.assertAlmostEqual(rank_correlation(a, a * 3 + 1), 1.0)
+        self.assertAlmostEqual(rank_correlation(a, -a), -1.0)
+        self.assertEqual(rank_correlation(a, np.zeros(50)), 0.0)
+        # 동순위(예: border 구간 안에서 같은 surrogate 예측값)는 평균 순위로 비교
+        self.assertAlmostEqual(rank_correlation([1, 1, 2, 2], [0, 0, 5, 5]), 1.0)
+
+    def test_random_feature_ridge_fits_smooth_function(self):
+        X = self.rng.random((1000, 2))
+        model = RandomFeatureRidge(self.x_min, self.x_max).fit(X[:800], surrogate(X[:800]))
+        residual = model.predict(X[800:]) - surrogate(X[800:])
+        self.assertLess(np.mean(residual ** 2) / np.var(surrogate(X[800:])), 0.05)
+
+    def test_keeps_everything_until_archive_is_filled(self):
+        screener = self._screener(min_archive=200)
+        X = self.rng.random((150, 2))
+        screener.observe(X, surrogate(X))
+        self.assertTrue(screener.screen(self.rng.random((100, 2))).all())
+        self.assertEqual(screener.skip_rate, 0.0)
+
+    def test_skips_offspring_once_cheap_model_ranks_well(self):
+        screener = self._screener(min_archive=200, explore=0.05)
+        for _ in range(10):
+            X = self.rng.random((100, 2))
+            screener.observe(X, surrogate(X))
+        self.assertLess(screener.fraction, 0.5)
+
+        offspring = self.rng.random((200, 2))
+        keep = screener.screen(offspring)
+        n_top = int(np.ceil(screener.fraction * len(offspring)))
+        n_explore = int(np.ceil(screener.explore * len(offspring)))
+        self.assertEqual(keep.sum(), n_top + n_explore)
+        # 값싼 모델 기준 상위 개체는 모두 surrogate로 평가
+        cheap_error = ((screener.model.predict(offspring) - 0.8) ** 2)[:, 0]
+        self.assertTrue(keep[np.argsort(cheap_error)[:n_top]].all())
+        self.assertAlmostEqual(screener.skip_rate, 1 - keep.mean())
+
+    def test_archive_is_bounded(self):
+        screener = self._screener(min_archive=50, archive_size=300)
+        for _ in range(10):
+            X = self.rng.random((100, 2))
+            screener.observe(X, surrogate(X))
+        self.assertLessEqual(screener.n_archive, 300 + 100)
+        self.assertEqual(screener.n_archive, sum(len(X) for X in screener.archive_X))
@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+
+from hackathon.search_benchmark import SEARCH_RUNNERS, run_case
+
+
+class SearchBenchmarkRunnerTests(SimpleTestCase):
+    """
+    기본 등록된 search runner가 synthetic 데이터셋에서 오류 없이 끝나는지 확인하는 테스트
+    """
+
+    settings = {'max_gen': 3, 'pop_size': 50, 'n_rows': 2}
+
+    def test_default_runners_finish_on_synthetic(self):
+        for search_name in SEARCH_RUNNERS:
+            with self.subTest(search=search_name):
+                result = run_case(search_name, 'synthetic', 0, self.settings, track_memory=False)
+                # 선택 의존성(torch, bayes_opt 등)이 없는 환경에서만 건너뜀
+                if result['status'].startswith('skipped'):
+                    self.skipTest(result['status'])
+                self.assertEqual(result['status'], 'ok')
+                self.assertGreater(result['evaluations'], 0)
@@ -0,0 +1,52 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from hackathon.src.search.fitness_kernel import lexicographic_fitness, round_columns
+
+
+def closure_fitness(y_pred, population, user_request_target, sorted_pop_idx_by_importance, rounding_digits):
+    """기존 k_means_search_deploy의 fitness closure (비교 기준)"""
+    target_fit = -(y_pred - user_request_target.reshape(1, -1))**2
+    fit_res = [target_fit] + [population[:, i:i+1] for i in sorted_pop_idx_by_importance]
+    fit_res = np.concatenate(fit_res, axis=1)
+    return np.vectorize(round)(fit_res, rounding_digits)
+
+
+class LexicographicFitnessParityTests(SimpleTestCase):
+    """
+    배열 기반 lexicographic_fitness / round_columns가 기존 fitness closure와 같은 값을 내는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.population = rng.normal(scale=[1.0, 50.0, 0.01, 3.0], size=(500, 4))
+        self.objective_columns = [2, 0, 3]
+
+    def test_single_target_matches_closure(self):
+        y_pred = np.random.default_rng(1).normal(size=(500, 1))
+        target = np.array([[0.3]])
+        digits = np.array([3, 5, 2, 4])
+        np.testing.assert_array_equal(
+            lexicographic_fitness(y_pred, self.population, target, self.objective_columns, digits),
+            closure_fitness(y_pred, self.population, target, self.objective_columns, digits))
+
+    def test_multi_target_matches_closure(self):
+        y_pred = np.random.default_rng(2).normal(size=(500, 2))
+        target = np.array([[0.3, -1.2]])
+        digits = np.array([2, 6, 3, 10, 2])
+        np.testing.assert_array_equal(
+            lexicographic_fitness(y_pred, self.population, target, self.objective_columns, digits),
+            closure_fitness(y_pred, self.population, target, self.objective_columns, digits))
+
+    def test_without_rounding(self):
+        y_pred = np.random.default_rng(3).normal(size=(500, 1))
+        target = np.array([[0.3]])
+        fitness = lexicographic_fitness(y_pred, self.population, target, self.objective_columns, None)
+        np.testing.assert_array_equal(fitness[:, 0], -(y_pred[:, 0] - 0.3) ** 2)
+        np.testing.assert_array_equal(fitness[:, 1:], self.population[:, self.objective_columns])
+
+    def test_round_columns_matches_builtin_round(self):
+        fitness = np.random.default_rng(4).normal(scale=100.0, size=(300, 3))
+        digits = np.array([2, 0, 7])
+        np.testing.assert_array_equal(round_columns(fitness.copy(), digits),
+                                      np.vectorize(round)(fitness, digits))
@@ -0,0 +1,55 @@
+import numpy as np
+from django.test import SimpleTestCase
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from hackathon.src.search.search_engine import SearchEngine
+
+
+class StubModel:
+    """process pool worker로 pickle 가능한 결정적 surrogate"""
+
+    def predict(self, X):
+        return np.sin(X[:, 0]) + 0.5 * X[:, 1] + 0.1 * np.floor(X[:, 2])
+
+
+def stub_predict(model, X_test):
+    return model.predict(X_test).reshape(-1, 1)
+
+
+class SearchParallelDeterminismTests(SimpleTestCase):
+    """
+    같은 seed이면 serial(batched=False) 탐색과 n_jobs > 1 탐색 결과가 같은지 확인하는 테스트
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        X_train = rng.uniform(0, 3, size=(200, 4))
+        X_train[:, 2] = rng.integers(0, 4, size=200)
+        y_train = stub_predict(StubModel(), X_train)
+        names = ['a', 'b', 'c', 'd']
+        scalers = {'a': StandardScaler(), 'b': StandardScaler(), 'c': LabelEncoder(), 'd': StandardScaler()}
+        self.engine = SearchEngine(StubModel(), stub_predict, X_train, y_train, names, ['a', 'b', 'c'],
+                                   {'a': 'maximize', 'b': 'minimize'}, {'a': 1, 'b': 2},
+                                   {'a': (0, 3), 'b': (0, 3), 'c': (0, 3)}, scalers, engine='array')
+        self.rows = X_train[:4]
+        self.y_rows = y_train[:4]
+        self.target = np.array([[1.5]])
+
+    def tearDown(self):
+        self.engine.close()
+
+    def _search(self, **kwargs):
+        return self.engine.search(self.target, self.rows, max_gen=5, pop_size=60, seed=7,
+                                  y_rows=self.y_rows, **kwargs)
+
+    def test_serial_and_parallel_match(self):
+        serial = self._search(batched=False)
+        parallel = self._search(n_jobs=3)
+        self.assertTrue(serial.equals(parallel))
+
+    def test_pool_is_reused_across_requests(self):
+        first = self._search(n_jobs=3)
+        pool = self.engine._pool
+        second = self._search(n_jobs=3)
+        self.assertIs(self.engine._pool, pool)
+        self.assertTrue(first.equals(second))
@@ -0,0 +1,55 @@
+import numpy as np
+from django.test import SimpleTestCase
+
+from hackathon.src.search.ga_function import lexicographic_order, grouped_lexicographic_selection
+
+
+def per_cluster_selection(cluster_labels, fitness, weights, n_clusters):
+    """기존 k_means_selection의 클러스터별 정렬 + 홀수 크기 조정 (비교 기준)"""
+    adjustment_flag = False
+    selected = []
+    for cluster_id in range(n_clusters):
+        cluster_indices = list(np.where(cluster_labels == cluster_id)[0])
+        cluster_size = len(cluster_indices)
+        selection_size = cluster_size // 2
+        if cluster_size % 2 == 1 and not adjustment_flag:
+            selection_size += 1
+            adjustment_flag = True
+        elif cluster_size % 2 == 1 and adjustment_flag:
+            adjustment_flag = False
+        cluster_indices.sort(key=lambda idx: tuple(val * w for val, w in zip(fitness[idx], weights)), reverse=True)
+        selected.extend(cluster_indices[:selection_size])
+    return selected
+
+
+class LexicographicSelectionParityTests(SimpleTestCase):
+    """
+    배열 기반 lexicographic 정렬/선택이 기존 개체 리스트 정렬과 같은 개체를 같은 순서로 고르는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # 반올림으로 동순위가 많이 생기는 fitness (타겟 오차, 최대화 변수, 최소화 변수)
+        self.fitness = np.round(np.stack([-rng.random(400) ** 2, rng.random(400), rng.random(400)], axis=1), 1)
+        self.weights = (1.0, 1.0, -1.0)
+
+    def test_lexicographic_order_matches_sort(self):
+        expected = sorted(range(len(self.fitness)), reverse=True,
+                          key=lambda idx: tuple(val * w for val, w in zip(self.fitness[idx], self.weights)))
+        np.testing.assert_array_equal(lexicographic_order(self.fitness, self.weights), expected)
+
+    def test_grouped_selection_matches_per_cluster_sort(self):
+        rng = np.random.default_rng(1)
+        for n_clusters in [1, 7, 50, 133]:
+            # 빈 클러스터와 홀수 크기 클러스터가 섞이도록 라벨 생성
+            labels = rng.integers(0, n_clusters, size=len(self.fitness))
+            selected = grouped_lexicographic_selection(labels, self.fitness, self.weights, n_clusters)
+            np.testing.assert_array_equal(selected,
+                                          per_cluster_selection(labels, self.fitness, self.weights, n_clusters))
+
+    def test_population_size_is_kept(self):
+        # 부모 + 자손(2배)에서 절반을 고르면 개체 수가 유지되어야 함
+        labels = np.random.default_rng(2).integers(0, 33, size=len(self.fitness))
+        selected = grouped_lexicographic_selection(labels, self.fitness, self.weights, 33)
+        self.assertEqual(len(selected), len(self.fitness) // 2)
+        self.assertEqual(len(np.unique(selected)), len(selected))
@@ -0,0 +1,54 @@
+import os
+import pickle
+import tempfile
+from unittest import mock
+
+import torch
+from django.test import SimpleTestCase
+
+from hackathon.src.surrogate.tabpfn_device import load_model
+
+
+class StandInEstimator:
+    """GPU에서 학습한 TabPFN 추정기처럼 장치 설정과 network를 가진 대역 객체"""
+
+    def __init__(self):
+        self.device = 'cuda'
+        self.device_ = torch.device('cuda')
+        self.use_autocast_ = True
+        self.model_ = torch.nn.Linear(3, 1)
+        self.tabpfn_device_ = 'cuda'
+
+
+class TabPFNDeviceLoadTests(SimpleTestCase):
+    """
+    CUDA 장치로 기록된 tensor를 가진 모델 pickle이 CPU 실행 환경에서 CPU로 옮겨 불러와지는지 확인하는 테스트
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'model.pkl')
+        self.estimator = StandInEstimator()
+        # 모든 storage가 CUDA 장치로 기록되도록 pickle (CUDA에서 학습한 모델 저장과 같은 형태)
+        with mock.patch('torch.serialization.location_tag', return_value='cuda:0'), open(self.path, 'wb') as f:
+            pickle.dump(self.estimator, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_plain_pickle_fails_without_cuda(self):
+        if torch.cuda.is_available():
+            self.skipTest('CUDA 사용 가능 환경')
+        with open(self.path, 'rb') as f, self.assertRaises(RuntimeError):
+            pickle.load(f)
+
+    def test_cpu_load_maps_tensors_and_device(self):
+        with mock.patch.dict(os.environ, {'TABPFN_DEVICE': ''}):
+            model = load_model(self.path, device='cpu')
+        self.assertEqual(model.device, 'cpu')
+        self.assertEqual(model.device_, torch.device('cpu'))
+        self.assertEqual(model.tabpfn_device_, 'cpu')
+        self.assertFalse(model.use_autocast_)
+        for name, parameter in model.model_.named_parameters():
+            self.assertEqual(parameter.device.type, 'cpu')
+            self.assertTrue(torch.equal(parameter, getattr(self.estimator.model_, name)))
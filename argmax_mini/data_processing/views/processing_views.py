@@ -18,6 +18,11 @@ from data_processing.models import FlowModel, ConcatColumnModel, SurrogateMatric
 
 from hackathon.src.dynamic_pipeline import preprocess_dynamic
 from hackathon import surrogate_model, search_model
+from hackathon.src.search import TargetNeighborIndex
+from hackathon.src.registry import registry
+
+# Stop training the other surrogate candidates once one reaches this average r_squared.
+SURROGATE_CANCEL_R2 = 0.995
 
 
 def flow_progress(flow, progress):
@@ -77,6 +82,15 @@ class ProcessingView(APIView):
                     type=openapi.TYPE_INTEGER,
                     description="ID of the Concated csv file",
                 ),
+                'search_preset': openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    enum=['fast', 'balanced', 'thorough'],
+                    description="Search speed preset (default: balanced)",
+                ),
+                'search_deadline': openapi.Schema(
+                    type=openapi.TYPE_NUMBER,
+                    description="Search wall-clock limit in seconds (overrides search_preset)",
+                ),
             },
         ),
         responses={
@@ -95,6 +109,16 @@ class ProcessingView(APIView):
         if not flow_id:
             return Response({"error": "No flow_id provided"}, status=400)
 
+        # Search response-time budget.
+        search_preset = request.data.get("search_preset", "balanced")
+        search_deadline = request.data.get("search_deadline")
+        if search_preset not in ('fast', 'balanced', 'thorough'):
+            return Response({"error": "Invalid search_preset"}, status=400)
+        try:
+            search_deadline = float(search_deadline) if search_deadline is not None else None
+        except (TypeError, ValueError):
+            return Response({"error": "Invalid search_deadline"}, status=400)
+
         try:
             flow = FlowModel.objects.get(id=flow_id)
         except FlowModel.DoesNotExist:
@@ -130,35 +154,38 @@ class ProcessingView(APIView):
 
         # Define common arguments for surrogate model training.
         common_args = {
-            "target": output_columns,
+            "target": list(output_columns),
             "data_path": flow.preprocessed_csv.path,
             "flow_id": flow_id,
             "seed": 40
         }
 
-        # Train the CatBoost-based surrogate model.
-        catboost_args = argparse.Namespace(**common_args, model='catboost')
-        df_rank_cat, df_eval_cat, df_importance, model_path_cat = surrogate_model.main(
-            catboost_args, scaler_info)
-
-        # Train the TabPFN-based surrogate model.
-        tabpfn_args = argparse.Namespace(**common_args, model='tabpfn')
-        df_rank_tab, df_eval_tab, model_path_tab = surrogate_model.main(
-            tabpfn_args, scaler_info)
+        # Train the CatBoost and TabPFN surrogate candidates concurrently in separate processes.
+        # CatBoost always runs to completion because it provides the feature importance.
+        candidate_args = {name: argparse.Namespace(**common_args, model=name) for name in ('catboost', 'tabpfn')}
+        candidate_results = surrogate_model.train_candidates(
+            candidate_args, scaler_info, cancel_score=SURROGATE_CANCEL_R2, required=('catboost',))
+        if 'catboost' not in candidate_results:
+            return Response({"error": "Surrogate model training failed"}, status=500)
+        df_rank_cat, df_eval_cat, df_importance, model_path_cat = candidate_results['catboost']
         flow_progress(flow, 4)
 
         # Choose the model with the higher average r_squared.
-        if df_eval_cat['r2'].mean() > df_eval_tab['r2'].mean():
+        if 'tabpfn' not in candidate_results or df_eval_cat['r2'].mean() > candidate_results['tabpfn'][1]['r2'].mean():
             surrogate_model_name = 'catboost'
             df_rank, df_eval, model_path = df_rank_cat, df_eval_cat, model_path_cat
         else:
             surrogate_model_name = 'tabpfn'
-            df_rank, df_eval, model_path = df_rank_tab, df_eval_tab, model_path_tab
+            result = candidate_results['tabpfn']
+            df_rank, df_eval, model_path = result[0], result[1], result[-1]
 
         # Save the chosen model file.
         model_filename = model_path.split('/')[-1]
         flow.model.save(model_filename, ContentFile(open(model_path, 'rb').read()))
 
+        # Drop the previously loaded model, data and search engines of this flow.
+        registry.invalidate(flow_id)
+
         # Clean up temporary files.
         shutil.rmtree('./temp')
         print(f'{df_rank = }')
@@ -225,6 +252,9 @@ class ProcessingView(APIView):
         elif surrogate_model_name == 'tabpfn':
             model_path = flow.model.path.removesuffix('.pkl')
 
+        # Build the target nearest-neighbor index next to the model file.
+        TargetNeighborIndex(preprocessed_df[target_column].to_numpy(), target_names=target_column).save(
+            TargetNeighborIndex.index_path(model_path, target_column))
 
         search_args = argparse.Namespace(
             model=surrogate_model_name,
@@ -238,7 +268,9 @@ class ProcessingView(APIView):
             flow_id=flow_id,
             seed=40,
             user_request_target=user_request_target,
-            model_path=model_path
+            model_path=model_path,
+            search_preset=None if search_deadline is not None else search_preset,
+            search_deadline=search_deadline
         )
 
         x_opt = search_model.main(search_args, scaler_info)
@@ -0,0 +1,365 @@
+# search_benchmark.py
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import hackathon.src.search as search
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# 벤치마크 데이터셋: (CSV 경로, 타겟 열), synthetic은 seed로 생성
+BUNDLED_DATASETS = {
+    'dvm': ('dvm_merged_processed.csv', 'Annual_revenue'),
+    'ecommerce': ('ecommerce_sampled_10000.csv', 'revenue'),
+    'employee_attrition': ('employee_attrition_dataset.csv', 'Monthly_Income'),
+}
+
+# 규모별 탐색 설정
+BENCHMARK_SCALES = {
+    'small': {'max_gen': 20, 'pop_size': 300, 'n_rows': 3},
+    'full': {'max_gen': 100, 'pop_size': 1000, 'n_rows': 5},
+}
+
+
+class StubSurrogate:
+    """
+    학습된 모델 파일 없이 사용하는 결정적(deterministic) surrogate
+
+    [X, sin(X)] 특성에 대한 최소제곱 선형 모델로, 호출 횟수와 예측 행 수를 기록합니다.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.coef = None
+        self.n_calls = 0
+        self.n_rows = 0
+
+    @staticmethod
+    def _features(X):
+        X = np.asarray(X, dtype=np.float64)
+        return np.concatenate([X, np.sin(X), np.ones((len(X), 1))], axis=1)
+
+    def fit(self, X, y):
+        self.coef, *_ = np.linalg.lstsq(self._features(X), np.asarray(y, dtype=np.float64).reshape(-1), rcond=None)
+        return self
+
+    def predict(self, X):
+        self.n_calls += 1
+        self.n_rows += len(X)
+        return self._features(X) @ self.coef
+
+    def reset(self):
+        self.n_calls = 0
+        self.n_rows = 0
+
+
+def stub_predict(model, X_test):
+    """surrogate *_predict 함수와 같은 형태 (n, 1) 예측"""
+    return model.predict(X_test).reshape(-1, 1)
+
+
+def load_benchmark_data(dataset, seed, n_samples=2000, n_features=8):
+    """
+    벤치마크 데이터셋을 수치 행렬로 불러옵니다.
+
+    Args:
+        dataset (str): 'synthetic' 또는 BUNDLED_DATASETS의 이름
+        seed (int): synthetic 데이터 생성 seed
+
+    Returns:
+        X (np.ndarray), y (np.ndarray), x_col_list (list), is_nominal (list)
+    """
+    if dataset == 'synthetic':
+        rng = np.random.default_rng(seed)
+        X = rng.normal(size=(n_samples, n_features))
+        X[:, -2:] = rng.integers(0, 4, size=(n_samples, 2))
+        weights = rng.normal(size=n_features)
+        y = np.sin(X) @ weights + 0.3 * X[:, 0] * X[:, 1] + 0.1 * rng.normal(size=n_samples)
+        x_col_list = [f'x{i}' for i in range(n_features)]
+        return X, y, x_col_list, [False] * (n_features - 2) + [True] * 2
+
+    file_name, target = BUNDLED_DATASETS[dataset]
+    df = pd.read_csv(os.path.join(DATA_DIR, file_name)).select_dtypes(include='number').dropna()
+    df = df.loc[:, df.nunique() > 1]
+    y = df.pop(target).to_numpy(dtype=np.float64)
+    y = (y - y.mean()) / (y.std() or 1.0)
+
+    # 정수형이면서 고유값이 적은 열은 범주형으로 보고 0부터 다시 번호를 매김
+    is_nominal = []
+    columns = []
+    for col in df.columns:
+        values = df[col].to_numpy()
+        nominal = np.issubdtype(values.dtype, np.integer) and df[col].nunique() <= 20
+        if nominal:
+            values = np.unique(values, return_inverse=True)[1]
+        else:
+            values = (values - values.mean()) / (values.std() or 1.0)
+        columns.append(values.astype(np.float64))
+        is_nominal.append(nominal)
+    return np.stack(columns, axis=1), y, df.columns.tolist(), is_nominal
+
+
+def make_problem(dataset, seed, n_rows):
+    """
+    데이터셋으로 stub surrogate를 학습하고 탐색 문제(목표값, 시작 행, 제어 변수)를 만듭니다.
+
+    Returns:
+        dict: 탐색 함수 실행에 필요한 값
+    """
+    X, y, x_col_list, is_nominal = load_benchmark_data(dataset, seed)
+    model = StubSurrogate(seed).fit(X, y)
+    y_model = model.predict(X).reshape(-1, 1)
+    model.reset()
+
+    # 상위 분위수 값을 목표로 하고, 목표와 가까운 n_rows개 행에서 탐색 시작
+    target = np.quantile(y_model, 0.75).reshape(1, 1)
+    nearest = np.argsort(np.abs(y_model[:, 0] - target[0, 0]), kind='stable')[:n_rows]
+
+    # 연속형 변수 최대 4개를 제어 변수로 사용, 앞의 두 개는 최대화/최소화 목표
+    continuous = [i for i, nominal in enumerate(is_nominal) if not nominal]
+    nominal_cols = [i for i, nominal in enumerate(is_nominal) if nominal]
+    control_index = sorted(continuous[:3] + nominal_cols[:1])
+    control_name = [x_col_list[i] for i in control_index]
+    optimize = {x_col_list[continuous[0]]: 'maximize'}
+    importance = {x_col_list[continuous[0]]: 1}
+    if len(continuous) > 1:
+        optimize[x_col_list[continuous[1]]] = 'minimize'
+        importance[x_col_list[continuous[1]]] = 2
+
+    scalers = {col: (LabelEncoder() if nominal else StandardScaler()) for col, nominal in zip(x_col_list, is_nominal)}
+    bounds = {x_col_list[i]: (X[:, i].min(), X[:, i].max()) for i in control_index}
+
+    return {
+        'model': model, 'X_train': X, 'X_test': X[nearest], 'y_test': y_model[nearest],
+        'x_col_list': x_col_list, 'control_name': control_name, 'control_index': control_index,
+        'optimize': optimize, 'importance': importance, 'bounds': bounds, 'scalers': scalers,
+        'target': target,
+    }
+
+
+def _run_deploy(search_func, problem, settings, seed):
+    df = search_func(problem['model'], stub_predict, problem['X_train'], problem['X_test'], problem['y_test'],
+                     problem['x_col_list'], problem['control_name'], problem['optimize'], problem['importance'],
+                     problem['bounds'], problem['scalers'], problem['target'], batched=True, engine='array',
+                     max_gen=settings['max_gen'], pop_size=settings['pop_size'], seed=seed)
+    x_opt = problem['X_test'].copy()
+    x_opt[:, problem['control_index']] = df[[f'pred_x_{col}' for col in problem['control_name']]].to_numpy()
+    return x_opt
+
+
+def run_k_means_deploy(problem, settings, seed):
+    return _run_deploy(search.k_means_search_deploy, problem, settings, seed)
+
+
+def run_nsga2_deploy(problem, settings, seed):
+    return _run_deploy(search.nsga2_search_deploy, problem, settings, seed)
+
+
+def run_cmaes_deploy(problem, settings, seed):
+    # CMA-ES는 GA 개체 수 대신 자체 기본 개체 수(4 + 3 ln(n), restart마다 두 배)와 세대 수를 사용
+    return _run_deploy(search.cmaes_search_deploy, problem, dict(settings, max_gen=None, pop_size=None), seed)
+
+
+def _row_targets(problem):
+    return np.repeat(problem['target'], len(problem['X_test']), axis=0)
+
+
+def run_ga_adaptive_niching(problem, settings, seed):
+    # ga_adaptive_niching_search는 입력 특성 8개를 가정
+    if problem['X_train'].shape[1] != 8:
+        raise NotImplementedError('ga_adaptive_niching은 특성 8개 데이터셋만 지원합니다')
+    return search.ga_adaptive_niching_search(problem['model'], stub_predict, problem['X_train'], problem['X_test'],
+                                             _row_targets(problem), max_gen=settings['max_gen'], seed=seed)
+
+
+def run_ga_deap(problem, settings, seed):
+    return search.ga_deap_search(problem['model'], stub_predict, problem['X_train'], problem['X_test'],
+                                 _row_targets(problem), max_gen=settings['max_gen'])
+
+
+def run_bayesian(problem, settings, seed):
+    # bayesian_search는 첫 번째 행만 최적화, objective가 스칼라 예측/목표값을 받도록 1차원으로 전달
+    optimum = search.bayesian_search(problem['model'], lambda m, X: m.predict(X), problem['X_train'],
+                                     problem['X_test'], _row_targets(problem)[:, 0])
+    params = optimum['params']
+    return np.array([[params[f'x{i}'] for i in range(len(params))]])
+
+
+# 벤치마크할 search model
+SEARCH_RUNNERS = {
+    'k_means_deploy': run_k_means_deploy,
+    'nsga2_deploy': run_nsga2_deploy,
+    'cmaes_deploy': run_cmaes_deploy,
+    'ga_adaptive_niching': run_ga_adaptive_niching,
+    'ga_deap': run_ga_deap,
+    'bayesian': run_bayesian,
+}
+
+
+def run_case(search_name, dataset, seed, settings, track_memory=True, quiet=True):
+    """
+    search model 하나를 한 번 실행하고 지표를 기록합니다.
+
+    Returns:
+        dict: wall time, surrogate 호출/평가 수, 초당 평가 수, peak memory, 목표 오차
+    """
+    result = {'search': search_name, 'dataset': dataset, 'seed': seed}
+    problem = make_problem(dataset, seed, settings['n_rows'])
+    model = problem['model']
+
+    random.seed(seed)
+    np.random.seed(seed)
+    if track_memory:
+        tracemalloc.start()
+    output = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            x_opt = SEARCH_RUNNERS[search_name](problem, settings, seed)
+    except (ImportError, NotImplementedError) as e:
+        result['status'] = f'skipped: {e}'
+        return result
+    except Exception as e:
+        logging.warning(f"{search_name} / {dataset} 실패: {e!r}")
+        result['status'] = f'error: {e!r}'
+        return result
+    finally:
+        wall_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if track_memory:
+            tracemalloc.stop()
+
+    n_calls, n_evals = model.n_calls, model.n_rows
+    error = np.abs(model.predict(x_opt) - problem['target'][0, 0])
+    result.update({
+        'status': 'ok',
+        'wall_time_s': wall_time,
+        'surrogate_calls': n_calls,
+        'evaluations': n_evals,
+        'evals_per_s': n_evals / wall_time if wall_time > 0 else None,
+        'peak_memory_mb': peak / 2**20 if peak is not None else None,
+        'mean_abs_error': float(error.mean()),
+        'max_abs_error': float(error.max()),
+    })
+    return result
+
+
+def summarize(results):
+    """(search, dataset)별 지표 중앙값"""
+    df = pd.DataFrame([r for r in results if r.get('status') == 'ok'])
+    if df.empty:
+        return {}
+    metrics = ['wall_time_s', 'surrogate_calls', 'evaluations', 'evals_per_s', 'peak_memory_mb', 'mean_abs_error']
+    summary = df.groupby(['search', 'dataset'])[[m for m in metrics if m in df]].median()
+    return {f'{search_name}/{dataset}': row.dropna().to_dict() for (search_name, dataset), row in summary.iterrows()}
+
+
+def compare_with_baseline(summary, baseline_summary, tolerance=0.2):
+    """
+    baseline 대비 wall time, 목표 오차가 tolerance 비율 이상 나빠진 항목을 찾습니다.
+
+    Returns:
+        list: 회귀(regression) 설명 문자열 리스트
+    """
+    regressions = []
+    for key, metrics in summary.items():
+        base = baseline_summary.get(key)
+        if base is None:
+            logging.info(f"{key}: baseline 없음")
+            continue
+        for metric in ('wall_time_s', 'mean_abs_error'):
+            if metric not in metrics or metric not in base:
+                continue
+            new, old = metrics[metric], base[metric]
+            ratio = new / old if old else float('inf') if new else 1.0
+            logging.info(f"{key} {metric}: {old:.4g} -> {new:.4g} (x{ratio:.2f})")
+            # 오차는 매우 작은 값끼리의 비율 변동을 무시
+            if ratio > 1 + tolerance and not (metric == 'mean_abs_error' and new < 1e-6):
+                regressions.append(f"{key} {metric}: {old:.4g} -> {new:.4g}")
+    return regressions
+
+
+def main(args):
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    settings = dict(BENCHMARK_SCALES[args.scale])
+    if args.max_gen is not None:
+        settings['max_gen'] = args.max_gen
+    if args.pop_size is not None:
+        settings['pop_size'] = args.pop_size
+
+    seeds = [args.seed + i for i in range(args.repeat)]
+    results = []
+    for search_name in args.search:
+        for dataset in args.dataset:
+            for seed in seeds:
+                result = run_case(search_name, dataset, seed, settings,
+                                  track_memory=not args.no_memory, quiet=not args.verbose)
+                logging.info(json.dumps(result, ensure_ascii=False))
+                results.append(result)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'settings': settings,
+            'seeds': seeds,
+        },
+        'results': results,
+        'summary': summarize(results),
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logging.info(f"benchmark report 저장: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report['summary'], baseline.get('summary', {}), args.tolerance)
+        for regression in regressions:
+            logging.warning(f"regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='search model 벤치마크 스크립트')
+    arg = parser.add_argument
+    arg('--search', '--search', '-search', nargs='+', default=list(SEARCH_RUNNERS),
+        choices=list(SEARCH_RUNNERS), help='벤치마크할 search model (기본값: 전체)')
+    arg('--dataset', '--dataset', '-dataset', nargs='+', default=['synthetic'],
+        choices=['synthetic'] + list(BUNDLED_DATASETS), help='벤치마크 데이터셋 (기본값: synthetic)')
+    arg('--scale', '--scale', '-scale', type=str, default='small',
+        choices=list(BENCHMARK_SCALES), help='탐색 규모 (기본값: small)')
+    arg('--max_gen', '--max_gen', '-max_gen', type=int, default=None, help='최대 세대 수 (scale 값 대신 사용)')
+    arg('--pop_size', '--pop_size', '-pop_size', type=int, default=None, help='개체 수 (scale 값 대신 사용)')
+    arg('--seed', '--seed', '-seed', type=int, default=42, help='첫 번째 seed (기본값: 42)')
+    arg('--repeat', '--repeat', '-repeat', type=int, default=3, help='seed를 바꿔 반복할 횟수 (기본값: 3)')
+    arg('--output', '--output', '-output', type=str, default='./search_benchmark.json',
+        help='JSON report 저장 경로')
+    arg('--baseline', '--baseline', '-baseline', type=str, default=None,
+        help='비교할 baseline JSON report 경로 (회귀가 있으면 exit code 1)')
+    arg('--tolerance', '--tolerance', '-tolerance', type=float, default=0.2,
+        help='회귀로 판단할 baseline 대비 증가 비율 (기본값: 0.2)')
+    arg('--no_memory', '--no_memory', '-no_memory', action='store_true',
+        help='tracemalloc peak memory 측정을 끕니다 (측정 오버헤드 제거)')
+    arg('--verbose', '--verbose', '-verbose', action='store_true', help='search 함수 출력을 그대로 표시합니다')
+    args = parser.parse_args()
+
+    raise SystemExit(main(args))
@@ -11,16 +11,59 @@ import hackathon.src.search as search
 import hackathon.src.surrogate as surrogate
 from hackathon.src.utils import Setting, measure_time
 from hackathon.src.datasets.data_loader import load_data
+from hackathon.src.registry import registry, estimate_size, files_size
 # from src.surrogate.eval_surrogate_model import eval_surrogate_model
 
 
-def find_top_k_similar_with_user_request(y_user_request, X_train, y_train, k=50):
+def find_top_k_similar_with_user_request(y_user_request, X_train, y_train, k=50, neighbor_index=None):
+    if neighbor_index is not None:
+        # 타겟별 scale로 정규화한 거리 기준 nearest-neighbor index 조회
+        top_k_indices = neighbor_index.query(y_user_request.reshape(-1), k=k)
+        return X_train[top_k_indices], y_train[top_k_indices]
     # euclidean distance
     distances = np.linalg.norm(y_train - y_user_request.reshape(1, -1), axis=1)
     top_k_indices = np.argsort(distances)[:k]
     return X_train[top_k_indices], y_train[top_k_indices]
 
 
+def load_search_dataset(data_path, target):
+    """
+    전처리된 데이터를 불러와 탐색에 사용하는 numpy 배열과 열별 통계를 만듭니다.
+
+    Returns:
+        dict: X_train, y_train, x_col_list, 열별 최솟값(x_min)/최댓값(x_max)
+    """
+    df = load_data(data_path)
+    X = df.drop(columns=target)
+    y = df[target]
+    X_train, y_train = X.to_numpy(), y.to_numpy()
+    return {
+        'X_train': X_train,
+        'y_train': y_train,
+        'x_col_list': X.columns.tolist(),
+        'x_min': X_train.min(axis=0),
+        'x_max': X_train.max(axis=0),
+    }
+
+
+def model_file_paths(model_path):
+    """모델 로드 함수가 읽을 수 있는 파일 경로 (확장자 포함/제외)"""
+    return [model_path, model_path + '.cbm', model_path + '.pkl']
+
+
+def search_engine_key(args, control_range):
+    """(search model, surrogate, 제어 변수 설정)별 SearchEngine registry key (파일 수정 시각은 registry가 포함)"""
+    return (
+        args.search_model, args.model, args.model_path,
+        tuple(args.control_name), tuple(args.target),
+        tuple(sorted((k, tuple(float(v) for v in value)) for k, value in control_range.items())),
+        tuple(sorted(args.importance.items())), tuple(sorted(args.optimize.items())),
+        getattr(args, 'search_engine', 'array'), getattr(args, 'niching', 'kmeans'),
+        getattr(args, 'border_space', True), getattr(args, 'numpy_catboost', False),
+        getattr(args, 'prescreen', False),
+    )
+
+
 def main(args, scalers=None):
     # 로깅 설정
     logging.basicConfig(level=logging.INFO,
@@ -41,12 +84,10 @@ def main(args, scalers=None):
     # load_data_func = datasets.load_and_split_data_with_x_col_list
 
     # X_train, X_test, y_train, y_test, x_col_list = load_data_func(args.data_path, args.target)
-    df = load_data(args.data_path)
-    X = df.drop(columns=args.target)
-    y = df[args.target]
-    x_col_list = X.columns.tolist()
-
-    X_train, y_train = X.to_numpy(), y.to_numpy()
+    # 같은 flow의 반복 요청에서는 registry에 보관한 배열과 통계를 재사용 (파일이 바뀌면 다시 로드)
+    dataset = registry.get_or_load(args.flow_id, 'dataset', lambda: load_search_dataset(args.data_path, args.target),
+                                   paths=[args.data_path], extra=tuple(args.target))
+    X_train, y_train, x_col_list = dataset['X_train'], dataset['y_train'], dataset['x_col_list']
 
     control_range = {}
 
@@ -59,8 +100,7 @@ def main(args, scalers=None):
                     control_range[key] = (ran_val[0],ran_val[1])
                 else:
                     i = x_col_list.index(key)
-                    control_range[key] = (
-                    X_train[:, i].min(), X_train[:, i].max())
+                    control_range[key] = (dataset['x_min'][i], dataset['x_max'][i])
             else:
                 control_range[key] = tuple(scalers[key].transform(
                     np.array(value).reshape(-1, 1)).flatten())
@@ -75,8 +115,14 @@ def main(args, scalers=None):
     else:
         raise ValueError("scalers is not provided")
 
+    # 모델 옆에 저장된 타겟 neighbor index 사용 (없으면 만들어 저장)
+    neighbor_index = registry.get_or_load(
+        args.flow_id, 'neighbor_index',
+        lambda: search.TargetNeighborIndex.load_or_build(args.model_path, y_train, target_names=args.target),
+        paths=[search.TargetNeighborIndex.index_path(args.model_path, args.target), args.data_path],
+        extra=tuple(args.target))
     X_test, y_test = find_top_k_similar_with_user_request(
-        y_user_request, X_train, y_train, k=5)
+        y_user_request, X_train, y_train, k=5, neighbor_index=neighbor_index)
 
     def inverse_transform(df):  # , col_names):
         """
@@ -110,24 +156,88 @@ def main(args, scalers=None):
         else:
             model_load_func = getattr(surrogate, f'{model_name}_load')
 
-    model = model_load_func(args.model_path)
+    # SearchEngine으로 재사용할 수 있는 search model
+    engine_class = {'k_means': search.SearchEngine, 'nsga2': search.NSGA2SearchEngine,
+                    'gradient': search.GradientSearchEngine, 'cmaes': search.CMAESSearchEngine}.get(search_model)
+    use_search_engine = engine_class is not None
+    # 모델/데이터 파일이 다시 저장되면 registry key가 달라져 새로 로드
+    model_paths = model_file_paths(args.model_path)
+    engine_key = search_engine_key(args, control_range) if use_search_engine else None
+    search_engine = registry.get(args.flow_id, 'search_engine', paths=model_paths + [args.data_path],
+                                 extra=engine_key) if use_search_engine else None
+    if search_engine is not None:
+        # 이미 만든 SearchEngine이 있으면 모델 로드와 탐색 설정 계산을 생략
+        model = search_engine.model
+        logging.info(f"reuse search engine (requests: {search_engine.n_requests})")
+    else:
+        # 모델 메모리는 속성으로 추정할 수 없으므로 (CatBoost, TabPFN 등) 모델 파일 크기로 계산
+        model = registry.get_or_load(args.flow_id, f'model:{model_load_func.__name__}',
+                                     lambda: model_load_func(args.model_path), paths=model_paths,
+                                     size=files_size(model_paths))
+
+    # CatBoost 모델을 NumPy oblivious tree 평가기로 변환 (작은 배치 예측의 호출 overhead 제거)
+    predict_name = model_name
+    if model_name == 'catboost' and getattr(args, 'numpy_catboost', False):
+        predict_name = 'catboost_numpy'
+        if search_engine is None:
+            catboost_model = model
+            model = registry.get_or_load(args.flow_id, f'model:{model_load_func.__name__}:numpy',
+                                         lambda: surrogate.catboost_numpy_export(catboost_model), paths=model_paths)
 
     if len(args.target) > 1:
-        predict_func = getattr(surrogate, f'{model_name}_multi_predict')
+        predict_func = getattr(surrogate, f'{predict_name}_multi_predict')
     else:
         if type(scalers[args.target[0]]).__name__ == 'LabelEncoder':
-            predict_func = getattr(surrogate, f'{model_name}_classification_predict')
+            predict_func = getattr(surrogate, f'{predict_name}_classification_predict')
         else:
-            predict_func = getattr(surrogate, f'{model_name}_predict')
+            predict_func = getattr(surrogate, f'{predict_name}_predict')
 
     # 최적화/검색 수행
     # 샘플링한 실제 데이터를 기반으로 유저의 요구사항에 맞게, 최적화/검색 수행 
-    search_func = getattr(search, f'{search_model}_search_deploy')
+    # 응답 시간 제한: preset('fast', 'balanced', 'thorough') 또는 제한 시간(초)
+    budget = search.SearchBudget.resolve(getattr(args, 'search_preset', None)
+                                         or getattr(args, 'search_deadline', None))
     start_time = time.time()
-    opt_df = search_func(model, predict_func, X_train, X_test, y_test, x_col_list, args.control_name,
-                         args.optimize, args.importance, control_range, scalers, y_user_request)
+    # batched: 샘플링한 모든 행을 하나의 population 배치로 탐색 (세대당 pred_func 1회 호출)
+    if use_search_engine:
+        if search_engine is None:
+            # CatBoost surrogate는 split border 구간 위에서 탐색 (구간 안에서는 예측값이 같음)
+            borders = None
+            if model_name == 'catboost' and getattr(args, 'border_space', True):
+                borders = search.catboost_split_borders(model)
+            search_engine = engine_class(model, predict_func, X_train, y_train, x_col_list, args.control_name,
+                                         args.optimize, args.importance, control_range, scalers,
+                                         engine=getattr(args, 'search_engine', 'array'),
+                                         niching=getattr(args, 'niching', 'kmeans'),
+                                         borders=borders,
+                                         prescreen=getattr(args, 'prescreen', False))
+            registry.put(args.flow_id, 'search_engine', search_engine, paths=model_paths + [args.data_path],
+                         extra=engine_key, size=estimate_size(search_engine) + files_size(model_paths))
+        # 타겟 오차 반올림 자리수는 기존과 같이 샘플링한 행(y_test) 기준으로 요청마다 계산
+        opt_df = search_engine.search(y_user_request, X_test,
+                                      batched=getattr(args, 'batched', True),
+                                      patience=getattr(args, 'patience', 20),
+                                      deadline=budget,
+                                      n_jobs=getattr(args, 'n_jobs', 1),
+                                      seed=args.seed,
+                                      y_rows=y_test)
+    else:
+        search_func = getattr(search, f'{search_model}_search_deploy')
+        opt_df = search_func(model, predict_func, X_train, X_test, y_test, x_col_list, args.control_name,
+                             args.optimize, args.importance, control_range, scalers, y_user_request,
+                             batched=getattr(args, 'batched', True),
+                             engine=getattr(args, 'search_engine', 'array'),
+                             niching=getattr(args, 'niching', 'kmeans'),
+                             patience=getattr(args, 'patience', 20),
+                             deadline=budget,
+                             n_jobs=getattr(args, 'n_jobs', 1),
+                             seed=args.seed)
     end_time = time.time()
     print(f"search model 소요 시간: {end_time - start_time:.4f}초")
+    if 'n_gen' in opt_df:
+        logging.info(f"search generations: {opt_df['n_gen'].tolist()}")
+    if budget.exhausted:
+        logging.info(f"search deadline({budget.seconds:.1f}초) 도달로 탐색을 조기 종료했습니다")
 
 
     # 최적화 결과 반환 
@@ -199,7 +309,7 @@ if __name__ == "__main__":
     arg('--model', '--model', '-model', type=str, default='catboost',
         choices=['catboost', 'tabpfn'], help='사용할 모델을 지정합니다 (기본값: catboost)')
     arg('--search_model', '--search_model', '-search_model', type=str, default='k_means',
-        choices=['k_means'], help='사용할 검색/최적화 방법을 지정합니다 (기본값: k_means)')
+        choices=['k_means', 'nsga2', 'gradient', 'cmaes'], help='사용할 검색/최적화 방법을 지정합니다 (기본값: k_means)')
     arg('--data_path', '--data_path', '-data_path', type=str, default='./data/concrete_processed.csv',
         help='데이터셋 CSV 파일 경로를 지정합니다')
     arg('--control_name', '--control_name', '-control_name', type=list, default=['cement', 'slag', 'ash', 'water', 'superplastic', 'coarseagg', 'fineagg', 'age'],
@@ -246,6 +356,26 @@ if __name__ == "__main__":
     arg('--user_request_target', '--user_request_target', '-user_request_target', type=list, default=[0.0],
         help='사용자 요청 타겟 값을 지정합니다')
     arg('--model_path', '--model_path', '-model_path', type=str, default='./model/catboost.pkl'),
+    arg('--batched', '--batched', '-batched', action=argparse.BooleanOptionalAction, default=True,
+        help='샘플링한 행들을 하나의 배치로 함께 탐색합니다 (기본값: True)')
+    arg('--search_engine', '--search_engine', '-search_engine', type=str, default='array',
+        choices=['deap', 'array'], help='GA 개체군 엔진을 지정합니다 (기본값: array)')
+    arg('--niching', '--niching', '-niching', type=str, default='kmeans',
+        choices=['faiss', 'kmeans', 'grid'], help='niche 선택에 사용할 클러스터링을 지정합니다 (기본값: kmeans)')
+    arg('--patience', '--patience', '-patience', type=int, default=20,
+        help='최적 fitness가 변하지 않을 때 조기 종료까지 기다릴 세대 수 (기본값: 20)')
+    arg('--n_jobs', '--n_jobs', '-n_jobs', type=int, default=1,
+        help='행별 탐색을 나누어 수행할 worker 프로세스 수 (기본값: 1, 1보다 크면 batched 무시)')
+    arg('--border_space', '--border_space', '-border_space', action=argparse.BooleanOptionalAction, default=True,
+        help='CatBoost surrogate의 split border 구간 위에서 탐색합니다 (기본값: True)')
+    arg('--numpy_catboost', '--numpy_catboost', '-numpy_catboost', action=argparse.BooleanOptionalAction, default=False,
+        help='CatBoost 모델을 NumPy oblivious tree 평가기로 예측합니다 (작은 배치에서 빠름, 기본값: False)')
+    arg('--prescreen', '--prescreen', '-prescreen', action=argparse.BooleanOptionalAction, default=False,
+        help='GA 자손을 값싼 모델로 먼저 걸러 일부만 surrogate로 평가합니다 (TabPFN CPU 등 느린 모델용, 기본값: False)')
+    arg('--search_preset', '--search_preset', '-search_preset', type=str, default=None,
+        choices=['fast', 'balanced', 'thorough'], help='탐색 속도 preset을 지정합니다 (제한 시간과 GA 규모)')
+    arg('--search_deadline', '--search_deadline', '-search_deadline', type=float, default=None,
+        help='탐색 제한 시간(초)을 지정합니다 (search_preset이 없을 때 사용)')
     args = parser.parse_args()
 
     main(args)
@@ -0,0 +1,171 @@
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_size(obj, _depth=0):
+    """
+    객체가 차지하는 메모리를 대략 추정합니다. (NumPy 배열, DataFrame, torch 모듈, 컨테이너와 객체 속성을 따라감)
+
+    CatBoost처럼 모델 내용이 C++ 객체에 있어 속성으로 추정할 수 없는 모델은 put/get_or_load의
+    size 인자로 파일 크기(files_size)를 넘겨야 합니다.
+
+    Args:
+        obj: 크기를 추정할 객체
+
+    Returns:
+        int: 추정 byte 수
+    """
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(index=True, deep=False)))
+    if hasattr(obj, 'state_dict') and hasattr(obj, 'parameters'):
+        # torch.nn.Module: parameter와 buffer tensor 크기
+        return sum(t.numel() * t.element_size() for t in obj.state_dict().values())
+    if _depth > 3:
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(v, _depth + 1) for v in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_size(v, _depth + 1) for v in obj)
+    if hasattr(obj, '__dict__'):
+        return sys.getsizeof(obj) + estimate_size(vars(obj), _depth + 1)
+    return sys.getsizeof(obj)
+
+
+def files_size(paths):
+    """존재하는 파일들의 크기 합 (byte)"""
+    return sum(os.path.getsize(path) for path in paths if path and os.path.isfile(path))
+
+
+def file_signature(paths):
+    """파일 경로별 (경로, 수정 시각, 크기), 없는 파일은 (경로, None, None)"""
+    signature = []
+    for path in paths:
+        if path and os.path.exists(path):
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        else:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def _release(value):
+    """registry에서 빠진 값이 가진 자원 정리 (예: SearchEngine의 process pool worker)"""
+    close = getattr(value, 'close', None)
+    if callable(close):
+        close()
+
+
+class ArtifactRegistry:
+    """
+    flow별로 불러온 surrogate 모델, 데이터 배열, 파생 통계, SearchEngine 등을 보관하는 프로세스 단위 LRU registry
+
+    key는 (flow_id, 종류, 파일 수정 시각/크기, 추가 key)이므로 파일이 다시 저장되면 이전 항목은 쓰이지 않고
+    LRU로 밀려납니다. 항목 수나 추정 메모리가 상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+
+    Args:
+        max_entries (int): 최대 항목 수
+        max_bytes (int): 최대 추정 메모리 (byte)
+    """
+
+    def __init__(self, max_entries=32, max_bytes=2 * 2**30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, 추정 byte 수)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return sum(size for _, size in self._entries.values())
+
+    @staticmethod
+    def make_key(flow_id, kind, paths=(), extra=()):
+        return (flow_id, kind, file_signature(paths), extra)
+
+    def get(self, flow_id, kind, paths=(), extra=()):
+        """등록된 값을 반환 (없으면 None)"""
+        key = self.make_key(flow_id, kind, paths, extra)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, flow_id, kind, value, paths=(), extra=(), size=None):
+        """
+        값을 등록하고 상한을 넘으면 오래된 항목을 제거합니다.
+
+        같은 flow와 종류의 이전 버전(파일 수정 시각이나 추가 key가 다른 항목)은 함께 제거합니다.
+        size를 주지 않으면 estimate_size로 메모리를 추정합니다.
+        """
+        key = self.make_key(flow_id, kind, paths, extra)
+        size = estimate_size(value) if size is None else int(size)
+        with self._lock:
+            for old_key in [k for k in self._entries if k[:2] == key[:2] and k[2] != key[2]]:
+                _release(self._entries.pop(old_key)[0])
+            if key in self._entries and self._entries[key][0] is not value:
+                _release(self._entries[key][0])
+            self._entries[key] = (value, size)
+            self._entries.move_to_end(key)
+            self._evict()
+        return value
+
+    def get_or_load(self, flow_id, kind, loader, paths=(), extra=(), size=None):
+        """
+        등록된 값이 있으면 반환하고, 없으면 loader()로 불러와 등록합니다.
+
+        Args:
+            flow_id: flow 아이디
+            kind (str): 항목 종류 (예: 'model', 'dataset')
+            loader (callable): 값을 불러오는 함수
+            paths (list): 값이 의존하는 파일 경로 (수정 시각/크기가 key에 포함됨)
+            extra (tuple): 추가 key
+            size (int, optional): 값의 메모리 크기 (byte), None이면 estimate_size로 추정
+
+        Returns:
+            등록된 값
+        """
+        value = self.get(flow_id, kind, paths, extra)
+        if value is None:
+            value = self.put(flow_id, kind, loader(), paths, extra, size=size)
+        return value
+
+    def invalidate(self, flow_id=None, kind=None):
+        """flow(와 종류)에 해당하는 항목을 제거 (flow_id가 None이면 전체)"""
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (flow_id is None or key[0] == flow_id) and (kind is None or key[1] == kind)]
+            for key in keys:
+                _release(self._entries.pop(key)[0])
+        if keys:
+            logging.info(f"artifact registry: flow {flow_id} 항목 {len(keys)}개 제거")
+        return len(keys)
+
+    def _evict(self):
+        total = self.total_bytes
+        while self._entries and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            if len(self._entries) == 1:
+                break  # 상한보다 큰 항목 하나는 유지
+            key, (value, size) = self._entries.popitem(last=False)
+            _release(value)
+            total -= size
+            logging.info(f"artifact registry: {key[:2]} 제거 ({size / 2**20:.1f}MB)")
+
+
+# 프로세스 전체에서 공유하는 registry (메모리 상한은 ARTIFACT_REGISTRY_MAX_MB 환경 변수로 조정)
+registry = ArtifactRegistry(max_bytes=int(os.environ.get('ARTIFACT_REGISTRY_MAX_MB', 2048)) * 2**20)
@@ -7,3 +7,13 @@ from .ga_deap_search import ga_deap_search
 from .ga_adaptive_niching_search import ga_adaptive_niching_search
 from .k_means_search import k_means_search
 from .k_means_search_deploy import k_means_search_deploy
+from .ga_array_engine import ArrayPopulation
+from .search_budget import SearchBudget, SEARCH_PRESETS
+from .search_engine import SearchEngine
+from .neighbor_index import TargetNeighborIndex
+from .fitness_kernel import EvaluationKernel
+from .nsga2_search import nsga2_search_deploy, NSGA2SearchEngine
+from .gradient_search import gradient_search_deploy, GradientSearchEngine
+from .cmaes_search import cmaes_search_deploy, CMAESSearchEngine
+from .prescreen import PreScreener, RandomFeatureRidge
+from .catboost_space import catboost_split_borders, load_catboost_borders, BorderSearchSpace
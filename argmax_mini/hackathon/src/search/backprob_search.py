@@ -2,6 +2,8 @@ import torch
 import numpy as np
 from tqdm import tqdm
 
+from hackathon.src.search.search_budget import SearchBudget
+
 def fgsm_attack(image,epsilon,data_grad):
 
     sign_data_grad = data_grad.sign()
@@ -9,7 +11,7 @@ def fgsm_attack(image,epsilon,data_grad):
     perturbed_image = torch.clamp(perturbed_image, 0, 1)
     return perturbed_image
 
-def backprob_search(model, pred_func, X_train, val_data):
+def backprob_search(model, pred_func, X_train, val_data, deadline=None):
     
     assert isinstance(model, torch.nn.Module)
     
@@ -18,8 +20,12 @@ def backprob_search(model, pred_func, X_train, val_data):
     x_bound = x_bound.to(model.device)
     y_bound = y_bound.to(model.device)
 
+    # deadline : 제한 시간(초) 또는 preset 이름, 시간이 다 되면 그때까지의 최적값 사용
+    budget = SearchBudget.resolve(deadline)
+
     model.eval()
-    for x,y in tqdm(val_data):
+    for idx, (x,y) in enumerate(tqdm(val_data)):
+        row_budget = budget.split(len(val_data) - idx)
 
         x = x.to(model.device)
         y = y.to(model.device)
@@ -36,6 +42,8 @@ def backprob_search(model, pred_func, X_train, val_data):
             param.requires_grad = False
 
         for i in range(10000):
+            if x_min is not None and row_budget.expired():
+                break
             optimizer.zero_grad()
             output = model(init_x)
 
@@ -1,6 +1,8 @@
 from bayes_opt import BayesianOptimization
 import numpy as np
 
+from hackathon.src.search.search_budget import SearchBudget
+
 def objective(model,predict_func,x,target):
 
     pred = predict_func(model,x)[0]
@@ -8,7 +10,11 @@ def objective(model,predict_func,x,target):
     return -abs(pred-target)
 
 
-def bayesian_search(model,predict_func,x_train,y_train,y_test):
+def bayesian_search(model,predict_func,x_train,y_train,y_test,deadline=None,return_status=False):
+
+    # deadline : 제한 시간(초) 또는 preset 이름, 시간이 다 되면 그때까지의 최적값 반환
+    # return_status : True이면 (optimizer.max, {'n_iter': [...], 'exhausted': [...]}) 반환
+    budget = SearchBudget.resolve(deadline)
 
     
     min_vals = x_train.min(axis=0)
@@ -35,8 +41,15 @@ def bayesian_search(model,predict_func,x_train,y_train,y_test):
 
         optimizer.maximize(
             init_points=10,  # 초기 랜덤 포인트 수
-            n_iter=30,       # 최적화 반복 횟수
+            n_iter=0,
         )
+        # 최적화 반복을 한 번씩 수행하며 제한 시간 확인
+        n_iter = 0
+        for _ in range(30):
+            if budget.expired():
+                break
+            optimizer.maximize(init_points=0, n_iter=1)
+            n_iter += 1
 
         # optimizer.max - control
         # optimizer.max['params']
@@ -44,4 +57,6 @@ def bayesian_search(model,predict_func,x_train,y_train,y_test):
         print(optimizer.max['params'])
         break # TODO 최적화 오래걸림...
 
+    if return_status:
+        return optimizer.max, {'n_iter': [n_iter], 'exhausted': [budget.exhausted]}
     return optimizer.max
\ No newline at end of file
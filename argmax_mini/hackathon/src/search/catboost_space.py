@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+def catboost_split_borders(model):
+    """
+    학습된 CatBoost 모델의 split에 사용된 border를 입력 열 index별로 반환합니다.
+
+    CatBoost는 `값 > border` 여부로 분기하므로 예측값은 (border_k, border_k+1] 구간 안에서 일정합니다.
+    oblivious tree가 아닌 모델은 양자화 border 전체(get_borders)를 사용합니다.
+
+    Args:
+        model: CatBoostRegressor / CatBoostClassifier (또는 split_borders()가 있는 변환 모델)
+
+    Returns:
+        dict: 입력 열 index -> 정렬된 border 배열 (split에 사용되지 않은 열은 없음)
+    """
+    if hasattr(model, 'split_borders'):
+        return model.split_borders()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'model.json')
+        model.save_model(path, format='json')
+        with open(path) as f:
+            model_json = json.load(f)
+
+    if 'oblivious_trees' not in model_json:
+        return {int(i): np.sort(np.asarray(b, dtype=np.float64)) for i, b in model.get_borders().items() if len(b)}
+
+    float_features = model_json.get('features_info', {}).get('float_features', [])
+    flat_index = {feature['feature_index']: feature['flat_feature_index'] for feature in float_features}
+    borders = {}
+    for tree in model_json['oblivious_trees']:
+        for split in tree['splits']:
+            if split.get('split_type') == 'FloatFeature':
+                borders.setdefault(flat_index[split['float_feature_index']], set()).add(split['border'])
+    return {i: np.array(sorted(values), dtype=np.float64) for i, values in borders.items()}
+
+
+def load_catboost_borders(path):
+    """저장된 .cbm 모델 파일에서 split border를 읽습니다."""
+    from catboost import CatBoost
+    model = CatBoost()
+    model.load_model(path)
+    return catboost_split_borders(model)
+
+
+class BorderSearchSpace:
+    """
+    CatBoost split border로 나눈 구간 위의 이산 탐색 공간
+
+    연속형 제어 변수 값을 그 값이 속한 border 구간의 대표값으로 옮깁니다.
+    같은 구간의 값은 모두 같은 예측값을 가지므로 대표값은 최적화 방향에 맞춰 고릅니다.
+
+    - 'maximize' : 구간 상한 (border 자신, `값 > border`가 아니므로 같은 구간)
+    - 'minimize' : 구간 하한 바로 위 float32 값
+    - 그 외      : 구간 중앙
+
+    split에 사용되지 않은 제어 변수는 구간이 하나이므로 값 하나로 고정되고,
+    범주형 변수는 그대로 둡니다.
+
+    Args:
+        borders (dict): 입력 열 index -> border 배열 (catboost_split_borders 결과)
+        control_index (list): 제어 변수 열 index
+        x_min, x_max (np.ndarray): 제어 변수별 탐색 범위
+        is_nominal (list): 제어 변수별 범주형 여부
+        pop_index_to_optimize (dict): population 열 index -> 'maximize' / 'minimize'
+    """
+
+    def __init__(self, borders, control_index, x_min, x_max, is_nominal, pop_index_to_optimize):
+        self.edges = []  # 제어 변수별 범위 안쪽 border (None이면 변환하지 않음)
+        self.values = []  # 제어 변수별 구간 대표값
+        for i, col in enumerate(control_index):
+            if is_nominal[i]:
+                self.edges.append(None)
+                self.values.append(None)
+                continue
+            lb, ub = float(x_min[i]), float(x_max[i])
+            edges = np.asarray(borders.get(col, []), dtype=np.float64)
+            edges = edges[(edges >= lb) & (edges < ub)]
+            lower = np.concatenate([[lb], edges])
+            upper = np.concatenate([edges, [ub]])
+
+            goal = pop_index_to_optimize.get(i)
+            if goal == 'maximize':
+                values = upper
+            elif goal == 'minimize':
+                # 첫 구간은 lb 포함, 나머지는 border 초과 값부터
+                above = np.nextafter(edges.astype(np.float32), np.float32(np.inf)).astype(np.float64)
+                values = np.concatenate([[lb], np.minimum(above, upper[1:])])
+            else:
+                values = (lower + upper) / 2
+            self.edges.append(edges)
+            self.values.append(values)
+
+    @property
+    def n_intervals(self):
+        """제어 변수별 구간 수 (범주형은 None)"""
+        return [None if values is None else len(values) for values in self.values]
+
+    def snapped_mask(self):
+        """구간 대표값으로 변환되는 제어 변수 mask"""
+        return np.array([values is not None for values in self.values], dtype=bool)
+
+    def snap(self, X):
+        """
+        제어 변수 행렬의 연속형 값을 구간 대표값으로 제자리 변환합니다.
+
+        Args:
+            X (np.ndarray): 제어 변수 행렬 (n, n_control)
+
+        Returns:
+            np.ndarray: 변환된 X
+        """
+        for i, (edges, values) in enumerate(zip(self.edges, self.values)):
+            if edges is not None:
+                X[:, i] = values[np.searchsorted(edges, X[:, i], side='left')]
+        return X
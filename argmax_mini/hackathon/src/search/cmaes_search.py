@@ -0,0 +1,302 @@
+import numpy as np
+
+from hackathon.src.search.search_engine import SearchEngine
+from hackathon.src.search.ga_function import lexicographic_order
+from hackathon.src.search.convergence import ConvergenceTracker
+from hackathon.src.search.prediction_cache import PredictionCache
+from hackathon.src.search.search_budget import SearchBudget
+from hackathon.src.search.fitness_kernel import EvaluationKernel
+
+
+def reflect_unit(x):
+    """[0, 1] 밖의 좌표를 경계에서 반사시켜 [0, 1] 안으로 (주기 2의 삼각파)"""
+    x = np.mod(x, 2.0)
+    return np.where(x > 1.0, 2.0 - x, x)
+
+
+def lexicographic_better(a, b, weights):
+    """fitness a가 b보다 lexicographic 순서로 앞서는지 여부 (b가 None이면 True)"""
+    if b is None:
+        return True
+    return tuple(np.asarray(a) * weights) > tuple(np.asarray(b) * weights)
+
+
+class CMAESState:
+    """
+    행(row) 하나의 CMA-ES run 상태 (연속형 변수는 [0, 1] 정규화 좌표, 범주형 변수는 범주별 확률)
+
+    연속형 변수는 (mu/mu_w, lambda)-CMA-ES로, 범주형 변수는 선택된 개체의 범주 빈도로
+    확률을 갱신하는 이산 분포로 샘플링합니다.
+
+    Args:
+        mean (np.ndarray): 연속형 변수 초기 평균 (정규화 좌표)
+        sigma (float): 초기 step size
+        popsize (int): 세대별 개체 수 (lambda)
+        n_levels (list): 범주형 변수별 범주 수 (fixed이면 빈 리스트)
+        nominal_lr (float): 범주 확률을 선택된 개체의 범주 빈도 쪽으로 옮기는 비율
+    """
+
+    def __init__(self, mean, sigma, popsize, n_levels, nominal_lr=0.3):
+        n = len(mean)
+        self.n = n
+        self.popsize = popsize
+        self.mu = popsize // 2
+        weights = np.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.recomb_weights = weights / weights.sum()
+        self.mueff = 1.0 / (self.recomb_weights ** 2).sum()
+
+        # 학습률 (Hansen, The CMA Evolution Strategy: A Tutorial 기본값)
+        self.cc = (4 + self.mueff / max(n, 1)) / (n + 4 + 2 * self.mueff / max(n, 1))
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, np.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = np.sqrt(n) * (1 - 1 / (4 * max(n, 1)) + 1 / (21 * max(n, 1) ** 2))
+
+        self.mean = np.asarray(mean, dtype=np.float64).copy()
+        self.sigma = sigma
+        self.C = np.eye(n)
+        self.B, self.D = np.eye(n), np.ones(n)
+        self.pc, self.ps = np.zeros(n), np.zeros(n)
+        self.gen = 0
+
+        self.probs = [np.full(k, 1.0 / k) for k in n_levels]
+        self.nominal_lr = nominal_lr
+        self.best_fitness = None  # 이번 run의 최적 fitness
+        self.stagnant = 0
+
+    def ask(self):
+        """연속형 정규화 좌표 (popsize, n)와 범주형 범주 index (popsize, n_nominal) 샘플링"""
+        z = np.random.standard_normal((self.popsize, self.n))
+        x = reflect_unit(self.mean + self.sigma * (z * self.D) @ self.B.T)
+        levels = np.stack([np.random.choice(len(p), self.popsize, p=p) for p in self.probs], axis=1) \
+            if self.probs else np.empty((self.popsize, 0), dtype=np.int64)
+        return x, levels
+
+    def tell(self, x, levels, order):
+        """
+        fitness 순위(order, 좋은 순)로 분포를 갱신합니다.
+
+        Args:
+            x (np.ndarray): ask로 샘플링한 연속형 좌표 (경계 반사 후)
+            levels (np.ndarray): ask로 샘플링한 범주 index
+            order (np.ndarray): 개체 index (fitness 좋은 순)
+        """
+        self.gen += 1
+        selected = order[:self.mu]
+        w = self.recomb_weights
+
+        for j, p in enumerate(self.probs):
+            freq = np.bincount(levels[selected, j], weights=w, minlength=len(p))
+            p *= 1 - self.nominal_lr
+            p += self.nominal_lr * freq
+            # 한 범주로 완전히 수렴하지 않도록 최소 확률 유지
+            np.maximum(p, 0.05 / len(p), out=p)
+            p /= p.sum()
+
+        if not self.n:
+            return
+        y = (x[selected] - self.mean) / self.sigma
+        y_w = w @ y
+        self.mean = self.mean + self.sigma * y_w
+
+        inv_sqrt_c = self.B @ np.diag(1 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + np.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt_c @ y_w
+        ps_norm = np.linalg.norm(self.ps)
+        hsig = ps_norm / np.sqrt(1 - (1 - self.cs) ** (2 * self.gen)) / self.chi_n < 1.4 + 2 / (self.n + 1)
+        self.pc = (1 - self.cc) * self.pc + hsig * np.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_w
+
+        rank_mu = (y * w[:, None]).T @ y
+        self.C = ((1 - self.c1 - self.cmu) * self.C
+                  + self.c1 * (np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.C)
+                  + self.cmu * rank_mu)
+        self.sigma = min(self.sigma * np.exp((self.cs / self.damps) * (ps_norm / self.chi_n - 1)), 1.0)
+
+        self.C = (self.C + self.C.T) / 2
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+    def record(self, fitness, weights):
+        """이번 run의 최적 fitness를 갱신하고 정체 세대 수를 셈"""
+        if lexicographic_better(fitness, self.best_fitness, weights):
+            self.best_fitness = np.asarray(fitness)
+            self.stagnant = 0
+        else:
+            self.stagnant += 1
+
+    def should_restart(self, tol_x, patience):
+        """step size가 tol_x 이하, patience 세대 정체, 또는 공분산이 나빠지면 True"""
+        if self.stagnant >= patience:
+            return True
+        if not self.n:
+            return all(p.max() > 0.9 for p in self.probs)
+        return self.sigma * self.D.max() < tol_x or self.D.max() > 1e7 * self.D.min()
+
+
+class CMAESSearchEngine(SearchEngine):
+    """
+    IPOP-CMA-ES 탐색기 (SearchEngine과 같은 fitness, 캐시, 행 batch/병렬 처리 사용)
+
+    연속형 제어 변수는 범위로 [0, 1] 정규화한 좌표에서 CMA-ES로 탐색하고 범위 밖 샘플은 경계에서
+    반사합니다. 범주형 제어 변수는 nominal='sample'이면 범주별 확률로 샘플링해 함께 갱신하고,
+    'fixed'이면 행의 현재 값으로 고정합니다. 세대마다 진행 중인 모든 행의 개체를 pred_func 한 번으로
+    평가하며, fitness는 lexicographic 순위로만 사용합니다.
+
+    run이 정체하면 (step size < TOL_X, RESTART_PATIENCE 세대 동안 개선 없음, 공분산 조건수 초과)
+    무작위 평균에서 개체 수를 두 배로 늘려 다시 시작합니다. (IPOP, 최대 MAX_RESTARTS번)
+    run이 끝났을 때 행 최적 fitness가 patience 세대 동안 tol보다 크게 개선되지 않았으면(min_gen 세대 이후)
+    행을 수렴으로 보고 끝냅니다. restart를 모두 사용하거나 max_gen에 도달해도 끝나며, 제한 시간은
+    상한으로만 사용합니다. 결과의 n_restart 열에 행별 restart 수를 기록합니다.
+
+    Args:
+        SearchEngine과 같음 (engine/niching/prescreen은 사용하지 않음)
+        nominal (str): 'sample' | 'fixed'
+    """
+
+    MAX_GEN = 300  # preset이 없을 때 행별 최대 세대 수 (restart 포함)
+    SIGMA0 = 0.3  # 정규화 좌표의 초기 step size
+    TOL_X = 1e-4  # 정규화 좌표 step size 하한
+    RESTART_PATIENCE = 10
+    MAX_RESTARTS = 8
+
+    def __init__(self, model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                 importance, bounds, scalers, engine='array', niching=None, cache_size=100000, borders=None,
+                 prescreen=None, nominal='sample'):
+        super().__init__(model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                         importance, bounds, scalers, engine='array', niching=niching, cache_size=cache_size,
+                         borders=borders)
+        self._config += (nominal,)
+        if nominal not in ('sample', 'fixed'):
+            raise ValueError(f"지원되지 않는 nominal 처리 방법입니다: {nominal} (가능: 'sample', 'fixed')")
+        self.nominal = nominal
+        self.continuous_idx = np.flatnonzero(~self.nominal_mask)
+        self.nominal_idx = np.flatnonzero(self.nominal_mask)
+        self.span = np.where(self.x_max > self.x_min, self.x_max - self.x_min, 1.0)[self.continuous_idx]
+        self.n_levels = [int(self.x_max[i] - self.x_min[i]) + 1 for i in self.nominal_idx] \
+            if nominal == 'sample' else []
+
+    def default_popsize(self):
+        """CMA-ES 기본 개체 수 4 + 3 ln(n) (범주형 확률 갱신을 위해 최소 10)"""
+        return max(10, 4 + int(3 * np.log(max(len(self.control_index), 1))))
+
+    def _new_state(self, gt_x, popsize, restart):
+        """첫 run은 행의 현재 제어 변수 값에서, restart는 무작위 평균에서 시작"""
+        if restart == 0:
+            mean = (np.asarray(gt_x, dtype=np.float64)[self.control_index][self.continuous_idx]
+                    - self.x_min[self.continuous_idx]) / self.span
+        else:
+            mean = np.random.uniform(0, 1, len(self.continuous_idx))
+        return CMAESState(np.clip(mean, 0, 1), self.SIGMA0, popsize, self.n_levels)
+
+    def _controls(self, gt_x, x, levels):
+        """정규화 좌표와 범주 index를 제어 변수 행렬로 변환 (border 탐색 공간이면 구간 대표값으로)"""
+        controls = np.empty((len(x), len(self.control_index)))
+        controls[:, self.continuous_idx] = self.x_min[self.continuous_idx] + x * self.span
+        if self.nominal == 'sample':
+            controls[:, self.nominal_idx] = self.x_min[self.nominal_idx] + levels
+        else:
+            controls[:, self.nominal_idx] = np.asarray(gt_x)[self.control_index][self.nominal_idx]
+        return self._snap(controls)
+
+    def _evolve(self, gt_xs, user_request_target, row_budget, max_gen, pop_size, patience, tol, min_gen):
+        """
+        행들의 CMA-ES를 함께 진행시켜 행별 최적 개체를 반환 (SearchEngine._evolve와 같은 반환값)
+
+        행 종료 판단은 run이 끝날 때만 합니다. (새 run은 무작위 평균에서 시작하므로 run 도중에 행 최적의
+        정체로 끝내면 restart가 행 최적을 넘을 기회 없이 끝남) 수렴했거나 restart를 모두 사용한 행은 배치에서 빠집니다.
+
+        Returns:
+            SearchEngine._evolve와 같음, 추가 결과는 행별 restart 수
+        """
+        popsize0 = pop_size or self.default_popsize()
+        states = [self._new_state(gt_x, popsize0, 0) for gt_x in gt_xs]
+        restarts = [0] * len(gt_xs)
+        # tracker는 행 최적 fitness의 정체 세대 수 기록용 (종료 판단은 run이 끝날 때만 함)
+        trackers = [ConvergenceTracker(patience=patience, tol=tol, min_gen=min_gen, scale=self.x_max - self.x_min)
+                    for _ in gt_xs]
+        caches = [PredictionCache(self.rounding_digits_control, max_size=self.cache_size) if self.cache_size else None
+                  for _ in gt_xs]
+        best_individuals, best_fitness = [None] * len(gt_xs), [None] * len(gt_xs)
+        n_evals = [0] * len(gt_xs)
+        kernel = EvaluationKernel(gt_xs, self.control_index)
+        active = list(range(len(gt_xs)))
+
+        for gen in range(1, max_gen + 1):
+            samples = [states[i].ask() for i in active]
+            controls = [self._controls(gt_xs[i], x, levels) for i, (x, levels) in zip(active, samples)]
+            # 진행 중인 모든 행의 개체를 한 번에 예측
+            fitness_list, n_predicted = self._evaluate_controls(active, controls, kernel,
+                                                                [caches[i] for i in active], user_request_target)
+
+            still_active = []
+            for i, (x, levels), control, fitness, n in zip(active, samples, controls, fitness_list, n_predicted):
+                n_evals[i] += n
+                order = lexicographic_order(fitness, self.weights)
+                states[i].tell(x, levels, order)
+                states[i].record(fitness[order[0]], self.weights)
+                if lexicographic_better(fitness[order[0]], best_fitness[i], self.weights):
+                    best_individuals[i], best_fitness[i] = control[order[0]], fitness[order[0]]
+
+                trackers[i].update(best_fitness[i], control)
+                done = False
+                if states[i].should_restart(self.TOL_X, self.RESTART_PATIENCE):
+                    if restarts[i] >= self.MAX_RESTARTS or self._row_converged(trackers[i]):
+                        trackers[i].converged = done = True
+                    else:
+                        restarts[i] += 1
+                        states[i] = self._new_state(gt_xs[i], states[i].popsize * 2, restarts[i])
+                if not done:
+                    still_active.append(i)
+            active = still_active
+            if not active or row_budget.expired():
+                break
+
+        return best_individuals, trackers, caches, n_evals, restarts
+
+    @staticmethod
+    def _row_converged(tracker):
+        """run이 끝났을 때 행 최적 fitness가 patience 세대 이상 tol보다 크게 개선되지 않았으면 True"""
+        if tracker.patience is None or tracker.n_gen < tracker.min_gen:
+            return False
+        return tracker.stagnant >= tracker.patience
+
+    def _attach_row_extras(self, df, extras):
+        df["n_restart"] = extras
+        return df
+
+    def search(self, user_request_target, rows, batched=True, max_gen=None, pop_size=None,
+               patience=20, tol=0.0, min_gen=20, deadline=None, n_jobs=1, seed=None, y_rows=None):
+        """
+        SearchEngine.search와 같음. 단, max_gen은 restart를 포함한 행별 세대 수(기본값 MAX_GEN 또는
+        preset 값), pop_size는 첫 run의 개체 수(기본값 4 + 3 ln(제어 변수 수))입니다.
+        patience, tol, min_gen은 run이 끝날 때 행 수렴 판단에 사용합니다. (행 최적 fitness의 정체 세대 수 기준)
+        """
+        budget = SearchBudget.resolve(deadline)
+        max_gen = budget.settings(max_gen=self.MAX_GEN)['max_gen'] if max_gen is None else max_gen
+        pop_size = self.default_popsize() if pop_size is None else pop_size
+        return super().search(user_request_target, rows, batched=batched, max_gen=max_gen, pop_size=pop_size,
+                              patience=patience, tol=tol, min_gen=min_gen, deadline=budget, n_jobs=n_jobs,
+                              seed=seed, y_rows=y_rows)
+
+
+def cmaes_search_deploy(model, pred_func, X_train, X_test, y_test,\
+                        all_var_names, control_var_names, optmize_dict, importance,\
+                        bounds, scalers, user_request_target, batched=False, engine='array', niching=None,\
+                        max_gen=None, patience=20, tol=0.0, min_gen=20, cache_size=100000,\
+                        pop_size=None, deadline=None, n_jobs=1, seed=None, borders=None, nominal='sample'):
+    """
+    IPOP-CMA-ES 탐색 (인자는 k_means_search_deploy와 동일, engine/niching은 사용하지 않음)
+
+    # max_gen : restart를 포함한 행별 최대 세대 수 (기본값 300 또는 preset 값)
+    # pop_size : 첫 run의 개체 수 (기본값 4 + 3 ln(제어 변수 수), restart마다 두 배)
+    # nominal : 'sample' (범주별 확률로 샘플링) | 'fixed' (행의 현재 값으로 고정)
+    # patience, tol, min_gen : run이 끝났을 때 행 최적 fitness가 patience 세대 동안 tol보다 크게
+    #                          개선되지 않았으면 (min_gen 세대 이후) 행 종료, restart를 모두 사용하거나 max_gen에 도달해도 종료
+    # return : k_means_search_deploy와 같은 열 + 행별 restart 수(n_restart)
+    """
+    with CMAESSearchEngine(model, pred_func, X_train, y_test, all_var_names, control_var_names,
+                           optmize_dict, importance, bounds, scalers, cache_size=cache_size,
+                           borders=borders, nominal=nominal) as search_engine:
+        return search_engine.search(user_request_target, X_test, batched=batched, max_gen=max_gen,
+                                    pop_size=pop_size, patience=patience, tol=tol, min_gen=min_gen,
+                                    deadline=deadline, n_jobs=n_jobs, seed=seed)
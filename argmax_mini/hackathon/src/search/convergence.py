@@ -0,0 +1,69 @@
+import numpy as np
+
+
+class ConvergenceTracker:
+    """
+    행(row) 단위 GA 수렴 여부를 추적하는 클래스
+
+    세대마다 lexicographic 최적 개체의 목적별 fitness와 population 다양성을 기록하고,
+    최적 fitness가 patience 세대 동안 tol 이상 변하지 않으면 수렴으로 판단합니다.
+
+    Args:
+        patience (int, optional): 정체 허용 세대 수. None이면 조기 종료하지 않음
+        tol (float): 목적별 fitness 변화 허용 오차
+        min_gen (int): 조기 종료를 검사하기 전 최소 세대 수
+        diversity_tol (float, optional): 정규화된 population 표준편차 평균이 이 값 이하이면 수렴
+        scale (np.ndarray, optional): 다양성 정규화에 사용할 변수별 범위
+    """
+
+    def __init__(self, patience=20, tol=0.0, min_gen=20, diversity_tol=None, scale=None):
+        self.patience = patience
+        self.tol = tol
+        self.min_gen = min_gen
+        self.diversity_tol = diversity_tol
+        self.scale = None if scale is None else np.where(np.asarray(scale) > 0, scale, 1.0)
+
+        self.best_history = []  # 세대별 목적별 최적 fitness
+        self.diversity_history = []  # 세대별 population 다양성
+        self.stagnant = 0
+        self.converged = False
+
+    @property
+    def n_gen(self):
+        """지금까지 수행한 세대 수"""
+        return len(self.best_history)
+
+    def update(self, best_fitness, population):
+        """
+        한 세대의 결과를 기록하고 수렴 여부를 반환합니다.
+
+        Args:
+            best_fitness (array-like): 현재 세대 최적 개체의 목적별 fitness
+            population (np.ndarray): 현재 세대 개체 배열 (pop, n_control)
+
+        Returns:
+            bool: 수렴 여부
+        """
+        best_fitness = np.asarray(best_fitness, dtype=np.float64)
+        population = np.asarray(population, dtype=np.float64)
+
+        std = population.std(axis=0)
+        if self.scale is not None:
+            std = std / self.scale
+        diversity = float(std.mean()) if std.size else 0.0
+
+        if self.best_history and np.all(np.abs(best_fitness - self.best_history[-1]) <= self.tol):
+            self.stagnant += 1
+        else:
+            self.stagnant = 0
+
+        self.best_history.append(best_fitness)
+        self.diversity_history.append(diversity)
+
+        if self.patience is None or self.n_gen < self.min_gen:
+            return False
+        if self.stagnant >= self.patience:
+            self.converged = True
+        elif self.diversity_tol is not None and diversity <= self.diversity_tol:
+            self.converged = True
+        return self.converged
@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class InputBuffer:
+    """
+    행(row) 하나의 surrogate 입력을 담는 재사용 버퍼
+
+    버퍼 전체를 원본 행 값(gt_x)으로 한 번 채워 두고, 이후에는 제어 변수 열만 덮어씁니다.
+    개체 수가 용량을 넘을 때만 두 배로 다시 할당합니다.
+
+    Args:
+        gt_x (np.ndarray): 원본 X 행
+        control_index (list): 제어 변수 열 index
+        dtype: 버퍼 자료형 (default: float32)
+    """
+
+    def __init__(self, gt_x, control_index, dtype=np.float32):
+        self.gt_x = np.asarray(gt_x, dtype=dtype).reshape(-1)
+        self.control_index = np.asarray(control_index)
+        self.dtype = dtype
+        self.buffer = np.empty((0, len(self.gt_x)), dtype=dtype)
+
+    def fill(self, controls):
+        """
+        제어 변수 행렬을 버퍼에 쓰고 (n, n_features) view를 반환합니다.
+
+        Args:
+            controls (np.ndarray): 제어 변수 행렬 (n, n_control)
+
+        Returns:
+            np.ndarray: C-contiguous 입력 view (다음 fill 호출 전까지만 유효)
+        """
+        n = len(controls)
+        if n > len(self.buffer):
+            self.buffer = np.empty((max(n, 2 * len(self.buffer)), len(self.gt_x)), dtype=self.dtype)
+            self.buffer[:] = self.gt_x
+        self.buffer[:n, self.control_index] = controls
+        return self.buffer[:n]
+
+
+class EvaluationKernel:
+    """
+    한 번의 탐색 동안 행별 InputBuffer와 여러 행을 합친 batch 버퍼를 재사용해 surrogate 입력을 만드는 클래스
+
+    Args:
+        gt_xs (list): 탐색할 행의 원본 X 값 리스트
+        control_index (list): 제어 변수 열 index
+        dtype: 입력 자료형 (default: float32)
+    """
+
+    def __init__(self, gt_xs, control_index, dtype=np.float32):
+        self.buffers = [InputBuffer(gt_x, control_index, dtype=dtype) for gt_x in gt_xs]
+        self.batch = np.empty((0, len(self.buffers[0].gt_x) if self.buffers else 0), dtype=dtype)
+
+    def build_inputs(self, rows, controls):
+        """
+        행별 제어 변수 행렬로 surrogate 입력 행렬을 만듭니다.
+
+        Args:
+            rows (list): 행 index 리스트
+            controls (list): 행별 제어 변수 행렬 (비어 있을 수 있음)
+
+        Returns:
+            np.ndarray | None: 입력 행렬 (모든 행이 비어 있으면 None)
+        """
+        parts = [self.buffers[row].fill(control) for row, control in zip(rows, controls) if len(control)]
+        if not parts:
+            return None
+        if len(parts) == 1:
+            return parts[0]
+
+        n = sum(len(part) for part in parts)
+        if n > len(self.batch):
+            self.batch = np.empty((max(n, 2 * len(self.batch)), self.batch.shape[1]), dtype=self.batch.dtype)
+        return np.concatenate(parts, axis=0, out=self.batch[:n])
+
+
+def std_rounding_digits(values):
+    """열별 표준편차의 1/100 자리까지 남기는 반올림 자리수 (2 ~ 10)"""
+    return np.clip(np.ceil(-np.log10(np.std(values, axis=0)/100)), 2, 10).astype(int)
+
+
+def round_columns(fitness, rounding_digits):
+    """fitness 행렬을 열별 소수점 자리수로 제자리 반올림 (np.vectorize(round) 대체)"""
+    for j, digits in enumerate(rounding_digits):
+        np.round(fitness[:, j], int(digits), out=fitness[:, j])
+    return fitness
+
+
+def lexicographic_fitness(y_pred, controls, user_request_target, objective_columns, rounding_digits):
+    """
+    surrogate 예측값과 제어 변수 값으로 lexicographic fitness 행렬을 만듭니다.
+
+    Args:
+        y_pred (np.ndarray): surrogate 예측값 (n, n_targets)
+        controls (np.ndarray): 제어 변수 행렬 (n, n_control)
+        user_request_target (np.ndarray): 사용자 요청 타겟 값
+        objective_columns (list): 중요도 순으로 정렬한 최적화 대상 제어 변수 열 index
+        rounding_digits (np.ndarray, optional): fitness 열별 반올림 자리수, None이면 반올림하지 않음
+
+    Returns:
+        np.ndarray: fitness 행렬 (n, n_targets + len(objective_columns))
+    """
+    y_pred = np.asarray(y_pred, dtype=np.float64).reshape(len(controls), -1)
+    n_targets = y_pred.shape[1]
+
+    fitness = np.empty((len(controls), n_targets + len(objective_columns)))
+    target_fit = fitness[:, :n_targets]
+    np.subtract(y_pred, np.asarray(user_request_target, dtype=np.float64).reshape(1, -1), out=target_fit)
+    np.square(target_fit, out=target_fit)
+    np.negative(target_fit, out=target_fit)
+    fitness[:, n_targets:] = np.asarray(controls)[:, objective_columns]
+
+    if rounding_digits is None:
+        return fitness
+    return round_columns(fitness, rounding_digits)
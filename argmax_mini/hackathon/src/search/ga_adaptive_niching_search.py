@@ -4,6 +4,9 @@ import numpy as np
 from deap import base, creator, tools
 from tqdm import tqdm
 
+from hackathon.src.search.search_budget import SearchBudget
+from hackathon.src.search.parallel import row_seeds, seed_row, run_rows_parallel
+
 
 def adaptive_niche_size(gen, max_gen, initial_sigma, min_sigma, decay_constant=5.0):
     """
@@ -59,6 +62,131 @@ def fitness_sharing(population, sigma, alpha):
             ind.fitness.values = (ind.fitness.values[0] / adjusted_sharing_factor,)
 
 
+def _adaptive_niching_state(model, pred_func, X_train):
+    """행 탐색에 공통으로 사용하는 상태 (process pool worker마다 한 번 생성)"""
+    return model, pred_func, np.min(X_train, axis=0), np.max(X_train, axis=0), X_train.shape[1]
+
+
+def _adaptive_niching_row(state, gt_y, row_budget, seed, max_gen, initial_sigma, min_sigma, decay_constant):
+    """
+    행 하나에 대해 적응형 니칭 GA를 수행하는 함수
+
+    Args:
+        state (tuple): _adaptive_niching_state의 반환값
+        gt_y (np.array): 행의 정답값
+        row_budget (SearchBudget): 이 행에 할당된 제한 시간
+        seed (int, optional): 행별 seed (같은 seed이면 serial/parallel 결과가 같음)
+
+    Returns:
+        tuple: (최적 개체 (1, n_features), 수행 세대 수, 제한 시간 소진 여부)
+    """
+    model, pred_func, x_min, x_max, n_features = state
+    seed_row(seed)
+
+    def fitness(population):
+        """개체군의 적합도를 평가하는 함수"""
+        population = np.concatenate(population, axis=0)
+        y_pred = pred_func(model=model, X_test=population)
+        fit_fun = -np.square(
+            y_pred - gt_y
+        )  # 오차의 음수 값 사용 (최대화 문제이므로)
+        return fit_fun
+
+    # DEAP creator를 재정의 (기존 정의 삭제 후 재생성)
+    try:
+        del creator.FitnessMax
+        del creator.Individual
+    except:
+        pass
+
+    creator.create("FitnessMax", base.Fitness, weights=(1.0,))
+    creator.create("Individual", list, fitness=creator.FitnessMax)
+    toolbox = base.Toolbox()
+
+    def generate_individual():
+        """개체 생성 함수: 평균과 표준편차를 활용한 무작위 샘플링"""
+        mean = (x_max + x_min) / 2
+        std_dev = (x_max - x_min) / 6
+        return np.random.randn(n_features) * std_dev + mean
+
+    # DEAP Toolbox 초기화
+    toolbox.register("attr_float", generate_individual)
+    toolbox.register(
+        "individual", tools.initRepeat, creator.Individual, toolbox.attr_float, n=1
+    )
+    toolbox.register("population", tools.initRepeat, list, toolbox.individual)
+    toolbox.register("evaluate", fitness)
+    toolbox.register("select", tools.selTournament, tournsize=2)
+    toolbox.register("mate", tools.cxBlend, alpha=0.7)
+    toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.3, indpb=0.6)
+
+    pop_size = 300
+    population = toolbox.population(n=pop_size)
+
+    # 초기 개체의 적합도 평가
+    invalid_inds = [ind for ind in population if not ind.fitness.valid]
+    fitness_scores = toolbox.evaluate(invalid_inds)
+    for ind, fit in zip(invalid_inds, fitness_scores):
+        ind.fitness.values = (fit,)
+
+    # 진화 과정
+    n_gen = 0
+    for gen in range(max_gen):
+        if len(population) == 1 or row_budget.expired():
+            break
+        n_gen = gen + 1
+
+        # 부모 선택 및 자손 생성
+        parents = toolbox.select(population, k=len(population))
+        offspring = list(map(toolbox.clone, parents))
+
+        # 교배 연산
+        for child1, child2 in zip(offspring[::2], offspring[1::2]):
+            if random.random() < 0.3:
+                toolbox.mate(child1, child2)
+                del child1.fitness.values
+                del child2.fitness.values
+
+        # 변이 연산
+        for child in offspring:
+            if random.random() < 0.5:
+                toolbox.mutate(child)
+                del child.fitness.values
+
+        # 값 범위 제한
+        offspring = [
+            creator.Individual(np.clip(np.array(ind), x_min, x_max))
+            for ind in offspring
+        ]
+
+        # 적합도 재계산
+        invalid_offspring = [ind for ind in offspring if not ind.fitness.valid]
+        fit_vals = toolbox.evaluate(invalid_offspring)
+        for ind, fv in zip(invalid_offspring, fit_vals):
+            ind.fitness.values = (fv,)
+
+        # 부모 + 자손 합쳐서 새로운 세대 선정
+        combined = population + offspring
+        next_population = toolbox.select(combined, k=pop_size)
+
+        # 적응형 니칭 크기 계산
+        sigma = adaptive_niche_size(
+            gen, max_gen, initial_sigma, min_sigma, decay_constant
+        )
+
+        # 피트니스 공유 적용
+        fitness_sharing(next_population, sigma, alpha=1.0)
+
+        population[:] = next_population
+
+    # 최적 개체 선택
+    best_individual = tools.selBest(population, k=1)[0]
+    best_individual = best_individual[0]
+    x_pred = np.array(best_individual).reshape(1, 8)
+
+    return x_pred, n_gen, row_budget.exhausted
+
+
 def ga_adaptive_niching_search(
     model,
     pred_func,
@@ -69,6 +197,10 @@ def ga_adaptive_niching_search(
     initial_sigma=2.5,
     min_sigma=0.5,
     decay_constant=2.0,
+    deadline=None,
+    n_jobs=1,
+    seed=None,
+    return_status=False,
 ):
     """
     유전자 알고리즘 기반의 적응형 니칭 검색을 수행하는 함수
@@ -83,121 +215,39 @@ def ga_adaptive_niching_search(
         initial_sigma (float): 초기 시그마 값 (default: 2.5)
         min_sigma (float): 최소 시그마 값 (default: 0.5)
         decay_constant (float): 시그마 감소 계수 (default: 2.0)
+        deadline (float | str | SearchBudget, optional): 제한 시간(초) 또는 preset 이름.
+            시간이 다 되면 각 행의 그때까지의 최적 개체를 반환 (default: None)
+        n_jobs (int): 1보다 크면 행들을 process pool로 나누어 탐색 (default: 1)
+        seed (int, optional): 행별 seed 생성용 seed, 지정하면 serial/parallel 결과가 같음 (default: None)
+        return_status (bool): True이면 행별 수행 세대 수와 제한 시간 소진 여부도 함께 반환 (default: False)
 
     Returns:
         np.array: 최적의 예측값 배열
+            (return_status=True이면 (예측값 배열, {'n_gen': [...], 'exhausted': [...]}))
     """
 
-    test = X_test
     gt_ys = y_test
-    n_features = X_train.shape[1]
-
-    # 훈련 데이터의 최소, 최대값 계산
-    x_min = np.min(X_train, axis=0)
-    x_max = np.max(X_train, axis=0)
-
-    res = []
-    for idx, gt_y in tqdm(enumerate(gt_ys), total=len(gt_ys)):
-
-        def fitness(population):
-            """개체군의 적합도를 평가하는 함수"""
-            population = np.concatenate(population, axis=0)
-            y_pred = pred_func(model=model, X_test=population)
-            fit_fun = -np.square(
-                y_pred - gt_y
-            )  # 오차의 음수 값 사용 (최대화 문제이므로)
-            return fit_fun
-
-        # DEAP creator를 재정의 (기존 정의 삭제 후 재생성)
-        try:
-            del creator.FitnessMax
-            del creator.Individual
-        except:
-            pass
-
-        creator.create("FitnessMax", base.Fitness, weights=(1.0,))
-        creator.create("Individual", list, fitness=creator.FitnessMax)
-        toolbox = base.Toolbox()
-
-        def generate_individual():
-            """개체 생성 함수: 평균과 표준편차를 활용한 무작위 샘플링"""
-            mean = (x_max + x_min) / 2
-            std_dev = (x_max - x_min) / 6
-            return np.random.randn(n_features) * std_dev + mean
-
-        # DEAP Toolbox 초기화
-        toolbox.register("attr_float", generate_individual)
-        toolbox.register(
-            "individual", tools.initRepeat, creator.Individual, toolbox.attr_float, n=1
-        )
-        toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-        toolbox.register("evaluate", fitness)
-        toolbox.register("select", tools.selTournament, tournsize=2)
-        toolbox.register("mate", tools.cxBlend, alpha=0.7)
-        toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.3, indpb=0.6)
-
-        pop_size = 300
-        population = toolbox.population(n=pop_size)
-
-        # 초기 개체의 적합도 평가
-        invalid_inds = [ind for ind in population if not ind.fitness.valid]
-        fitness_scores = toolbox.evaluate(invalid_inds)
-        for ind, fit in zip(invalid_inds, fitness_scores):
-            ind.fitness.values = (fit,)
-
-        # 진화 과정
-        for gen in range(max_gen):
-            if len(population) == 1:
-                break
-
-            # 부모 선택 및 자손 생성
-            parents = toolbox.select(population, k=len(population))
-            offspring = list(map(toolbox.clone, parents))
-
-            # 교배 연산
-            for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < 0.3:
-                    toolbox.mate(child1, child2)
-                    del child1.fitness.values
-                    del child2.fitness.values
-
-            # 변이 연산
-            for child in offspring:
-                if random.random() < 0.5:
-                    toolbox.mutate(child)
-                    del child.fitness.values
-
-            # 값 범위 제한
-            offspring = [
-                creator.Individual(np.clip(np.array(ind), x_min, x_max))
-                for ind in offspring
-            ]
-
-            # 적합도 재계산
-            invalid_offspring = [ind for ind in offspring if not ind.fitness.valid]
-            fit_vals = toolbox.evaluate(invalid_offspring)
-            for ind, fv in zip(invalid_offspring, fit_vals):
-                ind.fitness.values = (fv,)
-
-            # 부모 + 자손 합쳐서 새로운 세대 선정
-            combined = population + offspring
-            next_population = toolbox.select(combined, k=pop_size)
-
-            # 적응형 니칭 크기 계산
-            sigma = adaptive_niche_size(
-                gen, max_gen, initial_sigma, min_sigma, decay_constant
-            )
-
-            # 피트니스 공유 적용
-            fitness_sharing(next_population, sigma, alpha=1.0)
-
-            population[:] = next_population
-
-        # 최적 개체 선택
-        best_individual = tools.selBest(population, k=1)[0]
-        best_individual = best_individual[0]
-        x_pred = np.array(best_individual).reshape(1, 8)
-
-        res.append(x_pred)
-
+    budget = SearchBudget.resolve(deadline)
+    seeds = row_seeds(seed, len(gt_ys))
+    ga_params = (max_gen, initial_sigma, min_sigma, decay_constant)
+
+    if n_jobs > 1 and len(gt_ys) > 1:
+        # 행들을 동시에 탐색하므로 각 행에 남은 시간 전체를 할당
+        row_args = [(gt_y, budget.split(1), row_seed, *ga_params)
+                    for gt_y, row_seed in zip(gt_ys, seeds)]
+        row_results = run_rows_parallel(n_jobs, _adaptive_niching_state, (model, pred_func, X_train),
+                                        _adaptive_niching_row, row_args)
+    else:
+        # 훈련 데이터의 최소, 최대값 계산
+        state = _adaptive_niching_state(model, pred_func, X_train)
+
+        row_results = []
+        for idx, gt_y in tqdm(enumerate(gt_ys), total=len(gt_ys)):
+            # 남은 시간을 남은 행 수로 나누어 할당
+            row_budget = budget.split(len(gt_ys) - idx)
+            row_results.append(_adaptive_niching_row(state, gt_y, row_budget, seeds[idx], *ga_params))
+
+    res, n_gens, exhausted = map(list, zip(*row_results))
+    if return_status:
+        return np.concatenate(res, axis=0), {'n_gen': n_gens, 'exhausted': exhausted}
     return np.concatenate(res, axis=0)
@@ -0,0 +1,158 @@
+import numpy as np
+
+from hackathon.src.search.ga_function import kmeans_clustering\
+                                            ,var_and_matrix\
+                                            ,lexicographic_order\
+                                            ,grouped_lexicographic_selection
+
+
+class ArrayPopulation:
+    """
+    DEAP Individual 객체 대신 개체군 전체를 하나의 배열로 관리하는 클래스
+
+    Attributes:
+        X (np.ndarray): 개체 값 행렬 (pop, n_control)
+        F (np.ndarray): fitness 행렬 (pop, n_objectives), 미평가 개체는 nan
+        valid (np.ndarray): fitness 유효 여부 마스크 (pop,)
+    """
+
+    def __init__(self, X, n_objectives=None, F=None, valid=None):
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        if F is None:
+            F = np.full((len(self.X), n_objectives), np.nan)
+        if valid is None:
+            valid = np.zeros(len(self.X), dtype=bool)
+        self.F = F
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.X)
+
+    def take(self, indices):
+        """indices 순서대로 개체를 골라 새 ArrayPopulation 생성"""
+        return ArrayPopulation(self.X[indices], F=self.F[indices], valid=self.valid[indices])
+
+    def concat(self, other):
+        """self 뒤에 other를 이어 붙인 새 ArrayPopulation 생성"""
+        return ArrayPopulation(np.concatenate([self.X, other.X], axis=0),
+                               F=np.concatenate([self.F, other.F], axis=0),
+                               valid=np.concatenate([self.valid, other.valid], axis=0))
+
+    def invalid_indices(self):
+        """fitness가 없는 개체의 index"""
+        return np.flatnonzero(~self.valid)
+
+    def set_fitness(self, indices, fitness):
+        """indices 개체의 fitness를 기록하고 유효 처리"""
+        self.F[indices] = fitness
+        self.valid[indices] = True
+
+
+def init_array_population(n, x_min, x_max, is_nominal, pop_index_to_optimize, n_objectives):
+    """
+    k_means_search_deploy의 generate_individual을 개체군 단위로 수행하는 함수
+
+    Args:
+        n (int): 개체 수
+        x_min, x_max (np.ndarray): 제어 변수 범위
+        is_nominal (list): 변수가 범주형인지 여부
+        pop_index_to_optimize (dict): population 열 index -> 'maximize' / 'minimize'
+        n_objectives (int): fitness 차원
+
+    Returns:
+        ArrayPopulation: 초기 개체군
+    """
+    is_nominal = np.array(is_nominal, dtype=bool)
+    d = len(x_min)
+
+    # 제어 변수의 최소값과 최대값이 너무 가까워서 발생하는 오류를 방지
+    local_x_min = x_min.copy()
+    local_x_max = np.maximum(x_min + 1, x_max)
+
+    X = np.where(
+        is_nominal,
+        np.random.randint(local_x_min, local_x_max + 1, size=(n, d)),
+        np.random.uniform(local_x_min, local_x_max, size=(n, d))
+    ).astype(np.float64)
+
+    # 최적화할 변수는 목표 방향의 경계에서 지수 분포로 생성
+    scale_factor = (local_x_max - local_x_min) * (5 / 3)
+    for i, goal in pop_index_to_optimize.items():
+        if i >= d:
+            continue
+        adjustment = np.random.exponential(scale_factor[i], size=n)
+        if goal == 'maximize':
+            X[:, i] = local_x_max[i] - adjustment
+        else:
+            X[:, i] = local_x_min[i] + adjustment
+        X[:, i] = np.clip(X[:, i], local_x_min[i], local_x_max[i])
+
+    return ArrayPopulation(X, n_objectives=n_objectives)
+
+
+def var_and_array(population, cxpb, mutpb, eta, indpb, is_nominal, mu, sigma):
+    """
+    ga_function.var_and_matrix를 ArrayPopulation에 적용하는 함수
+
+    Args:
+        population (ArrayPopulation): 부모 개체군
+        cxpb (float): 짝 (0,1), (2,3), ... 별 교차 확률
+        mutpb (float): 개체별 돌연변이 확률
+        eta (float): SBX 파라미터
+        indpb (float): 변수별 교차(범주형)/변이 확률
+        is_nominal (list): 변수가 범주형인지 여부
+        mu (np.ndarray): 변수 평균 if 변수가 연속형 else 변수 최솟값
+        sigma (np.ndarray): 변수 표준편차 if 변수가 연속형 else 변수 최댓값
+
+    Returns:
+        ArrayPopulation: 자손 개체군 (값이 바뀐 개체만 fitness 무효화)
+    """
+    X, changed = var_and_matrix(population.X, cxpb, mutpb, eta, indpb, is_nominal, mu, sigma)
+    return ArrayPopulation(X, F=np.where(changed[:, None], np.nan, population.F),
+                           valid=population.valid & ~changed)
+
+
+def clip_array_population(population, x_min, x_max):
+    """제어 변수 범위로 clip하고 값이 바뀐 개체의 fitness를 무효화"""
+    clipped = np.clip(population.X, x_min, x_max)
+    moved = (clipped != population.X).any(axis=1)
+    population.X = clipped
+    population.valid &= ~moved
+    return population
+
+
+def lexicographic_selection_array(population, k, weights):
+    """
+    fitness를 lexicographic 내림차순 정렬한 후 상위 k개를 선택합니다.
+
+    Args:
+        population (ArrayPopulation): 평가된 개체군
+        k (int): 선택할 개체 수
+        weights (tuple): 목적별 가중치 (1.0: 최대화, -1.0: 최소화)
+
+    Returns:
+        ArrayPopulation: 선택된 개체군
+    """
+    return population.take(lexicographic_order(population.F, weights)[:k])
+
+
+def k_means_selection_array(population, k, weights, clusterer=None):
+    """
+    ga_function.k_means_selection의 ArrayPopulation 버전
+
+    Args:
+        population (ArrayPopulation): 평가된 개체군
+        k (int): K-means에서 나눌 클러스터 개수
+        weights (tuple): 목적별 가중치
+        clusterer (NicheClusterer, optional): 세대 간 유지되는 클러스터링 컴포넌트
+
+    Returns:
+        ArrayPopulation: 선택된 개체군
+    """
+    if clusterer is None:
+        cluster_labels, _ = kmeans_clustering(population.X, k=k)
+        n_clusters = k
+    else:
+        cluster_labels, n_clusters = clusterer.fit_predict(population.X, k)
+    selected = grouped_lexicographic_selection(cluster_labels, population.F, weights, n_clusters)
+    return population.take(selected)
@@ -5,8 +5,10 @@ import torch
 from tqdm import tqdm
 from deap import base, creator, tools
 
+from hackathon.src.search.search_budget import SearchBudget
 
-def ga_deap_search(model, pred_func, X_train, X_test, y_test, max_gen=10):
+
+def ga_deap_search(model, pred_func, X_train, X_test, y_test, max_gen=10, deadline=None, return_status=False):
     """
     Genetic Algorithm (GA) 기반 탐색 함수
 
@@ -17,9 +19,12 @@ def ga_deap_search(model, pred_func, X_train, X_test, y_test, max_gen=10):
         X_test (numpy.ndarray): 테스트 데이터
         y_test (numpy.ndarray): 테스트 라벨
         max_gen (int): 최대 세대 수 (기본값: 10)
+        deadline (float | str | SearchBudget, optional): 제한 시간(초) 또는 preset 이름 (기본값: None)
+        return_status (bool): True이면 행별 수행 세대 수와 제한 시간 소진 여부도 함께 반환 (기본값: False)
 
     Returns:
         numpy.ndarray: 최적화된 입력 값 리스트
+        (return_status=True이면 (입력 값 리스트, {'n_gen': [...], 'exhausted': [...]}))
     """
     test = X_test
     gt_ys = y_test
@@ -28,8 +33,13 @@ def ga_deap_search(model, pred_func, X_train, X_test, y_test, max_gen=10):
     x_min = np.min(X_train, axis=0)
     x_max = np.max(X_train, axis=0)
 
+    budget = SearchBudget.resolve(deadline)
+
     res = []
+    status = {'n_gen': [], 'exhausted': []}
     for idx, gt_y in tqdm(enumerate(gt_ys), desc="GA Optimization Loop"):
+        # 남은 시간을 남은 행 수로 나누어 할당
+        row_budget = budget.split(len(gt_ys) - idx)
 
         def fitness(population):
             """
@@ -67,13 +77,15 @@ def ga_deap_search(model, pred_func, X_train, X_test, y_test, max_gen=10):
         pop_size = 50
         population = toolbox.population(n=pop_size)
 
+        n_gen = 0
         for gen in range(max_gen):
             # 개체군 평가
             fitness_scores = toolbox.evaluate(population)
             for ind, fit in zip(population, fitness_scores):
                 ind.fitness.values = (fit,)
+            n_gen = gen + 1
 
-            if len(population) == 1:
+            if len(population) == 1 or row_budget.expired():
                 break
 
             # 부모 선택 및 복제
@@ -112,5 +124,9 @@ def ga_deap_search(model, pred_func, X_train, X_test, y_test, max_gen=10):
         x_pred = all_individual[res_idx]
 
         res.append(x_pred)
+        status['n_gen'].append(n_gen)
+        status['exhausted'].append(row_budget.exhausted)
 
+    if return_status:
+        return np.concatenate(res, axis=0), status
     return np.concatenate(res, axis=0)
@@ -64,6 +64,113 @@ def mutGaussian_mutUniformInt(ind, mu, sigma, indpb, is_nominal):
     return ind,
 
 
+def cx_simulated_binary_w_cx_uniform_matrix(X1, X2, eta, indpb, is_nominal):
+    """
+    cx_simulated_binary_w_cx_uniform를 여러 짝에 한 번에 적용하는 함수
+
+    X1 : 첫 번째 부모 행렬 (n_pairs, d)
+    X2 : 두 번째 부모 행렬 (n_pairs, d)
+    eta : cx_simulated_binary 파라미터
+    indpb : 변수별 교환 확률 (범주형)
+    is_nominal : 변수가 범주형인지 여부 (미리 만든 bool 배열)
+    """
+
+    is_nominal = np.asarray(is_nominal, dtype=bool)
+    rand_uniform = np.random.random(X1.shape)
+    rand_pb = np.random.random(X1.shape)
+
+    beta = np.where(
+        rand_uniform < 0.5,
+        (2. * rand_uniform) ** (1. / (eta + 1.)),
+        (1. / (2. * (1. - rand_uniform))) ** (1. / (eta + 1.))
+    )
+    child1 = 0.5 * ((1 + beta) * X1 + (1 - beta) * X2)
+    child2 = 0.5 * ((1 - beta) * X1 + (1 + beta) * X2)
+
+    # nominal 값은 indpb 확률로 교환
+    swap = rand_pb < indpb
+    child1 = np.where(is_nominal, np.where(swap, X2, X1), child1)
+    child2 = np.where(is_nominal, np.where(swap, X1, X2), child2)
+
+    return child1, child2
+
+
+def mutGaussian_mutUniformInt_matrix(X, mu, sigma, indpb, is_nominal, row_mask=None):
+    """
+    mutGaussian_mutUniformInt를 개체군 행렬 전체에 한 번의 mask 추출로 적용하는 함수
+
+    X : 개체 행렬 (n, d), 제자리에서 수정
+    mu : 변수 평균 if 변수가 연속형 else 변수 최솟값
+    sigma : 변수 표준편차 if 변수가 연속형 else 변수 최댓값
+    is_nominal : 변수가 범주형인지 여부 (미리 만든 bool 배열)
+    row_mask : 돌연변이를 적용할 개체 mask (None이면 전체)
+
+    return : 변이된 X, 값이 바뀐 개체 mask
+    """
+
+    is_nominal = np.asarray(is_nominal, dtype=bool)
+    mask = np.random.random(X.shape) < indpb
+    if row_mask is not None:
+        mask &= row_mask[:, None]
+
+    # 범주 변수 변이
+    cat_mask = mask & is_nominal
+    if cat_mask.any():
+        rows, cols = np.nonzero(cat_mask)
+        X[rows, cols] = np.random.randint(mu[cols], sigma[cols] + 1)
+
+    # 연속형 변수 변이
+    cont_mask = mask & ~is_nominal
+    if cont_mask.any():
+        rows, cols = np.nonzero(cont_mask)
+        X[rows, cols] += np.random.normal(mu[cols], sigma[cols])
+
+    return X, mask.any(axis=1)
+
+
+def var_and_matrix(X, cxpb, mutpb, eta, indpb, is_nominal, mu, sigma):
+    """
+    algorithms.varAnd를 개체군 행렬에 대해 수행하는 함수
+    짝 (0,1), (2,3), ... 마다 cxpb 확률로 교차하고, 개체마다 mutpb 확률로 돌연변이
+
+    X : 부모 개체 행렬 (n, d)
+    return : 자손 개체 행렬, 값이 바뀐 개체 mask
+    """
+
+    X = np.array(X, dtype=np.float64)
+    n = len(X)
+    changed = np.zeros(n, dtype=bool)
+
+    # 교차: 짝 단위 mask
+    pair_idx = np.flatnonzero(np.random.random(n // 2) < cxpb)
+    if len(pair_idx):
+        idx1, idx2 = 2 * pair_idx, 2 * pair_idx + 1
+        X[idx1], X[idx2] = cx_simulated_binary_w_cx_uniform_matrix(X[idx1], X[idx2], eta, indpb, is_nominal)
+        changed[idx1] = True
+        changed[idx2] = True
+
+    # 돌연변이: 개체 mask x 변수 mask
+    X, mutated = mutGaussian_mutUniformInt_matrix(X, mu, sigma, indpb, is_nominal,
+                                                   row_mask=np.random.random(n) < mutpb)
+    return X, changed | mutated
+
+
+def lexicographic_order(fitness, weights):
+    """
+    fitness 행렬에 weights를 곱한 뒤 첫 번째 목적부터 내림차순으로 정렬한 index를 반환합니다.
+    np.lexsort는 안정 정렬이므로 동순위 개체는 기존 순서를 유지합니다.
+
+    Args:
+        fitness (np.ndarray): fitness 행렬 (n, n_objectives)
+        weights (tuple): 목적별 가중치 (1.0: 최대화, -1.0: 최소화)
+
+    Returns:
+        order (np.ndarray): 정렬된 개체 index
+    """
+    keys = -(np.asarray(fitness) * np.asarray(weights))
+    return np.lexsort(keys[:, ::-1].T)
+
+
 def lexicographic_selection(population,k):
     """
     개체의 fitness를 내림차순 정렬한 후 상위 k개를 선택합니다.
@@ -75,11 +182,45 @@ def lexicographic_selection(population,k):
     Returns:
         population (list): 선택된 개체 리스트 
     """
-    
-    population.sort(key=lambda ind: tuple(val * w for val, w in zip(ind.fitness.values, ind.fitness.weights)), 
-                    reverse=True)
+    if not population:
+        return []
+    fitness = np.array([ind.fitness.values for ind in population])
+    order = lexicographic_order(fitness, population[0].fitness.weights)
+
+    return [population[idx] for idx in order[:k]]
 
-    return population[:k] 
+
+def grouped_lexicographic_selection(cluster_labels, fitness, weights, n_clusters):
+    """
+    모든 클러스터에 대해 lexicographic 선택을 한 번에 수행합니다.
+    클러스터마다 크기의 절반을 선택하며, 홀수 크기 클러스터는 클러스터 번호 순서대로
+    번갈아 가며 한 개를 더 선택해 전체 개체 수가 줄어드는 것을 방지합니다.
+
+    Args:
+        cluster_labels (np.ndarray): 개체별 클러스터 index (n,)
+        fitness (np.ndarray): fitness 행렬 (n, n_objectives)
+        weights (tuple): 목적별 가중치
+        n_clusters (int): 클러스터 개수
+
+    Returns:
+        selected (np.ndarray): 선택된 개체 index (클러스터 순, 클러스터 내 fitness 내림차순)
+    """
+    cluster_labels = np.asarray(cluster_labels, dtype=np.int64)
+    cluster_sizes = np.bincount(cluster_labels, minlength=n_clusters)
+
+    # 홀수 크기 클러스터 중 첫 번째, 세 번째, ... 클러스터에서 한 개 더 선택
+    is_odd = cluster_sizes % 2 == 1
+    selection_sizes = cluster_sizes // 2 + (is_odd & (np.cumsum(is_odd) % 2 == 1))
+
+    # 클러스터 번호를 1순위 key로 두고 클러스터 내부는 lexicographic 내림차순 정렬
+    keys = -(np.asarray(fitness) * np.asarray(weights))
+    order = np.lexsort(tuple(keys[:, ::-1].T) + (cluster_labels,))
+
+    sorted_labels = cluster_labels[order]
+    cluster_starts = np.cumsum(cluster_sizes) - cluster_sizes
+    rank_in_cluster = np.arange(len(order)) - cluster_starts[sorted_labels]
+
+    return order[rank_in_cluster < selection_sizes[sorted_labels]]
 
 
 def kmeans_clustering(population, k):
@@ -122,41 +263,27 @@ def kmeans_clustering(population, k):
     cluster_labels = kmeans.index.search(population, 1)[1].flatten()
     return cluster_labels, kmeans.centroids
 
-def k_means_selection(population, k):
+def k_means_selection(population, k, clusterer=None):
     """
     Args:
         population (list)
         k (int): K-means에서 나눌 클러스터 개수.
+        clusterer (NicheClusterer, optional): 세대 간 유지되는 클러스터링 컴포넌트.
+            None이면 매 세대 새로 faiss.Kmeans를 학습합니다.
 
     Returns:
         list: 선택된 ind 리스트.
     """
 
-    adjustment_flag = False  # 클러스터 크기가 홀수일 때 조절하는 플래그
     population_array = np.array(population)
     
-    cluster_labels, _ = kmeans_clustering(population_array, k=k)
-    
-    selected = []
-    
-    for cluster_id in range(k):
-        cluster_indices = np.where(cluster_labels == cluster_id)[0]
-        cluster_population = [population[idx] for idx in cluster_indices]
-        cluster_size = len(cluster_population)
-        
-        # 홀수일 떄 개체수 줄어듦 방지 
-        selection_size = cluster_size // 2
-        if cluster_size % 2 == 1 and not adjustment_flag:
-            selection_size += 1
-            adjustment_flag = True
-        elif cluster_size % 2 == 1 and adjustment_flag:
-            adjustment_flag = False
-        
-        selected.extend(
-            lexicographic_selection(
-                cluster_population, 
-                k=selection_size
-              )
-        )
-    # print(len(selected))
-    return selected
+    if clusterer is None:
+        cluster_labels, _ = kmeans_clustering(population_array, k=k)
+        n_clusters = k
+    else:
+        cluster_labels, n_clusters = clusterer.fit_predict(population_array, k)
+
+    fitness = np.array([ind.fitness.values for ind in population])
+    selected = grouped_lexicographic_selection(cluster_labels, fitness, population[0].fitness.weights, n_clusters)
+
+    return [population[idx] for idx in selected]
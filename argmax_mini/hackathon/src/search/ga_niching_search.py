@@ -10,6 +10,10 @@ import contextlib
 import os
 import pandas as pd
 
+from hackathon.src.search.search_budget import SearchBudget
+
+from hackathon.src.search.niching import NicheClusterer
+
 
 def kmeans_clustering(population, k):
     n, d = population.shape
@@ -22,12 +26,16 @@ def kmeans_clustering(population, k):
     
     return cluster_labels, centroids
 
-def k_means_selection(population, k):
+def k_means_selection(population, k, clusterer=None):
     flag = 0
 
-    cluster_labels, centroids = kmeans_clustering(np.array(population),k=k)
+    if clusterer is None:
+        cluster_labels, centroids = kmeans_clustering(np.array(population),k=k)
+        n_clusters = k
+    else:
+        cluster_labels, n_clusters = clusterer.fit_predict(np.array(population), k)
     res = []
-    for i in range(k):
+    for i in range(n_clusters):
         cluster_idx = np.where(cluster_labels == i)[0]
         cluster_population = [population[j] for j in cluster_idx]
         
@@ -42,7 +50,7 @@ def k_means_selection(population, k):
                 flag = 0
     return res
 
-def k_means_search(model, pred_func, X_train, X_test, y_test):
+def k_means_search(model, pred_func, X_train, X_test, y_test, niching='kmeans', deadline=None, return_status=False):
 
     x_min,x_max = np.min(X_train, axis=0), np.max(X_train, axis=0)
     n_features = X_train.shape[1]
@@ -62,8 +70,14 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
     toolbox.register('individual', tools.initIterate, creator.Individual, toolbox.attr_float)
     toolbox.register('population', tools.initRepeat, list, toolbox.individual)
 
+    # deadline : 제한 시간(초) 또는 preset 이름, 시간이 다 되면 그때까지의 population으로 결과 생성
+    # return_status : True이면 행별 수행 세대 수와 제한 시간 소진 여부({'n_gen', 'exhausted'})도 함께 반환
+    budget = SearchBudget.resolve(deadline)
+
     res = []
+    status = {'n_gen': [], 'exhausted': []}
     for idx, gt_y in tqdm(enumerate(y_test)):
+        row_budget = budget.split(len(y_test) - idx)
 
         def fitness(population):
 
@@ -89,6 +103,7 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
         sigma_list = [(ub - lb)/(6.0) for (lb,ub) in zip(x_min, x_max)]
         toolbox.register('mate', tools.cxSimulatedBinary, eta=ETA_CX)
         toolbox.register('mutate', tools.mutGaussian, mu=[0.0]*(len(x_min)), sigma=sigma_list, indpb=INDPB)
+        clusterer = None if niching == 'faiss' else NicheClusterer(mode=niching)
 
         for gen in range(1,101):    
             # if gen%20 == 0:
@@ -110,7 +125,10 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
             fitness_scores = toolbox.evaluate(invalid_ind)
             for ind, fit in zip(invalid_ind, fitness_scores):
                 ind.fitness.values = (fit,)
-            population = k_means_selection(population, k=len(population)//3)
+            population = k_means_selection(population, k=len(population)//3, clusterer=clusterer)
+            n_gen = gen
+            if row_budget.expired():
+                break
             # print(len(population))
 
         population = [ind for ind in population if ind.fitness.values[0] > -0.01]
@@ -126,6 +144,10 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
         res_idx = np.argmin(distances)
         x_pred = population[res_idx]
         res.append(x_pred)
+        status['n_gen'].append(n_gen)
+        status['exhausted'].append(row_budget.exhausted)
 
     print(np.stack(res).shape)
+    if return_status:
+        return np.stack(res), status
     return np.stack(res)
\ No newline at end of file
@@ -0,0 +1,188 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from hackathon.src.search.search_engine import SearchEngine
+from hackathon.src.search.ga_array_engine import init_array_population
+from hackathon.src.search.ga_function import lexicographic_order
+from hackathon.src.search.fitness_kernel import EvaluationKernel
+from hackathon.src.search.search_budget import SearchBudget
+from hackathon.src.search.parallel import seed_row
+from hackathon.src.surrogate.distill_model import distill_surrogate
+
+
+class GradientSearchEngine(SearchEngine):
+    """
+    surrogate를 작은 MLP로 distill한 뒤 projected gradient로 탐색하는 탐색기
+
+    CatBoost/TabPFN은 gradient가 없으므로 제어 변수 탐색 범위에서 샘플링한 입력의 예측값으로
+    DistilledMLP를 한 번 학습하고(SearchEngine을 재사용하는 동안 유지), 모든 행 x 시작점을
+    하나의 배치로 Adam + 범위 projection 하여 탐색합니다. 마지막 후보만 실제 surrogate로 한 번
+    예측해 SearchEngine과 같은 lexicographic fitness로 행별 최적 후보를 고릅니다.
+
+    loss = sum((y - 목표) / y 표준편차)^2 + OBJECTIVE_WEIGHT * 중요도 순 가중(최적화 방향으로 정규화한 제어 변수)
+    범주형 제어 변수는 시작점에서 샘플링한 값을 유지합니다. (시작점마다 다른 범주)
+
+    Args:
+        SearchEngine과 같음 (engine/niching/prescreen은 사용하지 않음)
+        distill_options (dict, optional): distill_surrogate 설정 (n_samples, hidden, epochs 등)
+    """
+
+    N_STARTS = 64  # 행별 시작점 수
+    STEPS = 300  # 최대 gradient step 수
+    LR = 0.02  # 제어 변수 범위 대비 step 크기
+    OBJECTIVE_WEIGHT = 1e-3  # 타겟 오차 대비 제어 변수 최적화 목적의 가중치 (중요도 순위마다 1/10)
+
+    def __init__(self, model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                 importance, bounds, scalers, engine='array', niching=None, cache_size=100000, borders=None,
+                 prescreen=None, distill_options=None):
+        super().__init__(model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                         importance, bounds, scalers, engine='array', niching=niching, cache_size=cache_size,
+                         borders=borders)
+        self.X_train = X_train
+        self.distill_options = distill_options or {}
+        self.distilled = None
+
+        n_targets = len(self.weights) - len(self.sorted_pop_idx_by_importance)
+        self.y_scale = np.std(np.asarray(y_train, dtype=np.float64).reshape(len(y_train), n_targets), axis=0)
+        self.y_scale = np.where(self.y_scale > 0, self.y_scale, 1.0)
+
+        # 최적화 목적의 제어 변수 gradient (최소화할 loss 기준: maximize는 -, minimize는 +)
+        span = np.where(self.x_max > self.x_min, self.x_max - self.x_min, 1.0)
+        self.objective_grad = np.zeros(len(self.control_index))
+        for rank, pop_idx in enumerate(self.sorted_pop_idx_by_importance):
+            sign = -1.0 if self.pop_index_to_optimize[pop_idx] == 'maximize' else 1.0
+            self.objective_grad[pop_idx] = sign * self.OBJECTIVE_WEIGHT * 0.1 ** rank / span[pop_idx]
+
+    def distill(self):
+        """distill된 MLP (처음 호출할 때 한 번 학습)"""
+        if self.distilled is None:
+            self.distilled = distill_surrogate(self.model, self.pred_func, self.X_train, self.control_index,
+                                               self.x_min, self.x_max, self.is_norminal, **self.distill_options)
+        return self.distilled
+
+    def _start_points(self, gt_xs, n_starts):
+        """행별 시작점 (현재 제어 변수 값 + 목표 방향 경계 근처에서 생성한 개체) (n_rows * n_starts, n_control)"""
+        starts = []
+        for gt_x in gt_xs:
+            population = init_array_population(n_starts - 1, self.x_min, self.x_max, self.is_norminal,
+                                               self.pop_index_to_optimize, len(self.weights))
+            starts.append(np.vstack([gt_x[self.control_index], population.X]))
+        return np.clip(np.concatenate(starts).astype(np.float64), self.x_min, self.x_max)
+
+    def _descend(self, inputs, controls, user_request_target, budget, steps, tol, min_gen):
+        """
+        모든 후보의 제어 변수를 Adam + projection으로 갱신 (min_gen step 이후부터 수렴 검사)
+
+        Returns:
+            np.ndarray: 최종 제어 변수
+            int: 수행한 step 수
+            bool: loss 변화가 tol 이하로 수렴했는지 여부
+        """
+        net = self.distill()
+        target = np.asarray(user_request_target, dtype=np.float64).reshape(1, -1)
+        y_weight = 1.0 / self.y_scale ** 2
+        free = ~self.nominal_mask
+        span = np.where(self.x_max > self.x_min, self.x_max - self.x_min, 1.0)
+
+        def grad_fn(y):
+            return 2.0 * (y - target) * y_weight
+
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        m, v = np.zeros_like(controls), np.zeros_like(controls)
+        previous_loss = np.inf
+        for step in range(1, steps + 1):
+            inputs[:, self.control_index] = controls
+            y, grad_x = net.predict_with_input_grad(inputs, grad_fn)
+            grad = grad_x[:, self.control_index] + self.objective_grad
+            grad[:, ~free] = 0.0
+            # 변수 범위로 정규화한 좌표에서 Adam step
+            grad *= span
+            m = beta1 * m + (1 - beta1) * grad
+            v = beta2 * v + (1 - beta2) * grad * grad
+            controls -= self.LR * span * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+            np.clip(controls, self.x_min, self.x_max, out=controls)
+
+            if budget.expired():
+                return controls, step, False
+            loss = float((((y - target) ** 2) * y_weight).sum(axis=1).mean())
+            if step >= min_gen and abs(previous_loss - loss) <= tol * max(abs(previous_loss), 1e-12):
+                return controls, step, True
+            previous_loss = loss
+        return controls, steps, False
+
+    def search(self, user_request_target, rows, batched=True, max_gen=None, pop_size=None,
+               patience=20, tol=1e-6, min_gen=20, deadline=None, n_jobs=1, seed=None, y_rows=None):
+        """
+        사용자 요청 타겟 값에 맞는 제어 변수 값을 모든 행에 대해 한 번에 탐색합니다.
+
+        Args:
+            user_request_target (np.ndarray): 사용자 요청 타겟 값 (scaled)
+            rows (np.ndarray): 탐색 시작점이 되는 원본 X 행들
+            max_gen (int, optional): 최대 gradient step 수 (기본값 STEPS)
+            pop_size (int, optional): 행별 시작점 수 (기본값 N_STARTS)
+            tol, min_gen: min_gen step 이후 평균 loss의 상대 변화가 tol 이하이면 종료
+            deadline (float | str | SearchBudget, optional): 제한 시간(초) 또는 preset 이름
+            seed (int, optional): 시작점 생성 seed
+            batched, patience, n_jobs, y_rows: SearchEngine.search와 인자를 맞추기 위한 값 (사용하지 않음)
+
+        Returns:
+            pd.DataFrame: pred_x_* 열과 행별 gradient step 수(n_gen), 수렴 여부(converged),
+                실제 surrogate 예측 개체 수(n_eval), 캐시 적중률(cache_hit_rate, 항상 0)
+                df.attrs['distill_r2'] : distill된 MLP의 holdout 타겟별 r2
+        """
+        budget = SearchBudget.resolve(deadline)
+        steps = self.STEPS if max_gen is None else max_gen
+        n_starts = self.N_STARTS if pop_size is None else pop_size
+        user_request_target = np.asarray(user_request_target)
+        self.n_requests += 1
+        seed_row(seed)
+
+        rows = np.asarray(rows, dtype=np.float64)
+        controls = self._start_points(rows, n_starts)
+        inputs = np.repeat(rows, n_starts, axis=0)
+        controls, n_steps, converged = self._descend(inputs, controls, user_request_target, budget,
+                                                     steps, tol, min_gen)
+
+        # 범주형은 정수로, border 탐색 공간이 있으면 구간 대표값으로 맞춘 뒤 실제 surrogate로 재평가
+        controls[:, self.nominal_mask] = np.round(controls[:, self.nominal_mask])
+        controls = self._snap(controls)
+        candidates = list(controls.reshape(len(rows), n_starts, -1))
+        kernel = EvaluationKernel(list(rows), self.control_index)
+        fitness_list, n_predicted = self._evaluate_controls(list(range(len(rows))), candidates, kernel,
+                                                           [None] * len(rows), user_request_target)
+        best_individuals = [candidate[lexicographic_order(fitness, self.weights)[0]]
+                            for candidate, fitness in zip(candidates, fitness_list)]
+
+        res = {}
+        for i, control_var in enumerate(self.control_var_names):
+            res[f"pred_x_{control_var}"] = [int(best[i]) if self.is_norminal[i] else float(best[i])
+                                            for best in best_individuals]
+        res["n_gen"] = [n_steps] * len(rows)
+        res["converged"] = [converged] * len(rows)
+        res["n_eval"] = n_predicted
+        res["cache_hit_rate"] = [0.0] * len(rows)
+        df = pd.DataFrame(res)
+        df.attrs['distill_r2'] = self.distilled.fidelity_r2.tolist()
+        logging.info(f"gradient search: {len(rows)}행 x 시작점 {n_starts}개, {n_steps} step, "
+                     f"surrogate 재평가 {sum(n_predicted)}개")
+        return df
+
+
+def gradient_search_deploy(model, pred_func, X_train, X_test, y_test, all_var_names, control_var_names, optmize_dict,
+                           importance, bounds, scalers, user_request_target, batched=True, engine='array',
+                           niching=None, max_gen=None, patience=20, tol=1e-6, min_gen=20, cache_size=100000,
+                           pop_size=None, deadline=None, n_jobs=1, seed=None, borders=None, distill_options=None):
+    """
+    distill된 MLP 위의 projected gradient 탐색 (인자는 k_means_search_deploy와 동일)
+
+    # max_gen : 최대 gradient step 수, pop_size : 행별 시작점 수
+    # distill_options : distill_surrogate 설정 (n_samples, hidden, epochs 등)
+    # return : k_means_search_deploy와 같은 열, df.attrs['distill_r2'] : distill된 MLP의 holdout r2
+    """
+    search_engine = GradientSearchEngine(model, pred_func, X_train, y_test, all_var_names, control_var_names,
+                                         optmize_dict, importance, bounds, scalers, cache_size=cache_size,
+                                         borders=borders, distill_options=distill_options)
+    return search_engine.search(user_request_target, X_test, max_gen=max_gen, pop_size=pop_size, tol=tol,
+                                min_gen=min_gen, deadline=deadline, seed=seed)
@@ -10,6 +10,8 @@ import contextlib
 import os
 import pandas as pd
 
+from hackathon.src.search.search_budget import SearchBudget
+
 
 def kmeans_clustering(population, k):
     n, d = population.shape
@@ -42,7 +44,7 @@ def k_means_selection(population, k):
                 flag = 0
     return res
 
-def k_means_search(model, pred_func, X_train, X_test, y_test):
+def k_means_search(model, pred_func, X_train, X_test, y_test, deadline=None, return_status=False):
 
     x_min,x_max = np.min(X_train, axis=0), np.max(X_train, axis=0)
     n_features = X_train.shape[1]
@@ -62,8 +64,14 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
     toolbox.register('individual', tools.initIterate, creator.Individual, toolbox.attr_float)
     toolbox.register('population', tools.initRepeat, list, toolbox.individual)
 
+    # deadline : 제한 시간(초) 또는 preset 이름, 시간이 다 되면 그때까지의 population으로 결과 생성
+    # return_status : True이면 행별 수행 세대 수와 제한 시간 소진 여부({'n_gen', 'exhausted'})도 함께 반환
+    budget = SearchBudget.resolve(deadline)
+
     res = []
+    status = {'n_gen': [], 'exhausted': []}
     for idx, gt_y in tqdm(enumerate(y_test)):
+        row_budget = budget.split(len(y_test) - idx)
 
         def fitness(population):
 
@@ -111,6 +119,9 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
             for ind, fit in zip(invalid_ind, fitness_scores):
                 ind.fitness.values = (fit,)
             population = k_means_selection(population, k=len(population)//3)
+            n_gen = gen
+            if row_budget.expired():
+                break
             # print(len(population))
 
         population = [ind for ind in population if ind.fitness.values[0] > -0.01]
@@ -126,6 +137,10 @@ def k_means_search(model, pred_func, X_train, X_test, y_test):
         res_idx = np.argmin(distances)
         x_pred = population[res_idx]
         res.append(x_pred)
+        status['n_gen'].append(n_gen)
+        status['exhausted'].append(row_budget.exhausted)
 
     print(np.stack(res).shape)
+    if return_status:
+        return np.stack(res), status
     return np.stack(res)
\ No newline at end of file
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import pickle
+
+import numpy as np
+import faiss
+from scipy.spatial import cKDTree
+
+
+class TargetNeighborIndex:
+    """
+    scaled 타겟 공간(y_train)에서 사용자 요청 타겟과 가까운 행을 찾는 nearest-neighbor index
+
+    타겟별 표준편차로 정규화한 거리를 사용하므로 다중 타겟 요청에서 한 타겟의 scale이 거리를 지배하지 않습니다.
+    데이터 크기와 타겟 차원에 따라 backend를 선택합니다.
+
+    - 'kdtree': scipy cKDTree (타겟 차원이 낮을 때)
+    - 'flat'  : 전체 거리 계산 후 np.argpartition으로 상위 k개만 정렬
+    - 'ivf'   : faiss IndexIVFFlat 근사 검색 (행 수가 매우 많을 때)
+
+    Args:
+        y_train (np.ndarray): scaled 타겟 값 (n, n_targets)
+        backend (str, optional): 'kdtree' | 'flat' | 'ivf', None이면 크기에 따라 자동 선택
+        target_names (list, optional): 타겟 열 이름 (저장된 index 재사용 여부 판단에 사용)
+    """
+
+    KDTREE_MAX_DIM = 8  # 이 차원 이하이면 kd-tree 사용
+    IVF_MIN_ROWS = 1000000  # 이 행 수 이상이면 faiss IVF 사용
+    IVF_NPROBE = 16
+
+    def __init__(self, y_train, backend=None, target_names=None):
+        points = np.asarray(y_train, dtype=np.float64).reshape(len(y_train), -1)
+        self.n_rows, self.n_targets = points.shape
+        self.fingerprint = self.make_fingerprint(y_train, target_names)
+
+        scale = points.std(axis=0)
+        self.scale = np.where(scale > 0, scale, 1.0)
+        points = points / self.scale
+
+        if backend is None:
+            if self.n_rows >= self.IVF_MIN_ROWS:
+                backend = 'ivf'
+            elif self.n_targets <= self.KDTREE_MAX_DIM:
+                backend = 'kdtree'
+            else:
+                backend = 'flat'
+        if backend not in ('kdtree', 'flat', 'ivf'):
+            raise ValueError(f"지원되지 않는 backend입니다: {backend}")
+        self.backend = backend
+
+        self.points = None
+        self.tree = None
+        self.index = None
+        if backend == 'kdtree':
+            self.tree = cKDTree(points)
+        elif backend == 'flat':
+            self.points = points
+        else:
+            self.index = self._build_ivf(points.astype('float32'))
+
+    @staticmethod
+    def make_fingerprint(y_train, target_names=None):
+        """index를 만든 데이터 요약 (행/타겟 수, 타겟 이름, y_train 값 hash)"""
+        points = np.ascontiguousarray(np.asarray(y_train, dtype=np.float64).reshape(len(y_train), -1))
+        return {
+            'n_rows': points.shape[0],
+            'n_targets': points.shape[1],
+            'target_names': tuple(target_names) if target_names is not None else None,
+            'y_hash': hashlib.sha1(points.tobytes()).hexdigest(),
+        }
+
+    def _build_ivf(self, points):
+        nlist = int(np.clip(4 * np.sqrt(len(points)), 1, 65536))
+        quantizer = faiss.IndexFlatL2(self.n_targets)
+        index = faiss.IndexIVFFlat(quantizer, self.n_targets, nlist)
+        rng = np.random.default_rng(0)
+        train = points[rng.choice(len(points), min(len(points), nlist * 64), replace=False)]
+        index.train(train)
+        index.add(points)
+        index.nprobe = self.IVF_NPROBE
+        return index
+
+    def query(self, y_request, k=5):
+        """
+        요청 타겟과 가까운 k개 행의 index를 거리 오름차순으로 반환합니다.
+
+        Args:
+            y_request (np.ndarray): scaled 사용자 요청 타겟 값 (n_targets,)
+            k (int): 찾을 행 수
+
+        Returns:
+            np.ndarray: y_train 기준 행 index (k,)
+        """
+        k = min(k, self.n_rows)
+        query = np.asarray(y_request, dtype=np.float64).reshape(1, -1) / self.scale
+
+        if self.backend == 'kdtree':
+            _, indices = self.tree.query(query, k=k)
+            return np.asarray(indices).reshape(-1)[:k]
+        if self.backend == 'flat':
+            distances = ((self.points - query) ** 2).sum(axis=1)
+            top_k = np.argpartition(distances, k - 1)[:k]
+            return top_k[np.argsort(distances[top_k])]
+
+        # IVF는 탐색한 cluster에 행이 k개보다 적으면 -1을 채우므로 제외
+        _, indices = self.index.search(query.astype('float32'), k)
+        indices = indices.reshape(-1)
+        return indices[indices >= 0]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.index is not None:
+            # faiss index는 pickle이 안되므로 byte 배열로 직렬화
+            state['index'] = faiss.serialize_index(self.index)
+        return state
+
+    def __setstate__(self, state):
+        if state.get('index') is not None:
+            state['index'] = faiss.deserialize_index(state['index'])
+            state['index'].nprobe = self.IVF_NPROBE
+        self.__dict__.update(state)
+
+    @staticmethod
+    def index_path(model_path, target_names=None):
+        """surrogate 모델 경로(확장자 제외) 옆에 저장할 index 파일 경로 (타겟 조합별로 구분)"""
+        if not target_names:
+            return f'{model_path}.target_index.pkl'
+        target_key = hashlib.md5('|'.join(map(str, target_names)).encode()).hexdigest()[:12]
+        return f'{model_path}.target_index.{target_key}.pkl'
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    @classmethod
+    def load_or_build(cls, model_path, y_train, target_names=None):
+        """
+        모델 옆에 저장된 index를 불러오고, 없거나 fingerprint(행/타겟 수, 타겟 이름, y_train 값)가
+        다르면 새로 만들어 저장합니다.
+
+        Args:
+            model_path (str): surrogate 모델 경로 (확장자 제외)
+            y_train (np.ndarray): scaled 타겟 값
+            target_names (list, optional): 타겟 열 이름
+
+        Returns:
+            TargetNeighborIndex
+        """
+        path = cls.index_path(model_path, target_names)
+        if os.path.exists(path):
+            try:
+                index = cls.load(path)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                index = None
+            if getattr(index, 'fingerprint', None) == cls.make_fingerprint(y_train, target_names):
+                return index
+
+        index = cls(y_train, target_names=target_names)
+        try:
+            index.save(path)
+        except OSError:
+            pass
+        return index
@@ -0,0 +1,113 @@
+import numpy as np
+import faiss
+
+
+class NicheClusterer:
+    """
+    세대가 바뀌어도 유지되는 niching용 클러스터링 컴포넌트
+
+    - 'kmeans': 이전 세대의 centroid로 초기화(warm start)한 Lloyd 반복을 수행하고,
+                할당이 거의 바뀌지 않으면 조기 종료
+    - 'grid'  : 변수 범위를 격자로 나누어 같은 칸의 개체를 하나의 niche로 묶음 (반복 없음)
+
+    Args:
+        mode (str): 'kmeans' | 'grid'
+        max_iter (int): warm start 이전(첫 세대) 최대 Lloyd 반복 횟수
+        warm_max_iter (int): warm start 이후 최대 Lloyd 반복 횟수
+        tol (float): 할당이 바뀐 개체 비율이 tol 이하이면 반복 종료
+        max_points_per_centroid (int): centroid 갱신에 사용할 centroid당 최대 학습 개체 수
+        seed (int): 초기화 및 샘플링 시드
+    """
+
+    def __init__(self, mode='kmeans', max_iter=20, warm_max_iter=5, tol=0.005,
+                 max_points_per_centroid=256, seed=1234):
+        if mode not in ('kmeans', 'grid'):
+            raise ValueError(f"지원되지 않는 niching mode입니다: {mode}")
+        self.mode = mode
+        self.max_iter = max_iter
+        self.warm_max_iter = warm_max_iter
+        self.tol = tol
+        self.max_points_per_centroid = max_points_per_centroid
+        self.rng = np.random.default_rng(seed)
+        self.centroids = None
+        self.n_iter = 0  # 마지막 호출의 Lloyd 반복 횟수
+
+    def fit_predict(self, population, k):
+        """
+        population을 최대 k개의 niche로 나눕니다.
+
+        Args:
+            population (np.ndarray): 개체 배열 (n, d)
+            k (int): 클러스터 개수
+
+        Returns:
+            cluster_labels (np.ndarray): 각 개체의 클러스터 index
+            n_clusters (int): 클러스터 개수 (grid 모드에서는 점유된 칸 수)
+        """
+        population = np.ascontiguousarray(population, dtype='float32')
+        if self.mode == 'grid':
+            return self._grid_labels(population, k)
+        return self._kmeans_labels(population, k)
+
+    def _grid_labels(self, population, k):
+        n, d = population.shape
+        lower, upper = population.min(axis=0), population.max(axis=0)
+        span = np.where(upper > lower, upper - lower, 1.0)
+
+        # 칸 수가 k 이상이 되도록 축별 구간 수 결정
+        bins = max(1, int(np.ceil(k ** (1.0 / d))))
+        cells = np.minimum(((population - lower) / span * bins).astype(np.int64), bins - 1)
+
+        _, cluster_labels = np.unique(cells, axis=0, return_inverse=True)
+        cluster_labels = cluster_labels.reshape(-1)
+        return cluster_labels, int(cluster_labels.max()) + 1
+
+    def _initial_centroids(self, population, k):
+        n = len(population)
+        if self.centroids is not None and self.centroids.shape[1] == population.shape[1]:
+            centroids = self.centroids[:k]
+            if len(centroids) < k:
+                extra = population[self.rng.choice(n, k - len(centroids), replace=False)]
+                centroids = np.concatenate([centroids, extra], axis=0)
+            return centroids.copy(), self.warm_max_iter
+        return population[self.rng.choice(n, k, replace=False)].copy(), self.max_iter
+
+    def _kmeans_labels(self, population, k):
+        n, d = population.shape
+        k = min(k, n)
+        centroids, max_iter = self._initial_centroids(population, k)
+
+        # centroid당 학습 개체 수 제한
+        train = population
+        if n > k * self.max_points_per_centroid:
+            train = population[self.rng.choice(n, k * self.max_points_per_centroid, replace=False)]
+
+        index = faiss.IndexFlatL2(d)
+        labels = None
+        self.n_iter = 0
+        for _ in range(max_iter):
+            index.reset()
+            index.add(centroids)
+            new_labels = index.search(train, 1)[1].reshape(-1)
+            self.n_iter += 1
+
+            counts = np.bincount(new_labels, minlength=k)
+            sums = np.stack([np.bincount(new_labels, weights=train[:, j], minlength=k) for j in range(d)], axis=1)
+            non_empty = counts > 0
+            centroids[non_empty] = (sums[non_empty] / counts[non_empty, None]).astype('float32')
+
+            # 빈 클러스터는 임의의 개체로 다시 초기화
+            n_empty = int((~non_empty).sum())
+            if n_empty:
+                centroids[~non_empty] = train[self.rng.choice(len(train), n_empty, replace=len(train) < n_empty)]
+
+            # 할당이 안정되면 종료
+            if labels is not None and np.mean(labels != new_labels) <= self.tol and not n_empty:
+                break
+            labels = new_labels
+
+        self.centroids = centroids
+        index.reset()
+        index.add(centroids)
+        cluster_labels = index.search(population, 1)[1].reshape(-1)
+        return cluster_labels, k
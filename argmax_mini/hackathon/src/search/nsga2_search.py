@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+from hackathon.src.search.ga_function import lexicographic_order
+from hackathon.src.search.fitness_kernel import lexicographic_fitness, round_columns
+from hackathon.src.search.search_engine import SearchEngine
+
+
+def dominance_matrix(F, block_size=512):
+    """
+    개체 간 지배 관계 행렬을 계산합니다. (모든 목적을 최대화로 가정)
+
+    dominates[i, j] = F[i]가 모든 목적에서 F[j] 이상이고 하나 이상에서 더 큼
+    (n, n, n_objectives) 비교 배열이 너무 커지지 않도록 block_size 행씩 나누어 계산합니다.
+
+    Args:
+        F (np.ndarray): 최대화 기준 fitness 행렬 (n, n_objectives)
+        block_size (int): 한 번에 비교할 행 수
+
+    Returns:
+        np.ndarray: bool 지배 행렬 (n, n)
+    """
+    n = len(F)
+    dominates = np.empty((n, n), dtype=bool)
+    for start in range(0, n, block_size):
+        block = F[start:start + block_size, None, :]
+        dominates[start:start + block_size] = (block >= F[None]).all(axis=2) & (block > F[None]).any(axis=2)
+    return dominates
+
+
+def fast_non_dominated_sort(F):
+    """
+    NSGA-II fast non-dominated sort의 행렬 버전
+
+    Args:
+        F (np.ndarray): 최대화 기준 fitness 행렬 (n, n_objectives)
+
+    Returns:
+        np.ndarray: 개체별 front 순위 (0이 Pareto front)
+    """
+    dominates = dominance_matrix(F)
+    # 각 개체를 지배하는 개체 수
+    n_dominated_by = dominates.sum(axis=0)
+
+    ranks = np.full(len(F), -1, dtype=np.int64)
+    front = np.flatnonzero(n_dominated_by == 0)
+    rank = 0
+    while len(front):
+        ranks[front] = rank
+        n_dominated_by = n_dominated_by - dominates[front].sum(axis=0)
+        n_dominated_by[ranks >= 0] = -1
+        front = np.flatnonzero(n_dominated_by == 0)
+        rank += 1
+    return ranks
+
+
+def crowding_distance(F, ranks):
+    """
+    front별 crowding distance를 계산합니다. (경계 개체는 inf)
+
+    Args:
+        F (np.ndarray): fitness 행렬 (n, n_objectives)
+        ranks (np.ndarray): fast_non_dominated_sort의 front 순위
+
+    Returns:
+        np.ndarray: 개체별 crowding distance
+    """
+    n, m = F.shape
+    distance = np.zeros(n)
+    for rank in np.unique(ranks):
+        members = np.flatnonzero(ranks == rank)
+        if len(members) <= 2:
+            distance[members] = np.inf
+            continue
+        front = F[members]
+        order = np.argsort(front, axis=0, kind='stable')
+        sorted_front = np.take_along_axis(front, order, axis=0)
+        span = sorted_front[-1] - sorted_front[0]
+        span = np.where(span > 0, span, 1.0)
+
+        # 양 옆 개체와의 목적별 거리 합
+        gaps = np.zeros_like(front)
+        gaps[1:-1] = (sorted_front[2:] - sorted_front[:-2]) / span
+        gaps[0] = gaps[-1] = np.inf
+        member_distance = np.zeros(len(members))
+        for j in range(m):
+            member_distance[order[:, j]] += gaps[:, j]
+        distance[members] = member_distance
+    return distance
+
+
+def nsga2_order(F, weights):
+    """
+    front 순위 오름차순, 같은 front에서는 crowding distance 내림차순으로 정렬한 index
+
+    Args:
+        F (np.ndarray): fitness 행렬 (n, n_objectives)
+        weights (tuple): 목적별 가중치 (1.0: 최대화, -1.0: 최소화)
+
+    Returns:
+        np.ndarray: 정렬된 index
+    """
+    F = np.asarray(F, dtype=np.float64) * np.asarray(weights, dtype=np.float64)
+    ranks = fast_non_dominated_sort(F)
+    distance = crowding_distance(F, ranks)
+    return np.lexsort((-distance, ranks))
+
+
+def pareto_front(F, weights):
+    """Pareto front(순위 0) 개체 index"""
+    F = np.asarray(F, dtype=np.float64) * np.asarray(weights, dtype=np.float64)
+    return np.flatnonzero(~dominance_matrix(F).any(axis=0))
+
+
+class NSGA2SearchEngine(SearchEngine):
+    """
+    SearchEngine의 k-means niching + lexicographic 선택 대신 NSGA-II 선택을 사용하는 탐색기
+
+    타겟 오차와 제어 변수별 최대화/최소화 목적을 반올림 없이 다목적으로 다루고,
+    행별 Pareto set을 반환합니다. 대표 해는 Pareto front에 lexicographic 순위를 적용해 고릅니다.
+    개체군은 ArrayPopulation 배열 엔진을 사용합니다.
+    """
+
+    def __init__(self, model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                 importance, bounds, scalers, engine='array', niching=None, cache_size=100000, borders=None,
+                 prescreen=None):
+        super().__init__(model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                         importance, bounds, scalers, engine='array', niching=niching, cache_size=cache_size,
+                         borders=borders, prescreen=prescreen)
+
+    def _fitness(self, population, y_pred, user_request_target):
+        """반올림하지 않은 다목적 fitness 행렬"""
+        return lexicographic_fitness(y_pred, population, user_request_target,
+                                     self.sorted_pop_idx_by_importance, None)
+
+    def _make_clusterer(self):
+        return None
+
+    def _select(self, population, clusterer):
+        # 부모 + 자손(2배)에서 front 순위와 crowding distance로 절반 선택
+        order = nsga2_order(population.F, self.weights)
+        return population.take(order[:len(population)//2])
+
+    def _lexicographic_best(self, population):
+        """Pareto front에 반올림 lexicographic 순위를 적용한 대표 개체 index와 반올림 fitness"""
+        front = pareto_front(population.F, self.weights)
+        rounded = round_columns(population.F[front].copy(), self.rounding_digits)
+        best = lexicographic_order(rounded, self.weights)[0]
+        return front[best], rounded[best]
+
+    def _best_of(self, population):
+        best, rounded_fitness = self._lexicographic_best(population)
+        return population.X[best], rounded_fitness, population.X
+
+    def _row_extra(self, population):
+        """행별 Pareto set (제어 변수 값과 목적별 fitness)"""
+        front = pareto_front(population.F, self.weights)
+        X, F = population.X[front], population.F[front]
+        pareto_set = {}
+        for i, control_var in enumerate(self.control_var_names):
+            pareto_set[f"pred_x_{control_var}"] = X[:, i].astype(int) if self.is_norminal[i] else X[:, i]
+        for j in range(F.shape[1]):
+            pareto_set[f"fitness_{j}"] = F[:, j]
+        # 중복 개체 제거 후 lexicographic 순서로 정렬
+        pareto_set = pd.DataFrame(pareto_set).drop_duplicates()
+        fitness = pareto_set.filter(like='fitness_').to_numpy(dtype=np.float64, copy=True)
+        rounded = round_columns(fitness, self.rounding_digits)
+        return pareto_set.iloc[lexicographic_order(rounded, self.weights)].reset_index(drop=True)
+
+    def _attach_row_extras(self, df, extras):
+        df["n_pareto"] = [len(pareto_set) for pareto_set in extras]
+        df.attrs["pareto_sets"] = extras
+        return df
+
+
+def nsga2_search_deploy(model, pred_func, X_train, X_test, y_test,\
+                        all_var_names, control_var_names, optmize_dict, importance,\
+                        bounds, scalers, user_request_target, batched=False, engine='array', niching=None,\
+                        max_gen=None, patience=20, tol=0.0, min_gen=20, cache_size=100000,\
+                        pop_size=None, deadline=None, n_jobs=1, seed=None, borders=None, prescreen=None):
+    """
+    NSGA-II 기반 다목적 탐색 (인자는 k_means_search_deploy와 동일, engine/niching은 사용하지 않음)
+
+    # return : k_means_search_deploy의 결과 열 + 행별 Pareto set 크기(n_pareto)
+    #          df.attrs['pareto_sets'] : 행별 Pareto set DataFrame 리스트 (lexicographic 순서)
+    """
+    with NSGA2SearchEngine(model, pred_func, X_train, y_test, all_var_names, control_var_names,
+                           optmize_dict, importance, bounds, scalers, cache_size=cache_size,
+                           borders=borders, prescreen=prescreen) as search_engine:
+        return search_engine.search(user_request_target, X_test, batched=batched, max_gen=max_gen,
+                                    pop_size=pop_size, patience=patience, tol=tol, min_gen=min_gen,
+                                    deadline=deadline, n_jobs=n_jobs, seed=seed)
@@ -0,0 +1,130 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# worker 프로세스마다 한 번 만들어 모든 작업에서 재사용하는 상태 (모델, SearchEngine 등)
+_WORKER_STATE = {}
+
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+
+def worker_threads(n_jobs):
+    """process pool이 코어를 초과해 사용하지 않도록 worker당 thread 수 계산"""
+    return max(1, (os.cpu_count() or 1) // max(n_jobs, 1))
+
+
+def limit_threads(n_threads):
+    """
+    현재 프로세스의 BLAS/OpenMP thread 수를 제한합니다.
+
+    Args:
+        n_threads (int): 사용할 thread 수
+    """
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(n_threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(n_threads)
+    except ImportError:
+        pass
+    try:
+        import faiss
+        faiss.omp_set_num_threads(n_threads)
+    except (ImportError, AttributeError):
+        pass
+    try:
+        import torch
+        torch.set_num_threads(n_threads)
+    except ImportError:
+        pass
+    try:
+        from hackathon.src.surrogate.catboost_hpo import set_predict_thread_count
+        set_predict_thread_count(n_threads)
+    except ImportError:
+        pass
+
+
+def row_seeds(seed, n_rows):
+    """seed로부터 행별 독립 seed 생성 (seed가 None이면 행별 seed를 고정하지 않음)"""
+    if seed is None:
+        return [None] * n_rows
+    return [int(s) for s in np.random.SeedSequence(seed).generate_state(n_rows)]
+
+
+def seed_row(seed):
+    """행 탐색 시작 전에 전역 난수 상태를 행별 seed로 고정 (serial/parallel 결과를 같게 함)"""
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+
+def _init_worker(n_threads, state_factory, state_args):
+    limit_threads(n_threads)
+    _WORKER_STATE['state'] = state_factory(*state_args)
+
+
+def _run_task(task):
+    row_func, row_args = task
+    return row_func(_WORKER_STATE['state'], *row_args)
+
+
+class RowPool:
+    """
+    행별 탐색에 재사용하는 process pool
+
+    worker마다 state_factory(*state_args)를 한 번만 호출해 모델 등을 준비하고, 같은 pool로 여러 번
+    map을 호출하면 worker와 worker 상태를 그대로 재사용합니다 (요청마다 모델을 다시 보내거나 만들지 않음).
+    close()를 호출하거나 with 블록을 벗어나면 worker를 종료합니다.
+
+    Args:
+        n_jobs (int): worker 프로세스 수
+        state_factory (callable): worker 상태 생성 함수 (pickle 가능해야 함)
+        state_args (tuple): state_factory 인자
+    """
+
+    def __init__(self, n_jobs, state_factory, state_args):
+        self.n_jobs = max(1, n_jobs)
+        self._executor = ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                             initargs=(worker_threads(self.n_jobs), state_factory, state_args))
+
+    def map(self, row_func, row_args_list):
+        """
+        각 작업을 row_func(state, *row_args)로 실행합니다.
+
+        Args:
+            row_func (callable): 모듈 수준 행 탐색 함수
+            row_args_list (list): 행별 row_func 인자 tuple 리스트
+
+        Returns:
+            list: 입력 순서대로 정렬된 행별 결과
+        """
+        return list(self._executor.map(_run_task, [(row_func, row_args) for row_args in row_args_list]))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def run_rows_parallel(n_jobs, state_factory, state_args, row_func, row_args_list):
+    """
+    행별 탐색을 한 번만 쓰는 process pool로 나누어 수행합니다. (반복 호출하면 RowPool을 재사용)
+
+    Args:
+        n_jobs (int): worker 프로세스 수
+        state_factory (callable): worker 상태 생성 함수 (pickle 가능해야 함)
+        state_args (tuple): state_factory 인자
+        row_func (callable): 모듈 수준 행 탐색 함수
+        row_args_list (list): 행별 row_func 인자 tuple 리스트
+
+    Returns:
+        list: 입력 순서대로 정렬된 행별 결과
+    """
+    with RowPool(min(n_jobs, len(row_args_list)), state_factory, state_args) as pool:
+        return pool.map(row_func, row_args_list)
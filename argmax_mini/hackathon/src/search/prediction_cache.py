@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    양자화된 제어 변수 벡터를 key로 surrogate 예측값을 저장하는 LRU 캐시
+
+    tree 기반 surrogate는 구간별 상수 함수이므로, 반올림 정밀도 이하로만 다른 개체는
+    같은 예측값을 재사용해도 결과가 달라지지 않습니다.
+
+    Args:
+        rounding_digits (array-like): 제어 변수별 양자화 소수점 자리수
+        max_size (int): 캐시에 보관할 최대 개체 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+    """
+
+    def __init__(self, rounding_digits, max_size=100000):
+        self.scale = 10.0 ** np.asarray(rounding_digits, dtype=np.float64)
+        self.max_size = max_size
+        self._store = OrderedDict()
+
+        self.lookups = 0  # 조회한 개체 수
+        self.hits = 0  # 캐시에서 찾은 개체 수
+        self.evaluations = 0  # 실제 surrogate로 예측한 개체 수
+
+    def __len__(self):
+        return len(self._store)
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def make_keys(self, controls):
+        """
+        제어 변수 행렬을 양자화한 뒤 행 단위 bytes key로 일괄 변환
+
+        양자화 값은 float64 그대로 key로 사용합니다. int64로 변환하면 |x| * 10**digits가
+        2**63을 넘는 열(예: 자리수 10인 border 구간 열의 큰 값)에서 서로 다른 값이 같은 key가 됩니다.
+        """
+        # + 0.0으로 -0.0을 0.0으로 맞춰 같은 값이 같은 bytes가 되도록 함
+        quantized = np.ascontiguousarray(np.round(np.asarray(controls, dtype=np.float64) * self.scale) + 0.0)
+        return quantized.view(np.dtype((np.void, quantized.shape[1] * 8))).ravel().tolist()
+
+    def lookup(self, controls):
+        """
+        캐시를 조회합니다.
+
+        Args:
+            controls (np.ndarray): 제어 변수 행렬 (n, n_control)
+
+        Returns:
+            keys (list): 개체별 key
+            values (list): 개체별 캐시 예측값 (miss이면 None)
+            misses (dict): 중복 제거된 miss key -> 해당 개체 index 리스트
+        """
+        keys = self.make_keys(controls)
+        values = []
+        misses = {}
+        for i, key in enumerate(keys):
+            value = self._store.get(key)
+            if value is None:
+                misses.setdefault(key, []).append(i)
+            else:
+                self._store.move_to_end(key)
+            values.append(value)
+
+        self.lookups += len(keys)
+        self.hits += len(keys) - sum(len(idx) for idx in misses.values())
+        return keys, values, misses
+
+    def store(self, keys, predictions):
+        """예측값을 저장하고 용량을 초과하면 오래된 항목을 제거"""
+        for key, prediction in zip(keys, predictions):
+            self._store[key] = prediction
+            self._store.move_to_end(key)
+        self.evaluations += len(keys)
+        while len(self._store) > self.max_size:
+            self._store.popitem(last=False)
@@ -0,0 +1,179 @@
+import numpy as np
+
+from hackathon.src.search.ga_function import lexicographic_order
+
+
+def average_ranks(x):
+    """동순위에는 평균 순위를 주는 0부터 시작하는 순위"""
+    x = np.asarray(x)
+    order = np.argsort(x, kind='stable')
+    sorted_x = x[order]
+    is_start = np.r_[True, sorted_x[1:] != sorted_x[:-1]]
+    starts = np.flatnonzero(is_start)
+    ends = np.r_[starts[1:], len(x)]
+    ranks = np.empty(len(x))
+    ranks[order] = ((starts + ends - 1) / 2)[np.cumsum(is_start) - 1]
+    return ranks
+
+
+def rank_correlation(a, b):
+    """Spearman 순위 상관계수 (동순위는 평균 순위, 한쪽 값이 모두 같으면 0)"""
+    rank_a = average_ranks(a)
+    rank_b = average_ranks(b)
+    rank_a -= rank_a.mean()
+    rank_b -= rank_b.mean()
+    denom = np.sqrt((rank_a ** 2).sum() * (rank_b ** 2).sum())
+    return float((rank_a * rank_b).sum() / denom) if denom > 0 else 0.0
+
+
+class RandomFeatureRidge:
+    """
+    [1, x, cos(xW + b)] random Fourier feature 위의 ridge 회귀 (RBF kernel ridge 근사)
+
+    입력은 제어 변수 범위로 [0, 1] 정규화하고, 출력은 표준화한 뒤 닫힌 형태로 학습합니다.
+
+    Args:
+        x_min, x_max (np.ndarray): 제어 변수 범위
+        n_features (int): random feature 수
+        length_scale (float): 정규화 좌표에서의 RBF 길이 척도
+        alpha (float): ridge 정규화 계수
+        seed (int): random feature seed
+    """
+
+    def __init__(self, x_min, x_max, n_features=128, length_scale=0.25, alpha=1e-3, seed=0):
+        rng = np.random.default_rng(seed)
+        self.x_min = np.asarray(x_min, dtype=np.float64)
+        self.span = np.where(np.asarray(x_max) > self.x_min, np.asarray(x_max) - self.x_min, 1.0)
+        self.W = rng.normal(scale=1.0 / length_scale, size=(len(self.x_min), n_features))
+        self.b = rng.uniform(0, 2 * np.pi, size=n_features)
+        self.alpha = alpha
+        self.coef = None
+
+    def _features(self, X):
+        Z = (np.asarray(X, dtype=np.float64) - self.x_min) / self.span
+        rff = np.sqrt(2.0 / self.W.shape[1]) * np.cos(Z @ self.W + self.b)
+        return np.hstack([np.ones((len(Z), 1)), Z, rff])
+
+    def fit(self, X, y):
+        y = np.asarray(y, dtype=np.float64).reshape(len(X), -1)
+        self.y_mean, self.y_std = y.mean(axis=0), np.where(y.std(axis=0) > 0, y.std(axis=0), 1.0)
+        Phi = self._features(X)
+        gram = Phi.T @ Phi
+        gram[np.diag_indices_from(gram)] += self.alpha * len(Phi)
+        self.coef = np.linalg.solve(gram, Phi.T @ ((y - self.y_mean) / self.y_std))
+        return self
+
+    def predict(self, X):
+        return self._features(X) @ self.coef * self.y_std + self.y_mean
+
+
+class PreScreener:
+    """
+    행(row) 단위로 GA 자손을 값싼 모델로 먼저 걸러 surrogate 예측 수를 줄이는 클래스
+
+    실제 surrogate로 평가한 개체(제어 변수, 예측값)를 archive에 쌓아 RandomFeatureRidge를 학습하고,
+    새 자손을 값싼 모델 예측값의 fitness로 순위를 매겨 상위 fraction만 surrogate로 보냅니다.
+    나머지 중 explore 비율만큼은 무작위로 함께 보내, 값싼 모델 순위와 실제 순위의
+    Spearman 상관을 치우침 없이 측정합니다. fraction은 1 - (상관의 지수이동평균)으로 조정되어
+    값싼 모델이 잘 맞출수록 surrogate로 보내는 개체가 줄어듭니다.
+
+    Args:
+        fitness_fn (callable): (제어 변수 행렬, 예측값, 목표값) -> fitness 행렬
+        weights (tuple): 목적별 가중치
+        user_request_target (np.ndarray): 사용자 요청 타겟 값 (실제/값싼 순위 비교에 사용)
+        x_min, x_max (np.ndarray): 제어 변수 범위
+        min_archive (int): 이 개수 이상 평가된 뒤부터 걸러냄
+        archive_size (int): archive에 보관할 최근 개체 수
+        min_fraction, max_fraction (float): surrogate로 보낼 비율 범위
+        explore (float): 걸러진 개체 중 무작위로 함께 평가할 비율
+        smoothing (float): 순위 상관 지수이동평균 계수
+        n_features, length_scale, alpha: RandomFeatureRidge 설정
+        seed (int): random feature seed
+    """
+
+    def __init__(self, fitness_fn, weights, user_request_target, x_min, x_max, min_archive=200,
+                 archive_size=4000, min_fraction=0.2, max_fraction=1.0, explore=0.05, smoothing=0.3,
+                 n_features=128, length_scale=0.25, alpha=1e-3, seed=0):
+        self.fitness_fn = fitness_fn
+        self.weights = weights
+        self.target = np.asarray(user_request_target, dtype=np.float64).reshape(1, -1)
+        self.model = RandomFeatureRidge(x_min, x_max, n_features, length_scale, alpha, seed)
+        self.min_archive = min_archive
+        self.archive_size = archive_size
+        self.min_fraction, self.max_fraction = min_fraction, max_fraction
+        self.explore = explore
+        self.smoothing = smoothing
+
+        self.archive_X, self.archive_y = [], []
+        self.n_archive = 0
+        self.fitted = False
+        self.quality = 0.0  # 순위 상관 지수이동평균
+        self.fraction = max_fraction
+        self.screened = 0  # 걸러낸 대상 개체 수
+        self.skipped = 0  # surrogate 평가를 생략한 개체 수
+
+    def _error(self, y):
+        """타겟 오차 제곱합 (순위 비교용, 작을수록 좋음)"""
+        y = np.asarray(y, dtype=np.float64).reshape(len(y), -1)
+        return ((y - self.target) ** 2).sum(axis=1)
+
+    def screen(self, controls):
+        """
+        surrogate로 평가할 자손을 고릅니다.
+
+        Args:
+            controls (np.ndarray): 미평가 자손 제어 변수 행렬 (n, n_control)
+
+        Returns:
+            np.ndarray: 평가할 개체 mask (n,)
+        """
+        n = len(controls)
+        keep = np.ones(n, dtype=bool)
+        if not self.fitted or n == 0 or self.fraction >= 1.0:
+            return keep
+
+        fitness = self.fitness_fn(controls, self.model.predict(controls), self.target)
+        order = lexicographic_order(fitness, self.weights)
+        n_keep = int(np.ceil(self.fraction * n))
+        keep[order[n_keep:]] = False
+
+        rejected = np.flatnonzero(~keep)
+        n_explore = min(len(rejected), int(np.ceil(self.explore * n)))
+        if n_explore:
+            keep[np.random.choice(rejected, n_explore, replace=False)] = True
+        self.screened += n
+        self.skipped += int((~keep).sum())
+        return keep
+
+    def observe(self, controls, y_pred):
+        """
+        surrogate로 평가한 개체를 archive에 추가하고, 값싼 모델 순위 정확도로 fraction을 갱신한 뒤 다시 학습
+
+        Args:
+            controls (np.ndarray): 평가한 제어 변수 행렬 (n, n_control)
+            y_pred (np.ndarray): surrogate 예측값 (n, n_targets)
+        """
+        controls = np.asarray(controls, dtype=np.float64)
+        y_pred = np.asarray(y_pred, dtype=np.float64).reshape(len(controls), -1)
+        if not len(controls):
+            return
+        if self.fitted and len(controls) >= 5:
+            rho = rank_correlation(self._error(self.model.predict(controls)), self._error(y_pred))
+            self.quality = (1 - self.smoothing) * self.quality + self.smoothing * rho
+            self.fraction = float(np.clip(1.0 - self.quality, self.min_fraction, self.max_fraction))
+
+        self.archive_X.append(controls)
+        self.archive_y.append(y_pred)
+        self.n_archive += len(controls)
+        while self.n_archive - len(self.archive_X[0]) >= self.archive_size:
+            self.n_archive -= len(self.archive_X.pop(0))
+            self.archive_y.pop(0)
+        if self.n_archive >= self.min_archive:
+            self.model.fit(np.concatenate(self.archive_X)[-self.archive_size:],
+                           np.concatenate(self.archive_y)[-self.archive_size:])
+            self.fitted = True
+
+    @property
+    def skip_rate(self):
+        """걸러낸 대상 중 surrogate 평가를 생략한 비율"""
+        return self.skipped / self.screened if self.screened else 0.0
@@ -0,0 +1,80 @@
+import time
+
+# 응답 시간 preset: 제한 시간(초)과 GA 규모
+SEARCH_PRESETS = {
+    'fast': {'deadline': 30.0, 'max_gen': 30, 'pop_size': 300},
+    'balanced': {'deadline': 120.0, 'max_gen': 100, 'pop_size': 1000},
+    'thorough': {'deadline': 600.0, 'max_gen': 300, 'pop_size': 2000},
+}
+
+
+class SearchBudget:
+    """
+    search 함수의 wall-clock 제한 시간을 관리하는 클래스
+
+    search 함수는 세대(반복)마다 expired()를 확인하고, 시간이 다 되면 그때까지의 최적 결과를 반환합니다.
+    제한 시간 때문에 중단된 적이 있으면 exhausted가 True가 됩니다.
+
+    Args:
+        seconds (float, optional): 제한 시간(초). None이면 제한 없음
+        preset (str, optional): 사용한 preset 이름
+    """
+
+    def __init__(self, seconds=None, preset=None):
+        self.seconds = seconds
+        self.preset = preset
+        self.start = time.perf_counter()
+        self.exhausted = False
+        self._parent = None
+
+    @classmethod
+    def resolve(cls, deadline):
+        """
+        deadline 인자를 SearchBudget으로 변환합니다.
+
+        Args:
+            deadline (float | str | SearchBudget | None): 제한 시간(초), preset 이름('fast', 'balanced', 'thorough')
+                또는 SearchBudget 객체
+
+        Returns:
+            SearchBudget
+        """
+        if isinstance(deadline, SearchBudget):
+            return deadline
+        if isinstance(deadline, str):
+            if deadline not in SEARCH_PRESETS:
+                raise ValueError(f"지원되지 않는 search preset입니다: {deadline}")
+            return cls(SEARCH_PRESETS[deadline]['deadline'], preset=deadline)
+        return cls(None if deadline is None else float(deadline))
+
+    def settings(self, **defaults):
+        """preset이 있으면 preset의 GA 규모(max_gen, pop_size 등)로 defaults를 덮어씀"""
+        if self.preset is None:
+            return defaults
+        preset = SEARCH_PRESETS[self.preset]
+        return {key: preset.get(key, value) for key, value in defaults.items()}
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def remaining(self):
+        if self.seconds is None:
+            return float('inf')
+        return self.seconds - self.elapsed()
+
+    def expired(self):
+        """제한 시간이 지났는지 확인하고, 지났으면 exhausted로 표시"""
+        if self.remaining() > 0:
+            return False
+        budget = self
+        while budget is not None:
+            budget.exhausted = True
+            budget = budget._parent
+        return True
+
+    def split(self, n_parts):
+        """남은 시간을 n_parts로 나눈 하위 budget 생성 (행을 순차 탐색할 때 사용)"""
+        seconds = None if self.seconds is None else max(self.remaining(), 0.0) / max(n_parts, 1)
+        child = SearchBudget(seconds, preset=self.preset)
+        child._parent = self
+        return child
@@ -0,0 +1,540 @@
+import copy
+import logging
+
+from deap import base, creator, tools
+import numpy as np
+
+from tqdm import tqdm
+import pandas as pd
+from hackathon.src.search.ga_function import mutGaussian_mutUniformInt\
+                                            ,cx_simulated_binary_w_cx_uniform\
+                                            ,var_and_matrix\
+                                            ,k_means_selection\
+                                            ,lexicographic_selection
+from hackathon.src.search.ga_array_engine import init_array_population\
+                                               ,var_and_array\
+                                               ,clip_array_population\
+                                               ,k_means_selection_array\
+                                               ,lexicographic_selection_array
+from hackathon.src.search.niching import NicheClusterer
+from hackathon.src.search.convergence import ConvergenceTracker
+from hackathon.src.search.prediction_cache import PredictionCache
+from hackathon.src.search.search_budget import SearchBudget
+from hackathon.src.search.parallel import row_seeds, seed_row, RowPool
+from hackathon.src.search.fitness_kernel import EvaluationKernel, lexicographic_fitness, std_rounding_digits
+from hackathon.src.search.catboost_space import BorderSearchSpace
+from hackathon.src.search.prescreen import PreScreener
+
+
+def get_deap_classes(weights):
+    """
+    weights별 DEAP Fitness/Individual 클래스를 한 번만 생성해 재사용
+
+    creator.create를 매 요청마다 호출하면 전역 registry의 클래스를 덮어쓰며 경고가 발생하므로
+    weights 부호로 클래스 이름을 만들어 이미 있으면 그대로 사용합니다.
+
+    Args:
+        weights (tuple): 목적별 가중치 (1.0: 최대화, -1.0: 최소화)
+
+    Returns:
+        fitness_class, individual_class
+    """
+    suffix = ''.join('p' if w > 0 else 'm' for w in weights)
+    fitness_name, individual_name = f'FitnessLex_{suffix}', f'IndividualLex_{suffix}'
+    if not hasattr(creator, fitness_name):
+        creator.create(fitness_name, base.Fitness, weights=tuple(weights))
+    if not hasattr(creator, individual_name):
+        creator.create(individual_name, np.ndarray, fitness=getattr(creator, fitness_name))
+    return getattr(creator, fitness_name), getattr(creator, individual_name)
+
+
+class SearchEngine:
+    """
+    (flow, surrogate, 제어 변수 설정) 단위로 한 번 만들어 여러 요청에 재사용하는 k-means niching GA 탐색기
+
+    생성 시 제어 변수 index, 범주형 mask, 경계, 반올림 자리수, fitness 가중치, DEAP toolbox 등
+    요청과 무관한 설정을 미리 계산해 두고, search()는 요청별 목표값과 탐색 행만 받아 탐색합니다.
+
+    Args:
+        model: surrogate 모델
+        pred_func: surrogate 예측 함수 pred_func(model=..., X_test=...)
+        X_train (np.ndarray): 학습 X (변수 범위와 반올림 자리수 계산에 사용)
+        y_train (np.ndarray): 학습 y (타겟 fitness 반올림 자리수 계산에 사용)
+        all_var_names (list): target 변수 제외 모든 변수 이름 [numpy X와 같은 순서]
+        control_var_names (list): control 변수 이름
+        optmize_dict (dict): 변수별 'minimize' / 'maximize'
+        importance (dict): 변수별 중요도 순서 (1 부터 중복 없이 ranking)
+        bounds (dict): 제어 변수별 (최솟값, 최댓값), 비어 있으면 X_train 범위 사용
+        scalers (dict): 변수별 scaler (LabelEncoder이면 범주형 변수)
+        engine (str): 'deap' (creator.Individual 리스트) | 'array' (ArrayPopulation 배열 엔진)
+        niching (str): 'faiss' (매 세대 새 faiss.Kmeans) | 'kmeans' (warm start k-means) | 'grid' (격자 niche)
+        cache_size (int): 행별 예측 캐시 최대 크기 (0/None이면 미사용)
+        borders (dict, optional): CatBoost split border (catboost_split_borders 결과),
+            지정하면 연속형 제어 변수를 border 구간 대표값 위에서만 탐색
+        prescreen (bool | dict, optional): 지정하면 자손을 값싼 모델(PreScreener)로 먼저 걸러
+            일부만 surrogate로 평가 (dict이면 PreScreener 설정)
+    """
+
+    INDPB = 0.2 # 변수별 변이 확률
+    CXPB = 0.5 # 교차 확률
+    MUTPB = 0.5 # 돌연변이 확률
+    ETA_CX = 2.0
+
+    def __init__(self, model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                 importance, bounds, scalers, engine='deap', niching='kmeans', cache_size=100000, borders=None,
+                 prescreen=None):
+        # process pool worker에서 같은 SearchEngine을 다시 만들 때 사용하는 생성 인자
+        self._config = (model, pred_func, X_train, y_train, all_var_names, control_var_names, optmize_dict,
+                        importance, bounds, scalers, engine, niching, cache_size, borders, prescreen)
+        self.model = model
+        self.pred_func = pred_func
+        self.engine = engine
+        self.niching = niching
+        self.cache_size = cache_size
+        self.prescreen = {} if prescreen is True else (prescreen or None)
+        self.control_var_names = list(control_var_names)
+        self.n_requests = 0  # 처리한 요청 수
+        self._pool = None  # n_jobs > 1 탐색에 재사용하는 RowPool (worker마다 SearchEngine을 한 번만 생성)
+
+        self.is_norminal = [False]*len(control_var_names)
+        for i, key in enumerate(control_var_names):
+            if type(scalers[key]).__name__ == 'LabelEncoder':
+                self.is_norminal[i] = True
+        logging.debug(f"is_norminal: {self.is_norminal}")
+        self.nominal_mask = np.array(self.is_norminal, dtype=bool)
+
+        # 제어 변수 인덱스 결정 및 중요도 순 정렬
+        control_set = set(control_var_names)
+        self.control_index = [i for i, v in enumerate(all_var_names) if v in control_set] # var 중에 control
+
+        # pop idx : control variable만 0부터 재정렬한 idx
+        control_index_to_pop_idx = {v: i for i, v in enumerate(self.control_index)}
+
+        # control중 importance 순서
+        sorted_control_index_by_importance = sorted([i for i in self.control_index if all_var_names[i] in importance.keys()], key=lambda x: importance[all_var_names[x]])
+        # poppulation 열 index를 중요도 순서로 정렬
+        self.sorted_pop_idx_by_importance = [control_index_to_pop_idx[i] for i in sorted_control_index_by_importance]
+        # optimize를 importance 순서로 정렬
+        sorted_optimize_dict_by_importance = {all_var_names[k]: optmize_dict[all_var_names[k]] for k in sorted_control_index_by_importance}
+
+        # population 변수 인덱스와 optimize 매핑
+        self.pop_index_to_optimize = {control_index_to_pop_idx[i]: optmize_dict[all_var_names[i]] for i in sorted_control_index_by_importance}
+        logging.debug(f"pop_index_to_optimize: {self.pop_index_to_optimize}")
+
+        # 데이터셋 통계 기반 반올림 자리수 (타겟 자리수는 search의 y_rows로 요청마다 다시 계산 가능)
+        digits_x = std_rounding_digits(X_train)
+        self.rounding_digits_objective = digits_x[sorted_control_index_by_importance]
+        self.default_rounding_digits = self._rounding_digits(y_train)
+        self.rounding_digits = self.default_rounding_digits
+
+        # 예측 캐시 key 양자화에 사용할 제어 변수별 자리수 (population 열 순서)
+        self.rounding_digits_control = digits_x[self.control_index]
+
+        if bounds:
+            self.x_min = np.array([value[0] for key, value in bounds.items()]).reshape(-1)
+            self.x_max = np.array([value[1] for key, value in bounds.items()]).reshape(-1)
+        else:
+            self.x_min,self.x_max = np.min(X_train, axis=0)[self.control_index], np.max(X_train, axis=0)[self.control_index]
+        logging.debug(f"x_min: {self.x_min}")
+        logging.debug(f"x_max: {self.x_max}")
+
+        n_targets = y_train.shape[-1] if np.ndim(y_train) > 1 else 1
+        self.weights = (1.0,) * n_targets
+        self.weights += tuple(1.0 if opt == 'maximize' else -1.0 for opt in sorted_optimize_dict_by_importance.values())
+        logging.debug(f"weights: {self.weights}")
+        _, self.individual_class = get_deap_classes(self.weights) # model pred + control optim
+
+        # 돌연변이 파라미터: 연속형은 (0, 범위/6), 범주형은 (최솟값, 최댓값)
+        sigma_list = [(ub - lb)/(6.0) for (lb,ub) in zip(self.x_min, self.x_max)]
+        mu = [0.0]*(len(self.x_min))
+        for i in range(len(self.is_norminal)):
+            if self.is_norminal[i]:
+                mu[i] = self.x_min[i]
+                sigma_list[i] = self.x_max[i]
+        self.mu = np.array(mu)
+        self.sigma_list = np.array(sigma_list)
+
+        # CatBoost border 구간 탐색 공간 (구간 대표값은 서로 정확히 구분되도록 캐시 key 자리수를 늘림)
+        self.search_space = None
+        if borders is not None:
+            self.search_space = BorderSearchSpace(borders, self.control_index, self.x_min, self.x_max,
+                                                  self.is_norminal, self.pop_index_to_optimize)
+            self.rounding_digits_control = np.where(self.search_space.snapped_mask(), 10,
+                                                    self.rounding_digits_control)
+            logging.info(f"border intervals: {self.search_space.n_intervals}")
+
+        self.toolbox = self._build_toolbox()
+
+    def _row_pool(self, n_jobs):
+        """n_jobs개 worker의 RowPool을 반환 (요청 간 재사용, worker 수가 바뀌면 다시 생성)"""
+        if self._pool is None or self._pool.n_jobs != n_jobs:
+            self.close()
+            self._pool = RowPool(n_jobs, type(self), self._config)
+        return self._pool
+
+    def close(self):
+        """재사용하던 process pool worker를 종료"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        return state
+
+    def _rounding_digits(self, y):
+        """타겟 값 y의 표준편차 기반 타겟 자리수 + 제어 변수 자리수 (y가 None이면 생성 시 자리수)"""
+        if y is None:
+            return self.default_rounding_digits
+        return np.concatenate([std_rounding_digits(y), self.rounding_digits_objective], axis=0)
+
+    def _generate_individual(self):
+        """최적화할 변수는 목표 방향의 경계에서 지수 분포로 생성한 개체 하나를 반환"""
+        is_nominal = np.array(self.is_norminal, dtype=bool)
+
+        # 제어 변수의 최소값과 최대값이 너무 가까워서 발생하는 오류를 방지
+        local_x_min = self.x_min.copy()
+        local_x_max = np.maximum(self.x_min + 1, self.x_max)
+
+        # 범주형 변수는 randint, 연속형 변수는 uniform 분포로 생성
+        individual = np.where(
+            is_nominal,
+            np.random.randint(local_x_min, local_x_max + 1, size=len(local_x_min)),
+            np.random.uniform(local_x_min, local_x_max)
+        )
+
+        # (local_x_max - local_x_min) * (5/3)는 값의 분포를 조절하는 역할을 함
+        scale_factor = (local_x_max - local_x_min) * (5 / 3)
+        for i, goal in self.pop_index_to_optimize.items():
+            if i >= len(individual):
+                continue
+            adjustment = np.random.exponential(scale_factor[i])
+            if goal == 'maximize':
+                individual[i] = local_x_max[i] - adjustment
+            else:
+                individual[i] = local_x_min[i] + adjustment
+            individual[i] = np.clip(individual[i], local_x_min[i], local_x_max[i])
+
+        return individual
+
+    def _build_toolbox(self):
+        toolbox = base.Toolbox()
+        toolbox.register('attr_float', self._generate_individual)
+        toolbox.register('individual', tools.initIterate, self.individual_class, toolbox.attr_float)
+        toolbox.register('population', tools.initRepeat, list, toolbox.individual)
+        # 교차 방법
+        toolbox.register('mate', cx_simulated_binary_w_cx_uniform\
+                         , eta=self.ETA_CX, indpb=self.INDPB, is_nominal=self.is_norminal)
+        # 돌연변이 방법
+        toolbox.register('mutate', mutGaussian_mutUniformInt, mu=self.mu, sigma=self.sigma_list,\
+                          indpb=self.INDPB, is_nominal=self.is_norminal)
+        return toolbox
+
+    def _fitness(self, population, y_pred, user_request_target):
+        """surrogate 예측값과 제어 변수 값으로 lexicographic fitness 행렬 생성"""
+        return lexicographic_fitness(y_pred, population, user_request_target,
+                                     self.sorted_pop_idx_by_importance, self.rounding_digits)
+
+    def _evaluate_controls(self, rows, controls, kernel, caches, user_request_target, screeners=None):
+        """
+        여러 행의 제어 변수 행렬을 pred_func 한 번으로 평가
+        캐시가 있으면 양자화된 제어 변수 기준 캐시 miss 개체(중복 제거)만 예측
+
+        Args:
+            rows (list): 평가할 행 index 리스트
+            controls (list): 행별 평가할 제어 변수 행렬 (비어 있을 수 있음)
+            kernel (EvaluationKernel): 행별 입력 버퍼
+            caches (list): 행별 PredictionCache (None이면 캐시 미사용)
+            user_request_target (np.ndarray): 사용자 요청 타겟 값
+            screeners (list, optional): 행별 PreScreener (평가 결과를 archive에 추가)
+
+        Returns:
+            list: 행별 fitness 행렬
+            list: 행별 실제 예측한 개체 수
+        """
+        controls = [np.array(control) for control in controls]
+        lookups, pred_controls = [], []
+        for control, cache in zip(controls, caches):
+            if cache is None or not len(control):
+                lookups.append(None)
+                pred_controls.append(control)
+                continue
+            _, values, misses = cache.lookup(control)
+            lookups.append((values, misses))
+            pred_controls.append(control[[idx[0] for idx in misses.values()]])
+
+        # 재사용 버퍼에 제어 변수 열만 덮어써 입력 생성
+        input_data = kernel.build_inputs(rows, pred_controls)
+        if input_data is not None:
+            y_pred = self.pred_func(model=self.model, X_test=input_data)
+
+        fitness_list = []
+        offset = 0
+        screeners = screeners or [None] * len(controls)
+        for control, pred_control, lookup, cache, screener in zip(controls, pred_controls, lookups, caches,
+                                                                  screeners):
+            if not len(control):
+                fitness_list.append(None)
+                continue
+            row_pred = y_pred[offset:offset+len(pred_control)] if len(pred_control) else []
+            offset += len(pred_control)
+            if lookup is not None:
+                values, misses = lookup
+                row_pred = [prediction.copy() for prediction in row_pred]
+                cache.store(list(misses.keys()), row_pred)
+                for idx, prediction in zip(misses.values(), row_pred):
+                    for i in idx:
+                        values[i] = prediction
+                row_pred = np.array(values)
+            if screener is not None:
+                screener.observe(control, row_pred)
+            fitness_list.append(self._fitness(control, row_pred, user_request_target))
+        return fitness_list, [len(pred_control) for pred_control in pred_controls]
+
+    def _make_clusterer(self):
+        """행마다 세대 간 유지되는 niching 클러스터러 생성 ('faiss'이면 None)"""
+        if self.niching == 'faiss':
+            return None
+        return NicheClusterer(mode=self.niching)
+
+    def _make_screener(self, user_request_target):
+        """행마다 요청 동안 유지되는 PreScreener 생성 (prescreen 미사용이면 None)"""
+        if self.prescreen is None:
+            return None
+        return PreScreener(self._fitness, self.weights, user_request_target, self.x_min, self.x_max,
+                           **self.prescreen)
+
+    # 엔진별 개체군 연산
+    def _snap(self, X):
+        """border 탐색 공간이 있으면 제어 변수 행렬을 구간 대표값으로 변환"""
+        return self.search_space.snap(X) if self.search_space is not None else X
+
+    def _init_population(self, pop_size):
+        if self.engine == 'array':
+            population = init_array_population(pop_size, self.x_min, self.x_max, self.is_norminal,
+                                               self.pop_index_to_optimize, len(self.weights))
+            self._snap(population.X)
+            return population
+        population = self.toolbox.population(n=pop_size)
+        if self.search_space is not None:
+            snapped = self._snap(np.array(population))
+            for ind, x in zip(population, snapped):
+                ind[:] = x
+        return population
+
+    def _vary(self, population, screener=None):
+        """
+        자손을 만들어 부모 뒤에 붙입니다. screener가 있으면 걸러진 자손은 부모 개체로 되돌려
+        (변이가 일어나지 않은 자손과 같이) fitness를 재사용하고 개체 수를 유지합니다.
+        """
+        if self.engine == 'array':
+            offspring = var_and_array(population, self.CXPB, self.MUTPB, self.ETA_CX, self.INDPB,
+                                      self.nominal_mask, self.mu, self.sigma_list)
+            offspring = clip_array_population(offspring, self.x_min, self.x_max)
+            self._snap(offspring.X)
+            if screener is not None:
+                invalid = offspring.invalid_indices()
+                rejected = invalid[~screener.screen(offspring.X[invalid])]
+                offspring.X[rejected] = population.X[rejected]
+                offspring.F[rejected] = population.F[rejected]
+                offspring.valid[rejected] = population.valid[rejected]
+            return offspring.concat(population)
+        # 교차/돌연변이를 개체군 행렬 단위로 수행 (algorithms.varAnd와 같은 확률)
+        offspring, _ = var_and_matrix(np.array(population), self.CXPB, self.MUTPB, self.ETA_CX, self.INDPB,
+                                      self.nominal_mask, self.mu, self.sigma_list)
+        offspring = self._snap(np.clip(offspring, self.x_min, self.x_max))
+        offspring = [self.individual_class(ind) for ind in offspring]
+        if screener is not None:
+            keep = screener.screen(np.array(offspring))
+            offspring = [ind if kept else copy.deepcopy(parent)
+                         for ind, parent, kept in zip(offspring, population, keep)]
+        return offspring+population
+
+    def _evaluate(self, populations, rows, kernel, caches, user_request_target, screeners=None):
+        """여러 행의 population 중 fitness가 없는 개체를 모아 pred_func 한 번으로 평가"""
+        if self.engine == 'array':
+            invalid_idx = [population.invalid_indices() for population in populations]
+            controls = [population.X[idx] for population, idx in zip(populations, invalid_idx)]
+            fitness_list, n_predicted = self._evaluate_controls(rows, controls, kernel, caches, user_request_target,
+                                                                screeners)
+            for population, idx, fitness_scores in zip(populations, invalid_idx, fitness_list):
+                if len(idx):
+                    population.set_fitness(idx, fitness_scores)
+            return n_predicted
+
+        invalid_inds = [[ind for ind in population if not ind.fitness.valid] for population in populations]
+        fitness_list, n_predicted = self._evaluate_controls(rows, invalid_inds, kernel, caches, user_request_target,
+                                                            screeners)
+        for inds, fitness_scores in zip(invalid_inds, fitness_list):
+            for ind, fit in zip(inds, fitness_scores if inds else []):
+                ind.fitness.values = tuple(fit)
+        return n_predicted
+
+    def _select(self, population, clusterer):
+        if self.engine == 'array':
+            return k_means_selection_array(population, len(population)//3, self.weights, clusterer=clusterer)
+        return k_means_selection(population, k=len(population)//3, clusterer=clusterer)
+
+    def _best_of(self, population):
+        """population의 lexicographic 최적 개체, 그 fitness, population 행렬 반환"""
+        if self.engine == 'array':
+            best = lexicographic_selection_array(population, 1, self.weights)
+            return best.X[0], best.F[0], population.X
+        best = lexicographic_selection(population, k=1)[0]
+        return best, best.fitness.values, np.array(population)
+
+    def _evolve(self, gt_xs, user_request_target, row_budget, max_gen, pop_size, patience, tol, min_gen):
+        """
+        주어진 행들의 population을 함께 진화시켜 행별 최적 개체를 반환
+        수렴한 행은 배치에서 빠지며 이후 세대의 예측 대상에서 제외됨
+        제한 시간이 지나면 그 세대까지의 최적 개체를 반환
+
+        Returns:
+            list: 행별 최적 개체
+            list: 행별 ConvergenceTracker
+            list: 행별 PredictionCache
+            list: 행별 surrogate 예측 개체 수
+        """
+        # 개체 생성
+        populations = [self._init_population(pop_size) for _ in gt_xs]
+        clusterers = [self._make_clusterer() for _ in gt_xs]
+        trackers = [ConvergenceTracker(patience=patience, tol=tol, min_gen=min_gen, scale=self.x_max - self.x_min)
+                    for _ in gt_xs]
+        caches = [PredictionCache(self.rounding_digits_control, max_size=self.cache_size) if self.cache_size else None
+                  for _ in gt_xs]
+        screeners = [self._make_screener(user_request_target) for _ in gt_xs]
+        n_evals = [0] * len(gt_xs)
+        kernel = EvaluationKernel(gt_xs, self.control_index)
+        active = list(range(len(gt_xs)))
+
+        # 유전 알고리즘 세대 반복
+        for gen in range(1, max_gen+1):
+            for i in active:
+                populations[i] = self._vary(populations[i], screeners[i])
+
+            # 진행 중인 모든 행의 미평가 개체를 한 번에 예측
+            n_predicted = self._evaluate([populations[i] for i in active], active, kernel,
+                                         [caches[i] for i in active], user_request_target,
+                                         [screeners[i] for i in active])
+            for i, n in zip(active, n_predicted):
+                n_evals[i] += n
+
+            # 선택 및 수렴 판단은 행별로 수행
+            still_active = []
+            for i in active:
+                populations[i] = self._select(populations[i], clusterers[i])
+                _, best_fitness, population_matrix = self._best_of(populations[i])
+                if not trackers[i].update(best_fitness, population_matrix):
+                    still_active.append(i)
+            active = still_active
+            if not active or row_budget.expired():
+                break
+
+        if self.prescreen is not None:
+            logging.info(f"pre-screening 생략 비율: {[round(screener.skip_rate, 3) for screener in screeners]}")
+        best_individuals = [self._best_of(population)[0] for population in populations]
+        extras = [self._row_extra(population) for population in populations]
+        return best_individuals, trackers, caches, n_evals, extras
+
+    def _row_extra(self, population):
+        """행별 추가 결과 (하위 클래스에서 사용, 예: Pareto set)"""
+        return None
+
+    def _attach_row_extras(self, df, extras):
+        """행별 추가 결과를 결과 DataFrame에 붙임 (하위 클래스에서 사용)"""
+        return df
+
+    def _evolve_row(self, gt_x, user_request_target, row_budget, seed, evolve_kwargs):
+        """행 하나를 seed로 고정한 난수 상태에서 탐색하고 (최적 개체, tracker, 캐시 적중률, 예측 개체 수, 추가 결과) 반환"""
+        seed_row(seed)
+        best, trackers, caches, n_evals, extras = self._evolve([gt_x], user_request_target, row_budget, **evolve_kwargs)
+        hit_rate = caches[0].hit_rate if caches[0] is not None else 0.0
+        return best[0], trackers[0], hit_rate, n_evals[0], extras[0]
+
+    def search(self, user_request_target, rows, batched=True, max_gen=None, pop_size=None,
+               patience=20, tol=0.0, min_gen=20, deadline=None, n_jobs=1, seed=None, y_rows=None):
+        """
+        사용자 요청 타겟 값에 맞는 제어 변수 값을 행별로 탐색합니다.
+
+        Args:
+            user_request_target (np.ndarray): 사용자 요청 타겟 값 (scaled)
+            rows (np.ndarray): 탐색 시작점이 되는 원본 X 행들
+            batched (bool): True이면 모든 행의 population을 함께 진화시켜 세대마다 pred_func를 한 번만 호출
+            max_gen (int, optional): 최대 세대 수 (기본값 100 또는 preset 값)
+            pop_size (int, optional): 행별 개체 수 (기본값 1000 또는 preset 값)
+            patience, tol, min_gen: 최적 fitness가 patience 세대 동안 tol 이내로만 변하면 조기 종료
+                (min_gen 세대 이후부터 검사, patience=None이면 max_gen까지 수행)
+            deadline (float | str | SearchBudget, optional): 제한 시간(초) 또는 preset 이름
+            n_jobs (int): 1보다 크면 행들을 process pool로 나누어 탐색 (pool은 요청 간 재사용, batched 무시)
+            seed (int, optional): 행별 seed 생성용 seed, 지정하면 serial(batched=False)과 parallel 결과가 같음
+            y_rows (np.ndarray, optional): rows의 실제 타겟 값, 지정하면 타겟 오차 반올림 자리수를
+                이 값의 표준편차로 계산 (None이면 생성 시 y_train 기준 자리수)
+
+        Returns:
+            pd.DataFrame: pred_x_* 열과 행별 수행 세대 수(n_gen), 수렴 여부(converged),
+                surrogate 예측 개체 수(n_eval), 캐시 적중률(cache_hit_rate)
+        """
+        budget = SearchBudget.resolve(deadline)
+        settings = budget.settings(max_gen=100, pop_size=1000)
+        max_gen = settings['max_gen'] if max_gen is None else max_gen
+        pop_size = settings['pop_size'] if pop_size is None else pop_size
+        user_request_target = np.asarray(user_request_target)
+        self.n_requests += 1
+        self.rounding_digits = self._rounding_digits(y_rows)
+
+        evolve_kwargs = dict(max_gen=max_gen, pop_size=pop_size, patience=patience, tol=tol, min_gen=min_gen)
+        seeds = row_seeds(seed, len(rows))
+        if n_jobs > 1 and len(rows) > 1:
+            # 행들을 동시에 탐색하므로 각 행에 남은 시간 전체를 할당
+            row_args = [(user_request_target, gt_x, row_seed, budget.split(1), evolve_kwargs, self.rounding_digits)
+                        for gt_x, row_seed in zip(rows, seeds)]
+            row_results = self._row_pool(n_jobs).map(_search_row, row_args)
+            best_individuals, trackers, hit_rates, n_evals, extras, exhausted = map(list, zip(*row_results))
+            if any(exhausted):
+                budget.exhausted = True
+        elif batched:
+            seed_row(seed)
+            best_individuals, trackers, caches, n_evals, extras = self._evolve(list(rows), user_request_target, budget, **evolve_kwargs)
+            hit_rates = [cache.hit_rate if cache is not None else 0.0 for cache in caches]
+        else:
+            best_individuals, trackers, hit_rates, n_evals, extras = [], [], [], [], []
+            for idx, (gt_x, row_seed) in enumerate(zip(tqdm(rows), seeds)):
+                # 남은 시간을 남은 행 수로 나누어 할당
+                row_result = self._evolve_row(gt_x, user_request_target, budget.split(len(rows) - idx), row_seed, evolve_kwargs)
+                for results, value in zip((best_individuals, trackers, hit_rates, n_evals, extras), row_result):
+                    results.append(value)
+
+        res = {}
+        for control_var in self.control_var_names:
+            res[f"pred_x_{control_var}"] = []
+        for best in best_individuals:
+            for i in range(len(self.control_index)):
+                if self.is_norminal[i]:
+                    res[f"pred_x_{self.control_var_names[i]}"].append(int(best[i]))
+                else:
+                    res[f"pred_x_{self.control_var_names[i]}"].append(float(best[i]))
+
+        # 행별 실제 수행 세대 수 및 수렴 여부
+        res["n_gen"] = [tracker.n_gen for tracker in trackers]
+        res["converged"] = [tracker.converged for tracker in trackers]
+
+        # 행별 surrogate 예측 개체 수 및 캐시 적중률
+        res["n_eval"] = n_evals
+        res["cache_hit_rate"] = hit_rates
+        logging.info(f"surrogate 평가 개체 수: {n_evals}, 캐시 적중률: {[round(rate, 3) for rate in res['cache_hit_rate']]}")
+
+        return self._attach_row_extras(pd.DataFrame(res), extras)
+
+
+def _search_row(search_engine, user_request_target, gt_x, seed, row_budget, evolve_kwargs, rounding_digits):
+    """process pool worker에서 행 하나를 탐색 (worker마다 한 번 만든 SearchEngine 사용)"""
+    search_engine.rounding_digits = rounding_digits
+    row_result = search_engine._evolve_row(gt_x, user_request_target, row_budget, seed, evolve_kwargs)
+    return (*row_result, row_budget.exhausted)
@@ -48,3 +48,28 @@ from .catboost_classification_model import (
     catboost_classification_save,
     catboost_classification_load,
 )
+
+from .catboost_numpy_model import (
+    ObliviousTreeModel,
+    catboost_numpy_export,
+    catboost_numpy_load,
+    catboost_numpy_predict,
+    catboost_numpy_multi_predict,
+    catboost_numpy_classification_predict,
+)
+
+from .catboost_hpo import (
+    catboost_hpo,
+    early_stopping_split,
+    hpo_time_budget,
+    hpo_storage,
+    hpo_study_name,
+    dataset_fingerprint,
+    CatBoostPruningCallback,
+    set_predict_thread_count,
+    predict_thread_count,
+)
+
+from .tabpfn_context import CONTEXT_SIZE, select_context, disjoint_contexts, SubsetEnsemble
+from .tabpfn_device import select_device, chunked_predict, inference_throughput
+from .distill_model import DistilledMLP, distill_surrogate, distill_predict
@@ -1,85 +1,66 @@
 import numpy as np
 
-import optuna
 from catboost import CatBoostClassifier
 from sklearn.metrics import accuracy_score
 
+from .catboost_hpo import HPO_DEFAULTS, catboost_hpo, early_stopping_split, predict_thread_count
 
-def get_objective(X_train, y_train, X_test, y_test):
+
+def search_space(trial):
     """
-    Optuna 최적화에 사용될 목적 함수를 반환하는 함수
+    Optuna trial에서 CatBoost 분류 하이퍼파라미터를 샘플링하는 함수
 
     Args:
-        X_train: 훈련 데이터의 특성 행렬
-        y_train: 훈련 데이터의 타겟 값
-        X_test: 테스트 데이터의 특성 행렬
-        y_test: 테스트 데이터의 타겟 값
+        trial: Optuna가 제공하는 trial 객체
 
     Returns:
-        objective (function): Optuna의 목적 함수
+        dict: CatBoostClassifier 파라미터
     """
+    return {
+        "objective": trial.suggest_categorical("objective", ["MultiClass"]),
+        "colsample_bylevel": trial.suggest_float("colsample_bylevel", 0.01, 0.1),
+        "depth": trial.suggest_int("depth", 1, 12),
+    }
+
+
+def error_rate(y_test, preds):
+    """(1 - 정확도), Optuna는 기본적으로 최소화를 목표로 하므로 1에서 정확도를 뺀 값을 사용"""
+    return 1 - accuracy_score(y_test, preds)
+
 
-    def objective(trial):
-        """
-        Optuna의 trial 객체를 사용하여 하이퍼파라미터를 최적화하는 함수
-
-        Args:
-            trial: Optuna가 제공하는 trial 객체
-
-        Returns:
-            float: (1 - 정확도) 값, Optuna는 기본적으로 최소화를 목표로 하므로 1에서 정확도를 뺀 값을 반환
-        """
-        param = {
-            "objective": trial.suggest_categorical("objective", ["MultiClass"]),
-            "colsample_bylevel": trial.suggest_float("colsample_bylevel", 0.01, 0.1),
-            "depth": trial.suggest_int("depth", 1, 12),
-        }
-        # CatBoost 모델 생성 및 학습
-        model = CatBoostClassifier(**param)
-        # 예측 및 정확도 계산
-        model.fit(
-            X_train,
-            y_train,
-            eval_set=[(X_test, y_test)],
-            verbose=1,
-            early_stopping_rounds=50,
-        )
-
-        preds = model.predict(X_test)
-        accuracy = accuracy_score(y_test, preds)
-        return (
-            1 - accuracy
-        )  # Optuna는 기본적으로 최소화를 목표로 하므로 (1 - 정확도) 사용
-
-    return objective
+# 분류는 기존처럼 적은 trial 수로 탐색
+CLASSIFICATION_HPO_DEFAULTS = {**HPO_DEFAULTS, 'n_trials': 2, 'early_stopping_rounds': 50,
+                               'warm_start_n_trials': 1, 'warm_start_top_k': 1}
 
 
 def catboost_classification_train(
-    train_data: tuple, val_data: tuple, params: dict = None
+    train_data: tuple, val_data: tuple, params: dict = None, hpo_options: dict = None
 ):
     """
     CatBoost 분류 모델을 학습하는 함수.
 
+    params가 없으면 Optuna로 하이퍼파라미터를 탐색하고(catboost_hpo), 가장 좋은 trial의 모델을 그대로 반환합니다.
+
     Parameters:
         train_data (tuple): 훈련 데이터 (X_train, y_train)
-        val_data (tuple): 검증 데이터 (X_test, y_test)
-        params (dict, optional): CatBoost 하이퍼파라미터 딕셔너리. 기본값은 None.
+        val_data (tuple): 검증 데이터 (X_test, y_test), 평가 전용으로 학습과 early stopping에는 사용하지 않음
+        params (dict, optional): CatBoost 하이퍼파라미터 딕셔너리. 주어지면 탐색 없이 이 값으로 학습
+        hpo_options (dict, optional): catboost_hpo 설정, 기본값은 CLASSIFICATION_HPO_DEFAULTS
 
     Returns:
         CatBoostClassifier: 학습된 CatBoost 분류 모델
     """
     X_train, y_train = train_data
-    X_test, y_test = val_data
-
-    objective = get_objective(X_train, y_train, X_test, y_test)
-    study = optuna.create_study(direction="minimize")
-    study.optimize(objective, n_trials=2)
-
-    model = CatBoostClassifier(**study.best_params)
 
-    # 모델 학습
-    model.fit(X_train, y_train)
+    if params is not None:
+        # early stopping은 훈련 데이터에서 떼어낸 검증 세트로 수행 (테스트 세트는 평가에만 사용)
+        (X_fit, y_fit), eval_set = early_stopping_split(X_train, y_train, stratify=True)
+        model = CatBoostClassifier(**params)
+        model.fit(X_fit, y_fit, eval_set=[eval_set], verbose=0, early_stopping_rounds=50)
+        return model
 
+    model, study = catboost_hpo(CatBoostClassifier, train_data, search_space, error_rate,
+                                **{**CLASSIFICATION_HPO_DEFAULTS, **(hpo_options or {})})
     return model
 
 
@@ -94,7 +75,7 @@ def catboost_classification_predict(model, X_test: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray: 예측된 클래스 레이블
     """
-    y_pred_prob = model.predict(X_test, prediction_type="Probability")
+    y_pred_prob = model.predict(X_test, prediction_type="Probability", thread_count=predict_thread_count())
 
     y_pred = np.argmax(y_pred_prob, axis=1)
 
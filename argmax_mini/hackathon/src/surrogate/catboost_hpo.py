@@ -0,0 +1,344 @@
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+import optuna
+from sklearn.model_selection import train_test_split
+
+
+# catboost_train / catboost_multi_train 기본 HPO 설정
+HPO_DEFAULTS = {
+    'n_trials': 100,
+    'timeout': None,  # None이면 hpo_time_budget으로 데이터 크기에 맞춰 계산
+    'n_jobs': 2,
+    'pruner': 'median',
+    'iterations': 1000,
+    'early_stopping_rounds': 100,
+    'eval_fraction': 0.2,  # early stopping / pruning / trial 점수에 쓸 훈련 데이터 비율
+    'report_every': 25,
+    'seed': 42,
+    'warm_start_n_trials': 10,  # 이전 study로 warm start할 때 새로 시도할 trial 수
+    'warm_start_top_k': 3,  # warm start로 먼저 실행할 이전 상위 trial 수
+}
+
+# flow별 Optuna study를 저장할 폴더 (학습이 끝나면 지워지는 ./temp 밖, HPO_STORAGE_DIR 환경 변수로 조정)
+HPO_STORAGE_DIR = os.environ.get('HPO_STORAGE_DIR', './hpo_studies')
+
+
+def hpo_time_budget(n_rows, n_features, min_seconds=30.0, seconds_per_million_cells=600.0, max_seconds=900.0):
+    """
+    데이터 크기(행 수 x 열 수)에 비례하는 HPO 제한 시간(초)
+
+    Args:
+        n_rows (int): 학습 행 수
+        n_features (int): 입력 열 수
+
+    Returns:
+        float: 제한 시간(초)
+    """
+    seconds = min_seconds + seconds_per_million_cells * n_rows * n_features / 1e6
+    return float(min(max_seconds, seconds))
+
+
+def available_threads():
+    """현재 프로세스가 사용할 수 있는 thread 수 (limit_threads로 제한했으면 그 값)"""
+    limit = os.environ.get('OMP_NUM_THREADS')
+    return int(limit) if limit and limit.isdigit() else (os.cpu_count() or 1)
+
+
+# CatBoost predict에 사용할 thread 수 (-1이면 모든 코어, process pool worker에서는 limit_threads로 제한)
+_PREDICT_THREAD_COUNT = -1
+
+
+def set_predict_thread_count(n_threads):
+    """catboost_*_predict가 사용할 thread 수 설정 (-1이면 모든 코어)"""
+    global _PREDICT_THREAD_COUNT
+    _PREDICT_THREAD_COUNT = int(n_threads)
+
+
+def predict_thread_count():
+    """catboost_*_predict가 사용할 thread 수"""
+    return _PREDICT_THREAD_COUNT
+
+
+def early_stopping_split(X, y, fraction=0.2, seed=42, stratify=False):
+    """
+    훈련 데이터에서 early stopping / pruning / trial 점수용 검증 세트를 떼어냅니다.
+    (테스트 세트는 surrogate 최종 평가에만 쓰이도록 학습 과정에서 사용하지 않음)
+
+    Args:
+        X, y: 훈련 데이터
+        fraction (float): 검증 세트 비율
+        seed (int): 분할 seed
+        stratify (bool): 분류 모델이면 True (클래스마다 2개 이상일 때 층화 분할)
+
+    Returns:
+        tuple: (X_fit, y_fit), (X_eval, y_eval)
+    """
+    labels = None
+    if stratify:
+        labels = np.asarray(y).reshape(len(y), -1)[:, 0]
+        if np.unique(labels, return_counts=True)[1].min() < 2:
+            labels = None
+    X_fit, X_eval, y_fit, y_eval = train_test_split(X, y, test_size=fraction, random_state=seed, stratify=labels)
+    return (X_fit, y_fit), (X_eval, y_eval)
+
+
+def make_pruner(pruner):
+    """'median' | 'halving' | None 으로 Optuna pruner 생성"""
+    if pruner == 'median':
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=100)
+    if pruner == 'halving':
+        return optuna.pruners.SuccessiveHalvingPruner(min_resource=100, reduction_factor=3)
+    if pruner is None:
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"지원되지 않는 pruner입니다: {pruner}")
+
+
+def hpo_storage(directory=None):
+    """
+    flow별 study를 저장할 SQLite storage URL
+
+    Args:
+        directory (str, optional): 저장 폴더, 기본값은 HPO_STORAGE_DIR
+
+    Returns:
+        str: Optuna storage URL
+    """
+    directory = os.path.abspath(directory or HPO_STORAGE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return f"sqlite:///{os.path.join(directory, 'optuna.db')}"
+
+
+def hpo_study_name(flow_id, target, train_name):
+    """flow, 타겟 조합, 학습 함수별 study 이름"""
+    target_key = hashlib.md5('|'.join(map(str, target)).encode()).hexdigest()[:12]
+    return f"flow{flow_id}_{train_name}_{target_key}"
+
+
+def dataset_fingerprint(X_train, y_train):
+    """
+    warm start 가능 여부를 판단하기 위한 학습 데이터 요약 (행/열 수, 열별 평균과 표준편차)
+
+    Args:
+        X_train (np.ndarray): 훈련 입력
+        y_train (np.ndarray): 훈련 타겟
+
+    Returns:
+        dict: JSON으로 저장 가능한 fingerprint
+    """
+    X = np.asarray(X_train, dtype=np.float64).reshape(len(X_train), -1)
+    y = np.asarray(y_train, dtype=np.float64).reshape(len(y_train), -1)
+    data = np.concatenate([X, y], axis=1)
+    return {
+        'n_rows': int(data.shape[0]),
+        'n_features': int(X.shape[1]),
+        'n_targets': int(y.shape[1]),
+        'mean': np.nanmean(data, axis=0).round(6).tolist(),
+        'std': np.nanstd(data, axis=0).round(6).tolist(),
+    }
+
+
+def warm_start_compatible(previous, current, max_row_change=0.5, max_shift=0.25):
+    """
+    이전 study의 데이터와 현재 데이터가 같은 문제로 볼 수 있을 만큼 비슷한지 확인
+
+    열 구성이 같고, 행 수 변화가 max_row_change 이내이며, 모든 열의 평균 이동이
+    표준편차의 max_shift배 이내이면 이전 최적 파라미터로 warm start합니다.
+
+    Args:
+        previous (dict): 이전 study의 dataset_fingerprint
+        current (dict): 현재 데이터의 dataset_fingerprint
+
+    Returns:
+        bool: warm start 가능 여부
+    """
+    if not previous:
+        return False
+    if (previous['n_features'], previous['n_targets']) != (current['n_features'], current['n_targets']):
+        return False
+    if abs(current['n_rows'] / max(previous['n_rows'], 1) - 1) > max_row_change:
+        return False
+    shift = np.abs(np.subtract(current['mean'], previous['mean']))
+    scale = np.maximum(np.asarray(current['std']), 1e-12)
+    return bool(np.all(shift <= max_shift * scale))
+
+
+def load_warm_start(storage, study_name, fingerprint, top_k=3):
+    """
+    저장된 이전 study에서 상위 trial의 파라미터를 읽습니다.
+
+    데이터가 warm start 조건을 만족하지 않거나 완료된 trial이 없으면 None을 반환합니다.
+    이전 study는 삭제하지 않으며, 새 탐색이 끝난 뒤 replace_study로 교체합니다.
+
+    Args:
+        storage (str): Optuna storage URL
+        study_name (str): study 이름
+        fingerprint (dict): 현재 데이터의 dataset_fingerprint
+        top_k (int): 가져올 상위 trial 수
+
+    Returns:
+        list[dict] | None: 점수 순 trial 파라미터
+    """
+    try:
+        previous = optuna.load_study(study_name=study_name, storage=storage)
+    except KeyError:
+        return None
+
+    completed = [trial for trial in previous.trials if trial.state == optuna.trial.TrialState.COMPLETE]
+    compatible = warm_start_compatible(previous.user_attrs.get('fingerprint'), fingerprint)
+    if not compatible or not completed:
+        logging.info(f"catboost hpo: {study_name} 데이터가 달라져 처음부터 탐색")
+        return None
+    return [trial.params for trial in sorted(completed, key=lambda trial: trial.value)[:top_k]]
+
+
+def delete_study_if_exists(storage, study_name):
+    """study가 있으면 삭제"""
+    try:
+        optuna.delete_study(study_name=study_name, storage=storage)
+    except KeyError:
+        pass
+
+
+def replace_study(storage, from_study_name, to_study_name):
+    """
+    from_study_name study를 to_study_name으로 복사해 이전 study를 교체하고 원본을 삭제합니다.
+
+    Returns:
+        optuna.Study: 교체된 study
+    """
+    delete_study_if_exists(storage, to_study_name)
+    optuna.copy_study(from_study_name=from_study_name, from_storage=storage, to_storage=storage,
+                      to_study_name=to_study_name)
+    optuna.delete_study(study_name=from_study_name, storage=storage)
+    return optuna.load_study(study_name=to_study_name, storage=storage)
+
+
+class CatBoostPruningCallback:
+    """
+    CatBoost 학습 중 검증 metric을 Optuna trial에 보고하고, pruner가 중단을 결정하면 학습을 멈추는 callback
+
+    Args:
+        trial: Optuna trial
+        report_every (int): 보고 간격 (iteration)
+    """
+
+    def __init__(self, trial, report_every=25):
+        self.trial = trial
+        self.report_every = report_every
+        self.pruned = False
+
+    def after_iteration(self, info):
+        if info.iteration % self.report_every:
+            return True
+        validation = info.metrics.get('validation')
+        if not validation:
+            return True
+        # 첫 번째 검증 metric (학습 손실 함수)
+        value = next(iter(validation.values()))[-1]
+        self.trial.report(value, info.iteration)
+        if self.trial.should_prune():
+            self.pruned = True
+            return False
+        return True
+
+
+def catboost_hpo(model_class, train_data, search_space, score_func, n_trials=100, timeout=None,
+                 n_jobs=1, pruner='median', iterations=1000, early_stopping_rounds=100, eval_fraction=0.2,
+                 report_every=25, seed=42, storage=None, study_name=None, warm_start_n_trials=10,
+                 warm_start_top_k=3):
+    """
+    병렬 trial, 검증 metric 기반 pruning, 제한 시간을 지원하는 CatBoost 하이퍼파라미터 탐색
+
+    훈련 데이터에서 eval_fraction만큼 검증 세트를 떼어(early_stopping_split) trial마다 early stopping,
+    pruning, 점수 계산에 사용하고, 가장 좋은 trial의 모델을 그대로 반환합니다. (최적 파라미터로 다시
+    학습하지 않음) 테스트 세트는 받지 않으므로 surrogate 테스트 점수는 편향되지 않습니다. trial들은 thread로 병렬 실행하며 trial당 CatBoost thread 수는
+    사용 가능한 thread를 n_jobs로 나눈 값입니다.
+
+    storage와 study_name이 주어지면 study를 저장하고, 같은 이름의 이전 study가 있고 데이터 fingerprint가
+    비슷하면 이전 상위 파라미터를 먼저 실행한 뒤 warm_start_n_trials개만 새로 탐색합니다.
+    새 탐색은 임시 이름의 study에 기록하고 끝난 뒤에 이전 study를 교체하므로, 탐색 중 실패하면
+    이전 study가 그대로 남습니다.
+
+    Args:
+        model_class: CatBoostRegressor / CatBoostClassifier
+        train_data (tuple): 훈련 데이터 (X_train, y_train)
+        search_space (callable): trial -> CatBoost 파라미터 dict
+        score_func (callable): (y_eval, preds) -> 최소화할 점수
+        n_trials (int): 최대 trial 수
+        timeout (float, optional): 제한 시간(초), None이면 hpo_time_budget(데이터 크기)
+        n_jobs (int): 동시에 실행할 trial 수
+        pruner (str, optional): 'median' | 'halving' | None
+        iterations (int): trial별 최대 iteration
+        early_stopping_rounds (int): 검증 metric이 개선되지 않을 때 멈출 iteration 수
+        eval_fraction (float): 훈련 데이터에서 떼어낼 검증 세트 비율
+        report_every (int): pruner에 검증 metric을 보고할 간격
+        seed (int): sampler / CatBoost seed
+        storage (str, optional): Optuna storage URL (hpo_storage)
+        study_name (str, optional): study 이름 (hpo_study_name)
+        warm_start_n_trials (int): warm start할 때 새로 시도할 trial 수
+        warm_start_top_k (int): warm start로 먼저 실행할 이전 상위 trial 수
+
+    Returns:
+        model: 가장 좋은 trial에서 학습한 모델
+        study (optuna.Study): 탐색 결과
+    """
+    X_train, y_train = train_data
+    (X_fit, y_fit), (X_eval, y_eval) = early_stopping_split(X_train, y_train, eval_fraction, seed,
+                                                            stratify=hasattr(model_class, 'predict_proba'))
+    if timeout is None:
+        timeout = hpo_time_budget(*np.shape(X_train)[:2])
+    thread_count = max(1, available_threads() // max(n_jobs, 1))
+
+    best = {'score': np.inf, 'model': None}
+    lock = threading.Lock()
+
+    def objective(trial):
+        params = search_space(trial)
+        model = model_class(**params, iterations=iterations, thread_count=thread_count,
+                            random_seed=seed, verbose=0, allow_writing_files=False)
+        callback = CatBoostPruningCallback(trial, report_every=report_every)
+        model.fit(X_fit, y_fit, eval_set=[(X_eval, y_eval)],
+                  early_stopping_rounds=early_stopping_rounds, callbacks=[callback])
+        if callback.pruned:
+            raise optuna.TrialPruned()
+
+        score = score_func(y_eval, model.predict(X_eval))
+        trial.set_user_attr('best_iteration', model.get_best_iteration())
+        with lock:
+            if score < best['score']:
+                best['score'], best['model'] = score, model
+        return score
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    persist = storage is not None and study_name is not None
+    warm_start = None
+    if persist:
+        fingerprint = dataset_fingerprint(X_train, y_train)
+        warm_start = load_warm_start(storage, study_name, fingerprint, top_k=warm_start_top_k)
+
+    # 이전 study는 탐색이 끝날 때까지 유지 (중단된 이전 임시 study가 남아 있으면 삭제)
+    running_name = f"{study_name}.running" if persist else None
+    if persist:
+        delete_study_if_exists(storage, running_name)
+    study = optuna.create_study(direction="minimize", sampler=optuna.samplers.TPESampler(seed=seed),
+                                pruner=make_pruner(pruner), storage=storage if persist else None,
+                                study_name=running_name)
+    if persist:
+        study.set_user_attr('fingerprint', fingerprint)
+    if warm_start:
+        for params in warm_start:
+            study.enqueue_trial(params, skip_if_exists=True)
+        n_trials = len(warm_start) + warm_start_n_trials
+        logging.info(f"catboost hpo: {study_name} 이전 파라미터 {len(warm_start)}개로 warm start")
+    study.optimize(objective, n_trials=n_trials, timeout=timeout, n_jobs=n_jobs)
+    if persist:
+        study = replace_study(storage, running_name, study_name)
+
+    n_pruned = sum(trial.state == optuna.trial.TrialState.PRUNED for trial in study.trials)
+    logging.info(f"catboost hpo: trials {len(study.trials)} (pruned {n_pruned}), "
+                 f"best {study.best_value:.5f} {study.best_params}")
+    return best['model'], study
@@ -1,89 +1,58 @@
 import numpy as np
 
-import optuna
 from catboost import CatBoostRegressor
 from sklearn.metrics import mean_squared_error
 
+from .catboost_hpo import HPO_DEFAULTS, catboost_hpo, early_stopping_split, predict_thread_count
 
-def get_objective(X_train, y_train, X_test, y_test):
+
+def search_space(trial):
     """
-    Optuna 최적화에 사용될 목적 함수를 반환하는 함수
+    Optuna trial에서 CatBoost 하이퍼파라미터를 샘플링하는 함수
 
     Args:
-        X_train: 훈련 데이터의 특성 행렬
-        y_train: 훈련 데이터의 타겟 값
-        X_test: 테스트 데이터의 특성 행렬
-        y_test: 테스트 데이터의 타겟 값
+        trial: Optuna가 제공하는 trial 객체
 
     Returns:
-        objective (function): Optuna의 목적 함수
+        dict: CatBoostRegressor 파라미터
     """
+    return {
+        "objective": trial.suggest_categorical("objective", ["MultiRMSE"]),
+        "colsample_bylevel": trial.suggest_float("colsample_bylevel", 0.01, 0.1),
+        "depth": trial.suggest_int("depth", 1, 12),
+    }
 
-    def objective(trial):
-        """
-        Optuna의 trial 객체를 사용하여 하이퍼파라미터를 최적화하는 함수
-
-        Args:
-            trial: Optuna가 제공하는 trial 객체
-
-        Returns:
-            float: (1 - 정확도) 값, Optuna는 기본적으로 최소화를 목표로 하므로 1에서 정확도를 뺀 값을 반환
-        """
-        # data, target = load_breast_cancer(return_X_y=True)
-        # train_x, valid_x, train_y, valid_y = train_test_split(data, target, test_size=0.3)
-
-        param = {
-            "objective": trial.suggest_categorical("objective", ["MultiRMSE"]),
-            "colsample_bylevel": trial.suggest_float("colsample_bylevel", 0.01, 0.1),
-            "depth": trial.suggest_int("depth", 1, 12),
-        }
-
-        gbm = CatBoostRegressor(**param)
-
-        gbm.fit(
-            X_train,
-            y_train,
-            eval_set=[(X_test, y_test)],
-            verbose=0,
-            early_stopping_rounds=100,
-        )
 
-        preds = gbm.predict(X_test)
-        accuracy = mean_squared_error(y_test, preds)
-        return accuracy
-
-    return objective
-
-
-def catboost_multi_train(train_data: tuple, val_data: tuple, params: dict = None):
+def catboost_multi_train(train_data: tuple, val_data: tuple, params: dict = None, hpo_options: dict = None):
     """
     CatBoostRegressor를 사용하여 다중 출력 회귀 모델을 학습하는 함수
 
+    params가 없으면 Optuna로 하이퍼파라미터를 탐색하고(catboost_hpo), 가장 좋은 trial의 모델을 그대로 반환합니다.
+
     Args:
         train_data (tuple): 훈련 데이터 (X_train, y_train)
-        val_data (tuple): 검증 데이터 (X_test, y_test)
-        params (dict, optional): CatBoostRegressor의 하이퍼파라미터. 기본값은 None.
+        val_data (tuple): 검증 데이터 (X_test, y_test), 평가 전용으로 학습과 early stopping에는 사용하지 않음
+        params (dict, optional): CatBoostRegressor의 하이퍼파라미터. 주어지면 탐색 없이 이 값으로 학습
+        hpo_options (dict, optional): catboost_hpo 설정 (n_trials, timeout, n_jobs, pruner 등), 기본값은 HPO_DEFAULTS
 
     Returns:
         CatBoostRegressor: 학습된 CatBoost 모델
     """
     X_train, y_train = train_data
-    X_test, y_test = val_data
 
-    objective = get_objective(X_train, y_train, X_test, y_test)
-    study = optuna.create_study(direction="minimize")
-    study.optimize(objective, n_trials=100)
+    if params is not None:
+        # early stopping은 훈련 데이터에서 떼어낸 검증 세트로 수행 (테스트 세트는 평가에만 사용)
+        (X_fit, y_fit), eval_set = early_stopping_split(X_train, y_train)
+        model = CatBoostRegressor(**params)
+        model.fit(X_fit, y_fit, eval_set=[eval_set], verbose=0, early_stopping_rounds=100)
+        return model
+
+    model, study = catboost_hpo(CatBoostRegressor, train_data, search_space, mean_squared_error,
+                                **{**HPO_DEFAULTS, **(hpo_options or {})})
     print(study.best_trial)
     print(study.best_params)
     print(study.best_value)
 
-    model = CatBoostRegressor(**study.best_params)
-    #     loss_function="MultiRMSE",  # 다중 출력 회귀를 위한 손실 함수
-    #     random_seed=42,  # 랜덤 시드 설정 (재현성 확보)
-    #     verbose=200,  # 학습 진행 상황 출력 간격
-    # )
-    model.fit(X_train, y_train)  # 모델 학습 수행
-
     return model
 
 
@@ -98,7 +67,7 @@ def catboost_multi_predict(model, X_test: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray: 예측된 다중 출력 회귀 결과
     """
-    y_pred = model.predict(X_test) 
+    y_pred = model.predict(X_test, thread_count=predict_thread_count())
     if y_pred.ndim == 1:
         y_pred = y_pred.reshape(-1, X_test.shape[1])
 
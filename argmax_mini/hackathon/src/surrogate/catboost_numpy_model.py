@@ -0,0 +1,265 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+class ObliviousTreeModel:
+    """
+    CatBoost oblivious tree 앙상블을 배열로 펼쳐 NumPy만으로 예측하는 모델
+
+    트리마다 깊이별 split 열, border, leaf 값을 배열로 저장하고, 배치 전체의 leaf index를
+    모든 트리에 대해 한 번에 계산합니다. (`값 > border`이면 깊이 d의 bit가 1, leaf index = sum(bit_d << d))
+    서로 다른 (열, border) split마다 비교를 한 번만 하고, 깊이별 비교 결과를 shift/or로 묶어
+    leaf index를 구합니다. CatBoost.predict의 호출당 overhead가 없어 작은 배치를 여러 번 예측할 때 빠릅니다.
+
+    깊이가 다른 트리는 최대 깊이에 맞춰 border를 +inf로 채우므로 추가 bit는 항상 0입니다.
+
+    Attributes:
+        split_feature (np.ndarray): 트리/깊이별 split 입력 열 index (n_trees, depth)
+        split_border (np.ndarray): 트리/깊이별 border (n_trees, depth), float32
+        leaf_values (np.ndarray): 트리/leaf별 값 (n_trees, 2**depth, n_dim)
+        scale (float), bias (np.ndarray): 예측값 = scale * sum(leaf) + bias
+        loss_function (str): 학습 손실 함수 이름
+        n_features (int): 입력 열 수
+    """
+
+    # 한 번에 leaf index를 계산할 최대 (트리 수 x 행 수) 크기
+    CHUNK_ELEMENTS = 1 << 22
+
+    def __init__(self, split_feature, split_border, leaf_values, scale=1.0, bias=0.0,
+                 loss_function='RMSE', n_features=None):
+        self.split_feature = np.asarray(split_feature, dtype=np.int64)
+        self.split_border = np.asarray(split_border, dtype=np.float32)
+        self.leaf_values = np.asarray(leaf_values, dtype=np.float64)
+        self.scale = float(scale)
+        self.bias = np.asarray(bias, dtype=np.float64).reshape(-1)
+        self.loss_function = loss_function
+        self.n_features = n_features if n_features is not None else int(self.split_feature.max(initial=-1)) + 1
+
+        # 중복을 제거한 (열, border) split과 트리/깊이별 split 번호 (채운 깊이는 항상 0인 마지막 split)
+        n_trees, depth = self.split_feature.shape
+        used = np.isfinite(self.split_border)
+        pairs = np.stack([self.split_feature[used], self.split_border[used].astype(np.float64)], axis=1)
+        unique_pairs, split_id = np.unique(pairs.reshape(-1, 2), axis=0, return_inverse=True)
+        self._unique_feature = unique_pairs[:, 0].astype(np.int64)
+        self._unique_border = unique_pairs[:, 1].astype(np.float32)[:, None]
+        self._split_id = np.full((n_trees, depth), len(unique_pairs), dtype=np.int64)
+        self._split_id[used] = split_id.reshape(-1)
+        self._index_dtype = np.uint8 if depth <= 8 else np.uint16
+
+        # 트리별 leaf 값을 한 줄로 펼친 배열과 트리 시작 offset
+        n_leaves = self.leaf_values.shape[1]
+        self._leaf_flat = self.leaf_values.reshape(n_trees * n_leaves, -1)
+        self._leaf_offset = (np.arange(n_trees) * n_leaves)[:, None]
+
+    @property
+    def n_trees(self):
+        return self.split_feature.shape[0]
+
+    @property
+    def n_dim(self):
+        return self.leaf_values.shape[2]
+
+    @property
+    def is_classifier(self):
+        return self.loss_function in ('Logloss', 'CrossEntropy', 'MultiClass', 'MultiClassOneVsAll')
+
+    @classmethod
+    def from_json(cls, model_json):
+        """
+        CatBoost JSON export(save_model(format='json'))로 배열을 만듭니다.
+
+        Args:
+            model_json (dict): json.load한 CatBoost 모델
+
+        Returns:
+            ObliviousTreeModel
+        """
+        if 'oblivious_trees' not in model_json:
+            raise ValueError("oblivious tree(grow_policy='SymmetricTree') CatBoost 모델만 지원합니다")
+        features_info = model_json.get('features_info', {})
+        if features_info.get('categorical_features'):
+            raise ValueError("범주형(cat_features) 입력이 있는 CatBoost 모델은 지원하지 않습니다")
+
+        float_features = features_info.get('float_features', [])
+        flat_index = {feature['feature_index']: feature['flat_feature_index'] for feature in float_features}
+        trees = model_json['oblivious_trees']
+        depth = max([len(tree['splits']) for tree in trees] + [1])
+        n_dim = max(1, len(trees[0]['leaf_values']) // (1 << len(trees[0]['splits']))) if trees else 1
+
+        split_feature = np.zeros((len(trees), depth), dtype=np.int64)
+        split_border = np.full((len(trees), depth), np.inf, dtype=np.float32)
+        leaf_values = np.zeros((len(trees), 1 << depth, n_dim))
+        for t, tree in enumerate(trees):
+            for d, split in enumerate(tree['splits']):
+                if split.get('split_type', 'FloatFeature') != 'FloatFeature':
+                    raise ValueError(f"지원되지 않는 split 종류입니다: {split.get('split_type')}")
+                split_feature[t, d] = flat_index[split['float_feature_index']]
+                split_border[t, d] = split['border']
+            values = np.asarray(tree['leaf_values'], dtype=np.float64).reshape(-1, n_dim)
+            leaf_values[t, :len(values)] = values
+
+        scale, bias = model_json.get('scale_and_bias', [1.0, [0.0]])
+        loss_function = model_json.get('model_info', {}).get('params', {}).get('loss_function', {}).get('type', 'RMSE')
+        n_features = max([feature['flat_feature_index'] for feature in float_features] + [-1]) + 1
+        return cls(split_feature, split_border, leaf_values, scale=scale, bias=bias,
+                   loss_function=loss_function, n_features=n_features)
+
+    @classmethod
+    def from_catboost(cls, model):
+        """학습된 CatBoost 모델 객체를 JSON으로 내보낸 뒤 배열로 변환"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'model.json')
+            model.save_model(path, format='json')
+            with open(path) as f:
+                return cls.from_json(json.load(f))
+
+    def split_borders(self):
+        """입력 열 index별 split border (search.catboost_split_borders와 같은 형태)"""
+        used = np.isfinite(self.split_border)
+        return {int(i): np.unique(self.split_border[used][self.split_feature[used] == i]).astype(np.float64)
+                for i in np.unique(self.split_feature[used])}
+
+    def raw_predict(self, X):
+        """
+        트리 leaf 값 합에 scale/bias를 적용한 raw 예측값 (CatBoost RawFormulaVal)
+
+        Args:
+            X (np.ndarray): 입력 행렬 (n, n_features)
+
+        Returns:
+            np.ndarray: raw 예측값 (n, n_dim)
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty((len(X), self.n_dim))
+        step = max(1, self.CHUNK_ELEMENTS // max(1, self.n_trees))
+        for start in range(0, len(X), step):
+            XT = np.ascontiguousarray(X[start:start + step].T)
+            # split별 비교 결과 (n_splits + 1, n), 마지막 행은 채운 깊이용 0
+            bits = np.zeros((len(self._unique_feature) + 1, XT.shape[1]), dtype=self._index_dtype)
+            np.greater(XT[self._unique_feature], self._unique_border, out=bits[:-1], casting='unsafe')
+
+            # 깊이 d의 bit를 d만큼 shift해 트리별 leaf index (n_trees, n) 계산
+            leaf_index = bits[self._split_id[:, 0]]
+            for d in range(1, self._split_id.shape[1]):
+                level = bits[self._split_id[:, d]]
+                level <<= d
+                leaf_index |= level
+            leaf_index = leaf_index.astype(np.intp) + self._leaf_offset
+            if self.n_dim == 1:
+                out[start:start + step, 0] = self._leaf_flat[:, 0].take(leaf_index).sum(axis=0)
+            else:
+                out[start:start + step] = self._leaf_flat[leaf_index].sum(axis=0)
+        return self.scale * out + self.bias
+
+    def predict_proba(self, X):
+        """분류 모델의 클래스별 확률 (Logloss는 sigmoid, MultiClass는 softmax, OneVsAll은 클래스별 sigmoid)"""
+        raw = self.raw_predict(X)
+        if self.loss_function == 'MultiClassOneVsAll':
+            return 1.0 / (1.0 + np.exp(-raw))
+        if raw.shape[1] == 1:
+            positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.stack([1.0 - positive, positive], axis=1)
+        raw = raw - raw.max(axis=1, keepdims=True)
+        prob = np.exp(raw)
+        return prob / prob.sum(axis=1, keepdims=True)
+
+    def predict(self, X, prediction_type=None, thread_count=-1):
+        """
+        CatBoost predict와 같은 형태의 예측 (catboost_*_predict 함수에 그대로 사용 가능)
+
+        Args:
+            X (np.ndarray): 입력 행렬
+            prediction_type (str, optional): 'RawFormulaVal' | 'Probability' | 'Class',
+                None이면 회귀는 예측값, 분류는 클래스 index
+            thread_count (int): CatBoost predict와 인자를 맞추기 위한 값 (사용하지 않음)
+
+        Returns:
+            np.ndarray: 1차원 타겟은 (n,), 다중 타겟/확률은 (n, n_dim)
+        """
+        if prediction_type is None:
+            prediction_type = 'Class' if self.is_classifier else 'RawFormulaVal'
+        if prediction_type == 'Probability':
+            return self.predict_proba(X)
+        raw = self.raw_predict(X)
+        if prediction_type == 'Class':
+            if raw.shape[1] == 1:
+                return (raw[:, 0] > 0).astype(np.int64)
+            return raw.argmax(axis=1)
+        return raw[:, 0] if raw.shape[1] == 1 else raw
+
+
+def catboost_numpy_export(model):
+    """
+    학습된 CatBoost 모델(catboost_train / catboost_multi_train / catboost_classification_train 결과)을
+    NumPy oblivious tree 모델로 변환합니다.
+
+    Args:
+        model: CatBoostRegressor / CatBoostClassifier
+
+    Returns:
+        ObliviousTreeModel
+    """
+    return ObliviousTreeModel.from_catboost(model)
+
+
+def catboost_numpy_load(path):
+    """
+    catboost_save로 저장한 .cbm 모델 파일을 불러와 NumPy oblivious tree 모델로 변환합니다.
+
+    Args:
+        path (str): 모델 파일 경로 (.cbm 확장자 생략 가능)
+
+    Returns:
+        ObliviousTreeModel
+    """
+    from catboost import CatBoost
+    model = CatBoost()
+    model.load_model(path if path.endswith('.cbm') else path + '.cbm')
+    return catboost_numpy_export(model)
+
+
+def catboost_numpy_predict(model, X_test: np.ndarray) -> np.ndarray:
+    """
+    NumPy oblivious tree 모델로 회귀 예측 (catboost_predict 대체)
+
+    Args:
+        model (ObliviousTreeModel): 변환된 CatBoost 모델
+        X_test (np.ndarray): 예측을 수행할 입력 데이터
+
+    Returns:
+        np.ndarray: 예측된 출력 값 (n, 1)
+    """
+    return model.raw_predict(X_test)
+
+
+def catboost_numpy_multi_predict(model, X_test: np.ndarray) -> np.ndarray:
+    """
+    NumPy oblivious tree 모델로 다중 출력 회귀 예측 (catboost_multi_predict 대체)
+
+    Args:
+        model (ObliviousTreeModel): 변환된 CatBoost 모델 (MultiRMSE)
+        X_test (np.ndarray): 예측할 입력 데이터
+
+    Returns:
+        np.ndarray: 예측된 다중 출력 회귀 결과 (n, n_targets)
+    """
+    return model.raw_predict(X_test)
+
+
+def catboost_numpy_classification_predict(model, X_test: np.ndarray) -> np.ndarray:
+    """
+    NumPy oblivious tree 모델로 클래스 예측 (catboost_classification_predict 대체)
+
+    Args:
+        model (ObliviousTreeModel): 변환된 CatBoost 분류 모델
+        X_test (np.ndarray): 예측을 수행할 입력 데이터
+
+    Returns:
+        np.ndarray: 예측된 클래스 index (n, 1)
+    """
+    return model.predict(X_test, prediction_type='Class').reshape(-1, 1)
@@ -0,0 +1,205 @@
+import logging
+
+import numpy as np
+
+
+class DistilledMLP:
+    """
+    surrogate(CatBoost, TabPFN 등)의 예측을 근사하는 작은 ReLU MLP (simpleNN_model과 같은 Linear-ReLU 구조)
+
+    입력 표준화와 출력 역표준화를 포함하며, 입력에 대한 gradient를 직접 계산하므로
+    gradient 기반 탐색에서 surrogate 대신 사용할 수 있습니다. NumPy만 사용하므로 탐색 worker에서
+    torch 없이 CPU로 실행됩니다.
+
+    Args:
+        input_size (int): 입력 열 수
+        output_size (int): 출력(타겟) 수
+        hidden (tuple): 은닉층 크기
+        seed (int): 가중치 초기화 seed
+    """
+
+    def __init__(self, input_size, output_size=1, hidden=(64, 64), seed=0):
+        rng = np.random.default_rng(seed)
+        sizes = [input_size, *hidden, output_size]
+        # He 초기화
+        self.weights = [(rng.standard_normal((n_in, n_out)) * np.sqrt(2.0 / n_in)).astype(np.float32)
+                        for n_in, n_out in zip(sizes[:-1], sizes[1:])]
+        self.biases = [np.zeros(n_out, dtype=np.float32) for n_out in sizes[1:]]
+        self.x_mean, self.x_std = np.zeros(input_size, np.float32), np.ones(input_size, np.float32)
+        self.y_mean, self.y_std = np.zeros(output_size, np.float32), np.ones(output_size, np.float32)
+        self.fidelity_r2 = None
+
+    @property
+    def params(self):
+        return self.weights + self.biases
+
+    def _forward(self, X):
+        """표준화된 출력과 층별 pre-activation (역전파에 사용)"""
+        h = (np.asarray(X, dtype=np.float32) - self.x_mean) / self.x_std
+        activations, pre_activations = [h], []
+        for W, b in zip(self.weights[:-1], self.biases[:-1]):
+            z = h @ W + b
+            pre_activations.append(z)
+            h = np.maximum(z, 0)
+            activations.append(h)
+        return h @ self.weights[-1] + self.biases[-1], activations, pre_activations
+
+    def predict(self, X):
+        """원래 scale의 예측값 (n, output_size)"""
+        out, _, _ = self._forward(X)
+        return out * self.y_std + self.y_mean
+
+    def _backward(self, grad_out, activations, pre_activations):
+        """표준화된 출력에 대한 gradient로 (가중치 gradient, bias gradient, 표준화된 입력 gradient) 계산"""
+        grad_w, grad_b = [None] * len(self.weights), [None] * len(self.biases)
+        grad = grad_out
+        for layer in range(len(self.weights) - 1, -1, -1):
+            grad_w[layer] = activations[layer].T @ grad
+            grad_b[layer] = grad.sum(axis=0)
+            grad = grad @ self.weights[layer].T
+            if layer > 0:
+                grad *= pre_activations[layer - 1] > 0
+        return grad_w, grad_b, grad
+
+    def predict_with_input_grad(self, X, grad_fn):
+        """
+        예측값과 입력에 대한 loss gradient
+
+        Args:
+            X (np.ndarray): 입력 (n, input_size)
+            grad_fn (callable): 예측값 y (n, output_size) -> dL/dy
+
+        Returns:
+            y (np.ndarray): 예측값
+            grad_X (np.ndarray): dL/dX (n, input_size)
+        """
+        out, activations, pre_activations = self._forward(X)
+        y = out * self.y_std + self.y_mean
+        grad_out = (np.asarray(grad_fn(y), dtype=np.float32) * self.y_std).astype(np.float32)
+        _, _, grad_h = self._backward(grad_out, activations, pre_activations)
+        return y, grad_h / self.x_std
+
+    def fit(self, X, y, epochs=40, batch_size=256, lr=1e-3, seed=0):
+        """
+        표준화한 출력에 대한 MSE를 Adam으로 최소화합니다.
+
+        Args:
+            X (np.ndarray): 입력 (n, input_size)
+            y (np.ndarray): 타겟 (n, output_size)
+            epochs (int): 학습 epoch 수
+            batch_size (int): mini-batch 크기
+            lr (float): 학습률
+            seed (int): mini-batch 순서 seed
+        """
+        rng = np.random.default_rng(seed)
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float32).reshape(len(X), -1)
+        self.x_mean, self.x_std = X.mean(axis=0), np.where(X.std(axis=0) > 0, X.std(axis=0), 1).astype(np.float32)
+        self.y_mean, self.y_std = y.mean(axis=0), np.where(y.std(axis=0) > 0, y.std(axis=0), 1).astype(np.float32)
+        y_norm = (y - self.y_mean) / self.y_std
+
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        m = [np.zeros_like(p) for p in self.params]
+        v = [np.zeros_like(p) for p in self.params]
+        step = 0
+        for _ in range(epochs):
+            order = rng.permutation(len(X))
+            for start in range(0, len(X), batch_size):
+                batch = order[start:start + batch_size]
+                out, activations, pre_activations = self._forward(X[batch])
+                grad_out = 2.0 * (out - y_norm[batch]) / len(batch)
+                grad_w, grad_b, _ = self._backward(grad_out, activations, pre_activations)
+
+                step += 1
+                for p, g, m_p, v_p in zip(self.params, grad_w + grad_b, m, v):
+                    m_p *= beta1
+                    m_p += (1 - beta1) * g
+                    v_p *= beta2
+                    v_p += (1 - beta2) * g * g
+                    p -= lr * (m_p / (1 - beta1 ** step)) / (np.sqrt(v_p / (1 - beta2 ** step)) + eps)
+        return self
+
+
+def sample_control_space(X_train, control_index, x_min, x_max, is_nominal, n_samples, seed=0):
+    """
+    distillation 입력: 학습 행에서 비제어 변수를 가져오고 제어 변수는 탐색 범위에서 샘플링
+
+    절반은 제어 변수를 범위 전체에서 균등(범주형은 정수) 샘플링하고, 나머지 절반은 실제 행의
+    제어 변수 값에 범위의 5% 정도 잡음을 더해 데이터 근처를 촘촘하게 학습합니다.
+
+    Args:
+        X_train (np.ndarray): 학습 X
+        control_index (list): 제어 변수 열 index
+        x_min, x_max (np.ndarray): 제어 변수 범위
+        is_nominal (list): 제어 변수별 범주형 여부
+        n_samples (int): 샘플 수
+        seed (int): 랜덤 시드
+
+    Returns:
+        np.ndarray: 입력 행렬 (n_samples, n_features)
+    """
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X_train, dtype=np.float64)[rng.integers(len(X_train), size=n_samples)]
+    x_min, x_max = np.asarray(x_min, dtype=np.float64), np.asarray(x_max, dtype=np.float64)
+    is_nominal = np.asarray(is_nominal, dtype=bool)
+
+    n_uniform = n_samples // 2
+    uniform = rng.uniform(x_min, x_max, size=(n_uniform, len(x_min)))
+    uniform[:, is_nominal] = np.floor(rng.uniform(x_min[is_nominal], x_max[is_nominal] + 1,
+                                                  size=(n_uniform, is_nominal.sum())))
+    X[:n_uniform, control_index] = uniform
+
+    local = X[n_uniform:, control_index]
+    local[:, ~is_nominal] += rng.normal(scale=0.05 * (x_max - x_min)[~is_nominal], size=local[:, ~is_nominal].shape)
+    X[n_uniform:, control_index] = np.clip(local, x_min, x_max)
+    return X
+
+
+def distill_surrogate(model, pred_func, X_train, control_index, x_min, x_max, is_nominal, n_samples=20000,
+                      hidden=(64, 64), epochs=40, batch_size=256, lr=1e-3, holdout=0.1, seed=0):
+    """
+    surrogate를 제어 변수 탐색 범위에서 샘플링한 입력의 예측값으로 DistilledMLP에 distill합니다.
+
+    Args:
+        model: surrogate 모델
+        pred_func: surrogate 예측 함수 pred_func(model=..., X_test=...)
+        X_train (np.ndarray): 학습 X
+        control_index (list): 제어 변수 열 index
+        x_min, x_max (np.ndarray): 제어 변수 범위
+        is_nominal (list): 제어 변수별 범주형 여부
+        n_samples (int): distillation 샘플 수 (surrogate 예측 횟수)
+        hidden, epochs, batch_size, lr: DistilledMLP 구조와 학습 설정
+        holdout (float): 근사 정확도(r2) 확인용 샘플 비율
+        seed (int): 랜덤 시드
+
+    Returns:
+        DistilledMLP: 학습된 근사 모델 (fidelity_r2에 holdout 타겟별 r2)
+    """
+    X = sample_control_space(X_train, control_index, x_min, x_max, is_nominal, n_samples, seed)
+    X = X[np.random.default_rng(seed).permutation(len(X))]  # holdout에 균등/데이터 근처 샘플이 섞이도록
+    y = np.asarray(pred_func(model=model, X_test=X), dtype=np.float64).reshape(len(X), -1)
+
+    n_holdout = int(len(X) * holdout)
+    net = DistilledMLP(X.shape[1], y.shape[1], hidden=hidden, seed=seed)
+    net.fit(X[n_holdout:], y[n_holdout:], epochs=epochs, batch_size=batch_size, lr=lr, seed=seed)
+
+    y_holdout = y[:n_holdout]
+    residual = ((net.predict(X[:n_holdout]) - y_holdout) ** 2).sum(axis=0)
+    total = ((y_holdout - y_holdout.mean(axis=0)) ** 2).sum(axis=0)
+    net.fidelity_r2 = 1 - residual / np.where(total > 0, total, 1)
+    logging.info(f"surrogate distillation: 샘플 {n_samples}개, holdout r2 {np.round(net.fidelity_r2, 4).tolist()}")
+    return net
+
+
+def distill_predict(model, X_test: np.ndarray) -> np.ndarray:
+    """
+    DistilledMLP로 예측 (surrogate predict 함수와 같은 형태)
+
+    Args:
+        model (DistilledMLP): distill된 모델
+        X_test (np.ndarray): 예측할 입력 데이터
+
+    Returns:
+        np.ndarray: 예측값 (n, n_targets)
+    """
+    return model.predict(X_test)
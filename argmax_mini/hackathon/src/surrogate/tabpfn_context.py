@@ -0,0 +1,249 @@
+import logging
+
+import numpy as np
+
+
+# TabPFN 학습(context)에 사용할 기본 행 수와 선택 방법
+CONTEXT_SIZE = 3000
+CONTEXT_METHODS = ('stratified', 'kmeans', 'coreset', 'random')
+
+
+def _standardize(X):
+    X = np.asarray(X, dtype=np.float32).reshape(len(X), -1)
+    std = X.std(axis=0)
+    return (X - X.mean(axis=0)) / np.where(std > 0, std, 1)
+
+
+def _strata(y, is_classification, n_bins=10):
+    """층화 기준: 분류는 클래스, 회귀는 (표준화한 타겟 평균의) 분위수 구간"""
+    y = np.asarray(y).reshape(len(y), -1)
+    if is_classification:
+        return np.unique(y[:, 0], return_inverse=True)[1]
+    score = _standardize(y).mean(axis=1)
+    edges = np.unique(np.quantile(score, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    return np.searchsorted(edges, score, side='right')
+
+
+def stratified_indices(y, size, is_classification=False, seed=42):
+    """
+    층(클래스 / 타겟 분위수 구간) 비율을 유지하도록 size개 행을 뽑습니다. 작은 층도 최소 1개는 포함합니다.
+
+    Args:
+        y (np.ndarray): 타겟 (n,) 또는 (n, n_targets)
+        size (int): 뽑을 행 수
+        is_classification (bool): 분류 타겟 여부
+        seed (int): 랜덤 시드
+
+    Returns:
+        np.ndarray: 선택한 행 index
+    """
+    rng = np.random.default_rng(seed)
+    strata = _strata(y, is_classification)
+    counts = np.bincount(strata)
+    quota = np.minimum(counts, np.maximum(1, np.floor(counts * size / len(strata)).astype(int)))
+    # 남은 개수는 나머지가 큰 층부터 채움
+    remainder = counts * size / len(strata) - quota
+    for s in np.argsort(-remainder):
+        if quota.sum() >= size:
+            break
+        if quota[s] < counts[s]:
+            quota[s] += 1
+    chosen = [rng.choice(np.flatnonzero(strata == s), quota[s], replace=False) for s in np.flatnonzero(quota)]
+    return np.sort(np.concatenate(chosen)[:size])
+
+
+def _nearest(A, B, chunk=4096):
+    """A의 각 행에 가장 가까운 B 행 index (행 묶음별로 ||b||^2 - 2a.b를 계산해 메모리 제한)"""
+    out = np.empty(len(A), dtype=np.int64)
+    B_norm = np.square(B).sum(axis=1)
+    for start in range(0, len(A), chunk):
+        dist = A[start:start + chunk] @ B.T
+        dist *= -2
+        dist += B_norm
+        out[start:start + chunk] = dist.argmin(axis=1)
+    return out
+
+
+def kmeans_indices(X, size, n_iter=3, seed=42):
+    """
+    입력 공간을 size개 cluster로 나누고 각 중심에 가장 가까운 실제 행을 뽑습니다. (중복은 무작위 행으로 채움)
+
+    cluster 수가 context 크기(수천 개)로 크므로 k-means++ 초기화 대신 무작위 행에서 시작해
+    Lloyd 반복을 n_iter번만 수행합니다.
+
+    Args:
+        X (np.ndarray): 입력 (n, n_features)
+        size (int): 뽑을 행 수
+        n_iter (int): Lloyd 반복 횟수
+        seed (int): 랜덤 시드
+
+    Returns:
+        np.ndarray: 선택한 행 index
+    """
+    rng = np.random.default_rng(seed)
+    Z = _standardize(X)
+    centers = Z[rng.choice(len(Z), size, replace=False)]
+    for _ in range(n_iter):
+        labels = _nearest(Z, centers)
+        counts = np.bincount(labels, minlength=size)
+        sums = np.stack([np.bincount(labels, Z[:, j], minlength=size) for j in range(Z.shape[1])], axis=1)
+        filled = counts > 0
+        centers[filled] = sums[filled] / counts[filled, None]
+    chosen = np.unique(_nearest(centers, Z))
+    return _fill(chosen, len(Z), size, seed)
+
+
+def coreset_indices(X, size, seed=42):
+    """
+    lightweight coreset 방식으로 size개 행을 뽑습니다.
+
+    균등 확률과 평균에서의 거리 제곱에 비례하는 확률을 반씩 섞어 샘플링하므로
+    밀집 영역은 고르게, 드문 영역(경계/이상치)은 더 높은 확률로 포함합니다.
+
+    Args:
+        X (np.ndarray): 입력 (n, n_features)
+        size (int): 뽑을 행 수
+        seed (int): 랜덤 시드
+
+    Returns:
+        np.ndarray: 선택한 행 index
+    """
+    rng = np.random.default_rng(seed)
+    Z = _standardize(X)
+    dist = np.square(Z).sum(axis=1).astype(np.float64)
+    prob = 0.5 / len(Z) + (0.5 * dist / dist.sum() if dist.sum() > 0 else 0.5 / len(Z))
+    return np.sort(rng.choice(len(Z), size, replace=False, p=prob / prob.sum()))
+
+
+def _fill(chosen, n, size, seed):
+    """선택한 index가 size개보다 적으면 나머지 행에서 무작위로 채움"""
+    if len(chosen) < size:
+        rng = np.random.default_rng(seed)
+        rest = np.setdiff1d(np.arange(n), chosen)
+        chosen = np.concatenate([chosen, rng.choice(rest, size - len(chosen), replace=False)])
+    return np.sort(chosen)
+
+
+def select_context(X, y, size=CONTEXT_SIZE, method='kmeans', is_classification=False, seed=42):
+    """
+    TabPFN 학습 데이터가 context 크기보다 크면 size개 행을 선택합니다.
+
+    Args:
+        X (np.ndarray): 입력 (n, n_features)
+        y (np.ndarray): 타겟
+        size (int): context 크기
+        method (str): 'stratified' | 'kmeans' | 'coreset' | 'random'
+        is_classification (bool): 분류 타겟 여부 (stratified에서 클래스별 층화)
+        seed (int): 랜덤 시드
+
+    Returns:
+        np.ndarray: 선택한 행 index (데이터가 size 이하이면 전체)
+    """
+    n = len(X)
+    if n <= size:
+        return np.arange(n)
+    if method == 'stratified':
+        return stratified_indices(y, size, is_classification, seed)
+    if method == 'kmeans':
+        return kmeans_indices(X, size, seed=seed)
+    if method == 'coreset':
+        return coreset_indices(X, size, seed)
+    if method == 'random':
+        return np.sort(np.random.default_rng(seed).choice(n, size, replace=False))
+    raise ValueError(f"지원되지 않는 context 선택 방법입니다: {method} (가능: {CONTEXT_METHODS})")
+
+
+def disjoint_contexts(X, y, size=CONTEXT_SIZE, n_subsets=4, method='kmeans', is_classification=False, seed=42):
+    """
+    서로 겹치지 않는 context를 최대 n_subsets개 선택합니다. (앞에서 선택한 행을 제외하고 반복 선택)
+
+    Args:
+        X, y, size, method, is_classification, seed: select_context와 같음
+        n_subsets (int): 최대 context 수
+
+    Returns:
+        list[np.ndarray]: context별 행 index
+    """
+    remaining = np.arange(len(X))
+    subsets = []
+    for i in range(n_subsets):
+        if len(remaining) == 0:
+            break
+        index = select_context(X[remaining], np.asarray(y)[remaining], size, method, is_classification, seed + i)
+        subsets.append(remaining[index])
+        remaining = np.delete(remaining, index)
+    return subsets
+
+
+class SubsetEnsemble:
+    """
+    서로 다른 context로 학습한 모델들의 예측을 평균하는 앙상블
+
+    예측은 batch_size 행씩 나눠 수행해 큰 입력에서도 메모리 사용을 제한합니다.
+    분류 모델은 클래스 확률을 (전체 클래스 기준으로 맞춰) 평균한 뒤 가장 큰 클래스를 반환합니다.
+
+    Args:
+        models (list): 학습된 모델
+        batch_size (int): 한 번에 예측할 행 수
+    """
+
+    def __init__(self, models, batch_size=10000):
+        self.models = models
+        self.batch_size = batch_size
+        self.is_classifier = hasattr(models[0], 'predict_proba') and hasattr(models[0], 'classes_')
+        if self.is_classifier:
+            self.classes_ = np.unique(np.concatenate([model.classes_ for model in models]))
+
+    def _batches(self, X):
+        for start in range(0, len(X), self.batch_size):
+            yield X[start:start + self.batch_size]
+
+    def predict_proba(self, X):
+        probs = []
+        for batch in self._batches(X):
+            prob = np.zeros((len(batch), len(self.classes_)))
+            for model in self.models:
+                columns = np.searchsorted(self.classes_, model.classes_)
+                prob[:, columns] += model.predict_proba(batch)
+            probs.append(prob / len(self.models))
+        return np.concatenate(probs)
+
+    def predict(self, X):
+        if self.is_classifier:
+            return self.classes_[self.predict_proba(X).argmax(axis=1)]
+        return np.concatenate([np.mean([model.predict(batch) for model in self.models], axis=0)
+                               for batch in self._batches(X)])
+
+
+def fit_with_context(make_model, X_train, y_train, context_size=CONTEXT_SIZE, context_method='kmeans',
+                     n_subsets=1, is_classification=False, seed=42):
+    """
+    context 선택 후 모델을 학습합니다. n_subsets > 1이면 겹치지 않는 context마다 모델을 학습해 앙상블합니다.
+
+    Args:
+        make_model (callable): 새 (학습 전) 모델을 만드는 함수
+        X_train (np.ndarray): 훈련 입력
+        y_train (np.ndarray): 훈련 타겟
+        context_size (int): context 크기
+        context_method (str): select_context 방법
+        n_subsets (int): 앙상블할 context 수 (데이터가 context 크기 이하이면 1)
+        is_classification (bool): 분류 타겟 여부
+        seed (int): 랜덤 시드
+
+    Returns:
+        학습된 모델 또는 SubsetEnsemble
+    """
+    X_train, y_train = np.asarray(X_train), np.asarray(y_train)
+    if n_subsets > 1 and len(X_train) > context_size:
+        subsets = disjoint_contexts(X_train, y_train, context_size, n_subsets, context_method, is_classification, seed)
+    else:
+        subsets = [select_context(X_train, y_train, context_size, context_method, is_classification, seed)]
+    if len(X_train) > context_size:
+        logging.info(f"TabPFN context: {len(X_train)}행 중 {context_method}로 {len(subsets[0])}행 x {len(subsets)}개 선택")
+
+    models = []
+    for index in subsets:
+        model = make_model()
+        model.fit(X_train[index], y_train[index])
+        models.append(model)
+    return models[0] if len(models) == 1 else SubsetEnsemble(models)
@@ -0,0 +1,211 @@
+import io
+import logging
+import os
+import pickle
+import time
+
+import numpy as np
+
+from .tabpfn_context import CONTEXT_SIZE
+
+
+# TabPFN v2 attention 크기 (예측 행마다 (열 수 + 1)개 cell이 context 행 전체를 head별로 attention)
+TABPFN_HEADS = 6
+TABPFN_EMBEDDING = 192
+# 예측 batch에 사용할 가용 메모리 비율과 batch 행 수 범위
+PREDICT_MEMORY_FRACTION = 0.25
+MIN_CHUNK_ROWS, MAX_CHUNK_ROWS = 64, 20000
+# throughput 로그 간격(초)
+THROUGHPUT_LOG_SECONDS = 10.0
+
+_throughput = {'rows': 0, 'seconds': 0.0, 'logged_at': 0.0}
+
+
+def select_device(device=None):
+    """
+    TabPFN 실행 장치를 고릅니다. TABPFN_DEVICE 환경 변수 > 인자 > (CUDA 사용 가능하면 'cuda', 아니면 'cpu') 순서
+
+    Args:
+        device (str, optional): 'cuda' | 'cpu' | 'auto'
+
+    Returns:
+        str: 'cuda' 또는 'cpu'
+    """
+    device = os.environ.get('TABPFN_DEVICE') or device or 'auto'
+    if device != 'auto':
+        return device
+    try:
+        import torch
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
+    except ImportError:
+        return 'cpu'
+
+
+def tabpfn_options(device):
+    """
+    장치별 TabPFN 생성 인자
+
+    CPU에서는 fit_mode='fit_with_cache'로 학습 context의 key/value를 fit에서 한 번 계산해 두고
+    predict batch마다 재사용합니다. (GPU는 메모리를 아끼기 위해 기본 모드 유지)
+    """
+    if device == 'cpu':
+        return {'device': 'cpu', 'fit_mode': 'fit_with_cache'}
+    return {'device': device}
+
+
+def available_memory(device):
+    """장치의 가용 메모리(byte) (CUDA는 free 메모리, CPU 또는 CUDA가 없는 환경은 MemAvailable)"""
+    if device.startswith('cuda'):
+        import torch
+        if torch.cuda.is_available():
+            return torch.cuda.mem_get_info(torch.device(device))[0]
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+
+
+def predict_chunk_rows(n_context, n_features, memory_bytes, fraction=PREDICT_MEMORY_FRACTION):
+    """
+    메모리 예산 안에서 한 번에 예측할 행 수
+
+    예측 행당 메모리는 (열 수 + 1)개 cell의 context attention 점수(head x context 행)와
+    embedding activation으로 어림합니다.
+
+    Args:
+        n_context (int): 학습 context 행 수
+        n_features (int): 입력 열 수
+        memory_bytes (int): 가용 메모리 (byte)
+        fraction (float): 예측에 사용할 가용 메모리 비율
+
+    Returns:
+        int: batch 행 수
+    """
+    bytes_per_row = 4 * (n_features + 1) * (TABPFN_HEADS * n_context + 4 * TABPFN_EMBEDDING)
+    rows = int(fraction * memory_bytes // bytes_per_row)
+    return int(np.clip(rows, MIN_CHUNK_ROWS, MAX_CHUNK_ROWS))
+
+
+def set_inference_info(model, device, n_context):
+    """chunked_predict에서 사용할 장치와 context 행 수를 모델에 기록 (pickle로 함께 저장)"""
+    model.tabpfn_device_ = device
+    model.tabpfn_context_rows_ = int(n_context)
+    return model
+
+
+class CPUUnpickler(pickle.Unpickler):
+    """
+    torch tensor storage를 CPU로 불러오는 Unpickler
+
+    CUDA에서 학습한 모델을 그대로 pickle하면 tensor storage에 CUDA 장치가 기록되어,
+    CUDA가 없는 worker에서는 pickle.load가 실패합니다. storage 복원 함수를 map_location='cpu'로 바꿔 불러옵니다.
+    """
+
+    def find_class(self, module, name):
+        if module == 'torch.storage' and name == '_load_from_bytes':
+            import torch
+            return lambda b: torch.load(io.BytesIO(b), map_location='cpu', weights_only=False)
+        return super().find_class(module, name)
+
+
+def _tabpfn_estimators(model):
+    """MultiOutputRegressor, SubsetEnsemble 안의 개별 TabPFN 추정기를 차례로 반환"""
+    members = getattr(model, 'estimators_', None) or getattr(model, 'models', None)
+    if isinstance(members, (list, tuple)):
+        for member in members:
+            yield from _tabpfn_estimators(member)
+    else:
+        yield model
+
+
+def move_to_device(model, device):
+    """
+    학습된 TabPFN 모델의 network와 장치 설정을 device로 옮깁니다.
+
+    Args:
+        model: 학습된 TabPFN 모델 (MultiOutputRegressor, SubsetEnsemble 포함)
+        device (str): 'cuda' | 'cpu'
+
+    Returns:
+        model: 같은 모델 객체
+    """
+    import torch
+
+    for estimator in _tabpfn_estimators(model):
+        if hasattr(estimator, 'device'):
+            estimator.device = device
+        if hasattr(estimator, 'device_'):
+            estimator.device_ = torch.device(device)
+        # CUDA fp16 autocast 설정은 CPU에서 사용하지 않음
+        if device == 'cpu' and hasattr(estimator, 'use_autocast_'):
+            estimator.use_autocast_ = False
+        for name in ('model_', 'models_'):
+            networks = getattr(estimator, name, None)
+            for network in networks if isinstance(networks, (list, tuple)) else [networks]:
+                if isinstance(network, torch.nn.Module):
+                    network.to(device)
+    model.tabpfn_device_ = device
+    return model
+
+
+def load_model(path, device=None):
+    """
+    pickle로 저장한 TabPFN 모델을 실행 장치에 맞춰 불러옵니다.
+
+    실행 장치가 CPU이면 CUDA tensor를 CPU로 옮겨 불러오고 모델의 장치 설정도 CPU로 바꿉니다.
+
+    Args:
+        path (str): pickle 파일 경로
+        device (str, optional): 'cuda' | 'cpu' | 'auto' (select_device)
+
+    Returns:
+        object: 로드된 모델 객체
+    """
+    device = select_device(device)
+    with open(path, 'rb') as f:
+        if device != 'cpu':
+            return pickle.load(f)
+        model = CPUUnpickler(f).load()
+    return move_to_device(model, 'cpu')
+
+
+def _log_throughput(n_rows, seconds, device):
+    _throughput['rows'] += n_rows
+    _throughput['seconds'] += seconds
+    now = time.time()
+    if now - _throughput['logged_at'] >= THROUGHPUT_LOG_SECONDS:
+        _throughput['logged_at'] = now
+        logging.info(f"TabPFN predict ({device}): 최근 {n_rows / max(seconds, 1e-9):,.0f}행/초, "
+                     f"누적 {_throughput['rows']:,}행 {_throughput['rows'] / max(_throughput['seconds'], 1e-9):,.0f}행/초")
+
+
+def inference_throughput():
+    """프로세스 누적 TabPFN 예측 행 수, 시간(초), 초당 행 수"""
+    rows, seconds = _throughput['rows'], _throughput['seconds']
+    return {'rows': rows, 'seconds': seconds, 'rows_per_second': rows / seconds if seconds else 0.0}
+
+
+def chunked_predict(model, X, method='predict'):
+    """
+    가용 메모리에 맞춘 batch로 나눠 예측합니다. (학습 context는 모델이 batch 간에 재사용)
+
+    Args:
+        model: 학습된 TabPFN 모델 (MultiOutputRegressor, SubsetEnsemble 포함)
+        X (np.ndarray): 입력 (n, n_features)
+        method (str): 'predict' | 'predict_proba'
+
+    Returns:
+        np.ndarray: batch 결과를 이어 붙인 예측값
+    """
+    X = np.asarray(X)
+    device = getattr(model, 'tabpfn_device_', None) or select_device()
+    n_context = getattr(model, 'tabpfn_context_rows_', CONTEXT_SIZE)
+    chunk = predict_chunk_rows(n_context, X.shape[1], available_memory(device))
+
+    predict = getattr(model, method)
+    start = time.perf_counter()
+    y_pred = predict(X) if len(X) <= chunk else np.concatenate(
+        [predict(X[i:i + chunk]) for i in range(0, len(X), chunk)])
+    _log_throughput(len(X), time.perf_counter() - start, device)
+    return y_pred
@@ -4,8 +4,12 @@ import pickle
 import numpy as np
 from tabpfn import TabPFNRegressor
 
+from .tabpfn_context import CONTEXT_SIZE, fit_with_context
+from .tabpfn_device import select_device, tabpfn_options, set_inference_info, chunked_predict, load_model
 
-def tabpfn_train(train_loader, val_loader):
+
+def tabpfn_train(train_loader, val_loader, context_size=CONTEXT_SIZE, context_method='kmeans', n_subsets=1,
+                 device=None):
     """
     TabPFNRegressor 모델을 학습하는 함수
 
@@ -14,16 +18,21 @@ def tabpfn_train(train_loader, val_loader):
     Args:
         train_loader (tuple): 학습 데이터 튜플 (X_train, y_train)
         val_loader (tuple): 검증 데이터 튜플 (X_test, y_test). (현재 검증 데이터는 사용되지 않음)
+        context_size (int): TabPFN context 크기, 학습 데이터가 더 크면 context_method로 행을 선택
+        context_method (str): 'stratified' | 'kmeans' | 'coreset' | 'random'
+        n_subsets (int): 1보다 크면 겹치지 않는 context마다 모델을 학습해 예측을 평균 (SubsetEnsemble)
+        device (str, optional): 'cuda' | 'cpu' | 'auto', 기본값은 CUDA가 있으면 GPU, 없으면 CPU (select_device)
 
     Returns:
-        TabPFNRegressor: 학습된 TabPFNRegressor 모델
+        TabPFNRegressor: 학습된 TabPFNRegressor 모델 (n_subsets > 1이면 SubsetEnsemble)
     """
-    model = TabPFNRegressor(device="cuda")  # GPU 사용 설정
-
     X_train, y_train = train_loader
     X_test, y_test = val_loader
 
-    model.fit(X_train, y_train)
+    device = select_device(device)
+    model = fit_with_context(lambda: TabPFNRegressor(**tabpfn_options(device)),
+                             X_train, y_train, context_size, context_method, n_subsets)
+    set_inference_info(model, device, min(len(X_train), context_size))
 
     return model
 
@@ -39,7 +48,7 @@ def tabpfn_predict(model, X_test: np.ndarray) -> np.ndarray:
     Returns:
         np.ndarray: 예측된 출력값 행렬 (샘플 수 x 1)
     """
-    y_pred = model.predict(X_test)
+    y_pred = chunked_predict(model, X_test)  # 가용 메모리에 맞춘 batch로 예측
 
     if y_pred.ndim == 1:
         y_pred = y_pred.reshape(-1, 1)
@@ -64,6 +73,7 @@ def tabpfn_save(model, path):
 def tabpfn_load(path):
     """
     지정된 경로에서 피클(pickle) 파일을 불러와 모델 객체를 반환합니다.
+    실행 장치가 CPU이면 CUDA에서 학습해 저장한 모델도 CPU로 옮겨 불러옵니다.
 
     Args:
         path (str): 불러올 파일 경로 (확장자 제외)
@@ -71,5 +81,4 @@ def tabpfn_load(path):
     Returns:
         object: 로드된 모델 객체
     """
-    with open(path + ".pkl", "rb") as f:
-        return pickle.load(f)
+    return load_model(path + ".pkl")
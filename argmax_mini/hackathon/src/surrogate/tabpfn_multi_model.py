@@ -5,23 +5,33 @@ import numpy as np
 from sklearn.multioutput import MultiOutputRegressor
 from tabpfn import TabPFNRegressor
 
+from .tabpfn_context import CONTEXT_SIZE, fit_with_context
+from .tabpfn_device import select_device, tabpfn_options, set_inference_info, chunked_predict, load_model
+
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 
-def tabpfn_multi_train(train_loader, val_loader):
+def tabpfn_multi_train(train_loader, val_loader, context_size=CONTEXT_SIZE, context_method='kmeans', n_subsets=1,
+                       device=None):
     """
     MultiOutputRegressor를 사용하여 TabPFNRegressor 모델을 학습합니다.
 
     Args:
         train_loader (tuple): (X_train, y_train) 형태의 학습 데이터
         val_loader (tuple): (X_test, y_test) 형태의 검증 데이터
+        context_size (int): TabPFN context 크기, 학습 데이터가 더 크면 context_method로 행을 선택
+        context_method (str): 'stratified' | 'kmeans' | 'coreset' | 'random'
+        n_subsets (int): 1보다 크면 겹치지 않는 context마다 모델을 학습해 예측을 평균 (SubsetEnsemble)
+        device (str, optional): 'cuda' | 'cpu' | 'auto', 기본값은 CUDA가 있으면 GPU, 없으면 CPU (select_device)
 
     Returns:
-        MultiOutputRegressor: 학습된 모델
+        MultiOutputRegressor: 학습된 모델 (n_subsets > 1이면 SubsetEnsemble)
     """
-    model = MultiOutputRegressor(TabPFNRegressor(device="cuda"))
     (X_train, y_train), (X_test, y_test) = train_loader, val_loader
-    model.fit(X_train, y_train)
+    device = select_device(device)
+    model = fit_with_context(lambda: MultiOutputRegressor(TabPFNRegressor(**tabpfn_options(device))),
+                             X_train, y_train, context_size, context_method, n_subsets)
+    set_inference_info(model, device, min(len(X_train), context_size))
 
     return model
 
@@ -39,7 +49,7 @@ def tabpfn_multi_predict(model, X_test: np.ndarray) -> np.ndarray:
     """
 
     # print(f'X_test :{X_test.shape}')
-    y_pred = model.predict(X_test)
+    y_pred = chunked_predict(model, X_test)  # 가용 메모리에 맞춘 batch로 예측
 
     if y_pred.ndim == 1:
         y_pred = y_pred.reshape(-1, X_test.shape[1])
@@ -62,6 +72,7 @@ def tabpfn_multi_save(model, path):
 def tabpfn_multi_load(path):
     """
     지정된 경로에서 피클(pickle) 파일을 불러와 모델을 반환합니다.
+    실행 장치가 CPU이면 CUDA에서 학습해 저장한 모델도 CPU로 옮겨 불러옵니다.
 
     Args:
         path (str): 불러올 파일 경로 (확장자 제외)
@@ -69,5 +80,4 @@ def tabpfn_multi_load(path):
     Returns:
         MultiOutputRegressor: 로드된 모델 객체
     """
-    with open(path + ".pkl", "rb") as f:
-        return pickle.load(f)
+    return load_model(path + ".pkl")
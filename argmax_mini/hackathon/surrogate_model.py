@@ -1,9 +1,13 @@
 # main.py
 
 import argparse
+import json
 import logging
+import multiprocessing
+import tempfile
 import time
 import os
+from multiprocessing.connection import wait
 
 import pandas as pd
 import numpy as np
@@ -11,11 +15,25 @@ import numpy as np
 import hackathon.src.datasets as datasets
 import hackathon.src.search as search
 import hackathon.src.surrogate as surrogate
+from hackathon.src.search.parallel import limit_threads, worker_threads
 from hackathon.src.utils import Setting, measure_time
 # from src.surrogate.eval_surrogate_model import eval_surrogate_model
 
 
-def main(args, scalers=None):
+def main(args, scalers=None, data=None):
+    """
+    surrogate 모델을 학습/평가하고 저장합니다.
+
+    Args:
+        args: model, target, data_path, seed (output_dir이 있으면 그 폴더에 모델 저장,
+            tabpfn은 context_size, context_method, n_subsets로 학습 context 선택)
+        scalers (dict): 변수별 scaler
+        data (tuple, optional): 미리 분할한 (X_train, X_test, y_train, y_test, x_col_list), None이면 data_path에서 로드
+
+    Returns:
+        catboost: df_rank, df_eval, df_importance, model_path
+        그 외: df_rank, df_eval, model_path
+    """
     # 로깅 설정
     logging.basicConfig(level=logging.INFO,
                         format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,14 +44,10 @@ def main(args, scalers=None):
     model_name = args.model  # 사용할 서로게이트 모델 명
 
     # 데이터 로드 및 분할
-    load_data_func = datasets.load_and_split_data_with_x_col_list
-    X_train, X_test, y_train, y_test, x_col_list = load_data_func(
-        args.data_path, args.target)
-
-    if model_name == 'tabpfn':
-        if X_train.shape[0] > 3000:
-            X_train = X_train[:3000]
-            y_train = y_train[:3000]
+    if data is None:
+        load_data_func = datasets.load_and_split_data_with_x_col_list
+        data = load_data_func(args.data_path, args.target)
+    X_train, X_test, y_train, y_test, x_col_list = data
 
     load_data_loader_func = getattr(datasets, f'{model_name}_load_data')
 
@@ -56,7 +70,20 @@ def main(args, scalers=None):
         else:
             train_func = getattr(surrogate, f'{model_name}_train')
 
-    model = train_func(train_loader, val_loader)
+    train_kwargs = {}
+    if model_name == 'catboost' and getattr(args, 'flow_id', None) is not None:
+        # flow/타겟별로 저장된 Optuna study의 이전 최적 파라미터로 warm start
+        train_kwargs['hpo_options'] = {
+            'storage': surrogate.hpo_storage(),
+            'study_name': surrogate.hpo_study_name(args.flow_id, args.target, train_func.__name__),
+        }
+    elif model_name == 'tabpfn':
+        # TabPFN context 크기보다 큰 데이터는 앞부분을 자르지 않고 대표 행을 선택 (n_subsets > 1이면 앙상블)
+        train_kwargs['context_size'] = getattr(args, 'context_size', surrogate.CONTEXT_SIZE)
+        train_kwargs['n_subsets'] = getattr(args, 'n_subsets', 1)
+        if getattr(args, 'context_method', None):
+            train_kwargs['context_method'] = args.context_method
+    model = train_func(train_loader, val_loader, **train_kwargs)
 
     if len(args.target) > 1:
         predict_func = getattr(surrogate, f'{model_name}_multi_predict')
@@ -105,10 +132,11 @@ def main(args, scalers=None):
 
         df_rank = pd.concat(all_rank)
 
-    os.makedirs(f'./temp/surrogate_model', exist_ok=True)
+    output_dir = getattr(args, 'output_dir', './temp/surrogate_model')
+    os.makedirs(output_dir, exist_ok=True)
 
     save_model_func = getattr(surrogate, f'{model_name}_save')
-    model_path = save_model_func(model, f'./temp/surrogate_model/model')
+    model_path = save_model_func(model, f'{output_dir}/model')
 
     if model_name == 'catboost':
         df_importance = pd.DataFrame({'feature': x_col_list, 'importance': model.get_feature_importance(
@@ -119,6 +147,124 @@ def main(args, scalers=None):
         return df_rank, df_eval, model_path
 
 
+SPLIT_NAMES = ('X_train', 'X_test', 'y_train', 'y_test')
+
+
+def save_shared_split(data_path, target, directory):
+    """학습/검증 분할을 한 번만 만들어 후보 프로세스들이 memory-map으로 함께 읽을 .npy 파일로 저장"""
+    *arrays, x_col_list = datasets.load_and_split_data_with_x_col_list(data_path, target)
+    for name, array in zip(SPLIT_NAMES, arrays):
+        np.save(os.path.join(directory, f'{name}.npy'), np.asarray(array))
+    with open(os.path.join(directory, 'x_col_list.json'), 'w') as f:
+        json.dump(list(x_col_list), f)
+    return directory
+
+
+def load_shared_split(directory):
+    """save_shared_split으로 저장한 분할을 읽기 전용 memory-map 배열로 로드"""
+    arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in SPLIT_NAMES]
+    with open(os.path.join(directory, 'x_col_list.json')) as f:
+        x_col_list = json.load(f)
+    return (*arrays, x_col_list)
+
+
+def candidate_score(result):
+    """후보 학습 결과의 타겟 평균 r2 (분류는 accuracy)"""
+    return result[1]['r2'].mean()
+
+
+def _train_candidate(conn, name, args, scalers, split_dir, n_threads):
+    """후보 프로세스: thread 수를 제한하고 공유 분할로 학습한 결과를 conn으로 전송"""
+    limit_threads(n_threads)
+    try:
+        result = main(args, scalers, data=load_shared_split(split_dir))
+        conn.send((name, result, None))
+    except Exception as e:
+        logging.exception(f"{name} surrogate 학습 실패")
+        conn.send((name, None, repr(e)))
+    finally:
+        conn.close()
+
+
+def train_candidates(candidate_args, scalers, cancel_score=None, grace_seconds=None, required=()):
+    """
+    여러 surrogate 후보(catboost, tabpfn 등)를 별도 프로세스에서 동시에 학습합니다.
+
+    데이터 분할은 한 번만 만들어 .npy memory-map으로 공유하고, 후보 프로세스마다
+    코어 수를 후보 수로 나눈 thread 수를 할당합니다. 결과는 끝나는 순서대로 수집합니다.
+    torch/CatBoost thread 상태를 물려받지 않도록 spawn으로 프로세스를 만듭니다.
+
+    Args:
+        candidate_args (dict): 후보 이름 -> main()에 전달할 args (target, data_path는 모든 후보가 같아야 함)
+        scalers (dict): 변수별 scaler
+        cancel_score (float, optional): 끝난 후보의 점수(candidate_score)가 이 값 이상이면
+            나머지 후보는 이길 수 없다고 보고 중단
+        grace_seconds (float, optional): 첫 후보가 끝난 뒤 나머지 후보를 기다릴 최대 시간(초)
+        required (tuple): 중단하지 않고 끝까지 기다릴 후보 이름
+
+    Returns:
+        dict: 후보 이름 -> main() 결과 (실패하거나 중단된 후보는 제외)
+    """
+    first_args = next(iter(candidate_args.values()))
+    context = multiprocessing.get_context('spawn')
+    n_threads = worker_threads(len(candidate_args))
+    results = {}
+
+    with tempfile.TemporaryDirectory() as split_dir:
+        save_shared_split(first_args.data_path, list(first_args.target), split_dir)
+
+        processes, connections = {}, {}
+        for name, args in candidate_args.items():
+            # 후보마다 별도 폴더에 모델을 저장해 파일 이름 충돌 방지
+            args.output_dir = getattr(args, 'output_dir', os.path.join('./temp/surrogate_model', name))
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_train_candidate,
+                                      args=(sender, name, args, scalers, split_dir, n_threads), daemon=True)
+            process.start()
+            sender.close()
+            processes[name], connections[receiver] = process, name
+
+        start_time = time.time()
+        deadline = None
+        while connections:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            ready = wait(list(connections), timeout=timeout)
+            if not ready:
+                cancelled = [name for name in connections.values() if name not in required]
+                logging.info(f"후보 대기 시간 초과로 중단: {cancelled}")
+                connections = {receiver: name for receiver, name in connections.items() if name in required}
+                deadline = None
+                continue
+            for receiver in ready:
+                name = connections.pop(receiver)
+                try:
+                    _, result, error = receiver.recv()
+                except EOFError:
+                    result, error = None, 'process exited'
+                receiver.close()
+                if result is None:
+                    logging.warning(f"{name} surrogate 학습 실패: {error}")
+                    continue
+
+                results[name] = result
+                score = candidate_score(result)
+                logging.info(f"{name} surrogate 학습 완료 ({time.time() - start_time:.1f}초, r2={score:.4f})")
+                if cancel_score is not None and score >= cancel_score:
+                    cancelled = [name for name in connections.values() if name not in required]
+                    if cancelled:
+                        logging.info(f"{name} 점수가 {cancel_score} 이상이므로 나머지 후보 중단: {cancelled}")
+                    connections = {receiver: name for receiver, name in connections.items() if name in required}
+                if grace_seconds is not None and deadline is None:
+                    deadline = time.time() + grace_seconds
+
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    return results
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='모델 학습 스크립트')
     arg = parser.add_argument
@@ -134,6 +280,13 @@ if __name__ == "__main__":
         help='플로우 아이디를 지정합니다')
     arg('--seed', '--seed', '-seed', type=int, default=42,
         help='재현성을 위한 랜덤 시드 (기본값: 42)')
+    arg('--context_size', '--context_size', '-context_size', type=int, default=3000,
+        help='TabPFN 학습 context 크기 (기본값: 3000)')
+    arg('--context_method', '--context_method', '-context_method', type=str, default=None,
+        choices=['stratified', 'kmeans', 'coreset', 'random'],
+        help='TabPFN context 선택 방법 (기본값: 회귀 kmeans, 분류 stratified)')
+    arg('--n_subsets', '--n_subsets', '-n_subsets', type=int, default=1,
+        help='겹치지 않는 context로 학습해 평균할 TabPFN 모델 수 (기본값: 1)')
     args = parser.parse_args()
 
     # TODO: omegaconf 적용